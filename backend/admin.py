@@ -1,7 +1,12 @@
 from django import forms
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.utils.html import format_html
-from .models import Category, Subcategory, Product
+from . import bulk, orders
+from .models import (Category, Subcategory, Product, Task, StockShard,
+                     Order, OrderLine)
+from .pagination import EstimatedCountPaginator
 
 
 class SubcategoryInline(admin.TabularInline):
@@ -24,6 +29,7 @@ class SubcategoryInline(admin.TabularInline):
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug', 'image_preview']
+    search_fields = ['name']
     readonly_fields = ['slug']
     inlines = [SubcategoryInline]
 
@@ -49,6 +55,7 @@ class CategoryAdmin(admin.ModelAdmin):
 class SubcategoryAdmin(admin.ModelAdmin):
     list_display = ['name', 'category', 'slug', 'image_preview']
     list_filter = ['category']
+    search_fields = ['name', 'category__name']
     readonly_fields = ['slug']
 
     def image_preview(self, obj):
@@ -59,13 +66,57 @@ class SubcategoryAdmin(admin.ModelAdmin):
     image_preview.short_description = 'Изображение'
 
 
+class SubcategoryListFilter(admin.SimpleListFilter):
+    """
+    Фильтр по подкатегории: показывает только подкатегории
+    выбранной категории, не загружая всю таблицу.
+    """
+
+    title = 'Подкатегория'
+    parameter_name = 'subcategory__id__exact'
+    category_parameter = 'category__id__exact'
+
+    def lookups(self, request, model_admin):
+        category_id = request.GET.get(self.category_parameter)
+        if not category_id or not category_id.isdigit():
+            return []
+        return Subcategory.objects.filter(category_id=category_id) \
+            .order_by('name').values_list('id', 'name')
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(subcategory_id=self.value())
+        return queryset
+
+
+class StockShardInline(admin.TabularInline):
+    """Части остатка только для просмотра: остаток задаётся полем формы."""
+
+    model = StockShard
+    extra = 0
+    fields = ['shard', 'quantity']
+    readonly_fields = fields
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 class ProductAdminForm(forms.ModelForm):
+    stock = forms.IntegerField(
+        label='Остаток', min_value=0, required=False,
+        help_text='Общий остаток; делится поровну на STOCK_SHARDS частей'
+    )
+
     class Meta:
         model = Product
         fields = '__all__'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial['stock'] = \
+                orders.get_stock([self.instance.pk])[self.instance.pk]
         for field_name in ['category', 'subcategory']:
             if field_name in self.fields:
                 field = self.fields[field_name]
@@ -77,17 +128,45 @@ class ProductAdminForm(forms.ModelForm):
                 field.required = True
 
 
+class ProductActionForm(ActionForm):
+    """Параметры массовых действий над товарами."""
+
+    percent = forms.DecimalField(label='Изменение цены, %',
+                                 required=False, max_digits=6,
+                                 decimal_places=2)
+    amount = forms.DecimalField(label='Изменение цены, сумма',
+                                required=False, max_digits=10,
+                                decimal_places=2)
+    subcategory = forms.ModelChoiceField(
+        label='Подкатегория',
+        queryset=Subcategory.objects.all(),
+        required=False,
+        widget=AutocompleteSelect(Product._meta.get_field('subcategory'),
+                                  admin.site)
+    )
+    stock = forms.IntegerField(label='Остаток', min_value=0, required=False)
+    dry_run = forms.BooleanField(label='Пробный запуск', required=False)
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     form = ProductAdminForm
+    action_form = ProductActionForm
+    actions = ['reprice_products', 'move_products', 'set_stock_products',
+               'bulk_delete_products']
     list_display = ['name', 'category', 'subcategory', 'price', 'slug', 'image_preview']
-    list_filter = ['category', 'subcategory']
+    list_select_related = ['category', 'subcategory']
+    list_filter = ['category', SubcategoryListFilter]
     search_fields = ['name']
     readonly_fields = ['slug', 'image_preview']
+    autocomplete_fields = ['category']
+    inlines = [StockShardInline]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         ('Основная информация', {
-            'fields': ('name', 'slug', 'price')
+            'fields': ('name', 'slug', 'price', 'stock')
         }),
         ('Изображение', {
             'fields': ('image', 'image_preview'),
@@ -100,7 +179,102 @@ class ProductAdmin(admin.ModelAdmin):
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height: 50px;" />', obj.image.url)
+            return format_html('<img src="{}" style="max-height: 50px;" />', obj.image_small.url)
         return "—"
 
     image_preview.short_description = 'Изображение'
+
+    def get_action_params(self, request):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        if not form.is_valid():
+            return None
+        return form.cleaned_data
+
+    def report_bulk_result(self, request, result, dry_run):
+        if dry_run:
+            details = ', '.join(f'{key}: {value}'
+                                for key, value in result.items())
+            self.message_user(request, f'Пробный запуск — {details}',
+                              messages.INFO)
+        else:
+            self.message_user(request,
+                              f'Обработано товаров: {result["count"]}',
+                              messages.SUCCESS)
+
+    @admin.action(description='Изменить цену (%% или сумма)',
+                  permissions=['change'])
+    def reprice_products(self, request, queryset):
+        params = self.get_action_params(request)
+        if not params or (params['percent'] is None
+                          and params['amount'] is None):
+            self.message_user(request, 'Укажите процент или сумму',
+                              messages.ERROR)
+            return
+        result = bulk.reprice(queryset, percent=params['percent'],
+                              amount=params['amount'],
+                              dry_run=params['dry_run'])
+        self.report_bulk_result(request, result, params['dry_run'])
+
+    @admin.action(description='Перенести в подкатегорию',
+                  permissions=['change'])
+    def move_products(self, request, queryset):
+        params = self.get_action_params(request)
+        if not params or not params['subcategory']:
+            self.message_user(request, 'Укажите подкатегорию',
+                              messages.ERROR)
+            return
+        result = bulk.move(queryset, params['subcategory'],
+                           dry_run=params['dry_run'])
+        self.report_bulk_result(request, result, params['dry_run'])
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        # Перезапись частей сбросила бы списания после открытия формы
+        if 'stock' in form.changed_data and \
+                form.cleaned_data['stock'] is not None:
+            orders.set_stock(obj, form.cleaned_data['stock'])
+
+    @admin.action(description='Задать остаток', permissions=['change'])
+    def set_stock_products(self, request, queryset):
+        params = self.get_action_params(request)
+        if not params or params['stock'] is None:
+            self.message_user(request, 'Укажите остаток', messages.ERROR)
+            return
+        if params['dry_run']:
+            result = bulk.summarize(queryset)
+        else:
+            result = orders.bulk_set_stock(queryset, params['stock'])
+        self.report_bulk_result(request, result, params['dry_run'])
+
+    @admin.action(description='Удалить пакетно (без проверки связей)',
+                  permissions=['delete'])
+    def bulk_delete_products(self, request, queryset):
+        params = self.get_action_params(request) or {'dry_run': False}
+        result = bulk.delete(queryset, dry_run=params['dry_run'])
+        self.report_bulk_result(request, result, params['dry_run'])
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'run_after', 'locked_by']
+    list_filter = ['status', 'name']
+    readonly_fields = ['name', 'args', 'unique_key', 'attempts',
+                       'locked_by', 'locked_at', 'last_error', 'created_at']
+
+
+class OrderLineInline(admin.TabularInline):
+    model = OrderLine
+    extra = 0
+    fields = ['product', 'product_name', 'price', 'quantity']
+    readonly_fields = fields
+    can_delete = False
+
+
+@admin.register(Order)
+class OrderAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'status', 'total_price', 'created_at']
+    list_filter = ['status']
+    list_select_related = ['user']
+    readonly_fields = ['user', 'total_price', 'created_at']
+    inlines = [OrderLineInline]
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class BackendConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend'
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
+        from .imaging import configure_pillow
+        configure_pillow()
@@ -0,0 +1,140 @@
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (Count, DecimalField, ExpressionWrapper, F,
+                              Max, Min, Q, Sum, Value)
+from django.db.models.functions import Greatest, Round
+from .models import (CartItem, CatalogRevision, CatalogTombstone, OrderLine,
+                     Product, ProductRelation, ProductTrend, StockShard)
+from .signals import catalog_bulk_changed
+
+
+def iter_id_chunks(queryset, chunk_size=None):
+    """Итерирует id товаров по возрастанию пачками (keyset по pk)."""
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    ids = queryset.order_by('pk').values_list('pk', flat=True)
+    last_id = 0
+    while True:
+        chunk = list(ids.filter(pk__gt=last_id)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+
+def reserve_revisions(chunk):
+    """
+    Резервирует блок ревизий под пачку и возвращает смещение:
+    ревизия товара = pk + смещение, уникальная для каждой строки.
+    """
+    span = chunk[-1] - chunk[0] + 1
+    last_revision = CatalogRevision.next_value(span)
+    return last_revision - chunk[-1]
+
+
+def price_expression(percent=None, amount=None):
+    """Выражение новой цены, не опускающейся ниже нуля."""
+    output_field = DecimalField(max_digits=10, decimal_places=2)
+    price = F('price')
+    if percent is not None:
+        multiplier = 1 + Decimal(percent) / 100
+        price = ExpressionWrapper(price * Value(multiplier),
+                                  output_field=output_field)
+    if amount is not None:
+        price = ExpressionWrapper(price + Value(Decimal(amount)),
+                                  output_field=output_field)
+    return Greatest(Round(price, 2, output_field=output_field),
+                    Value(Decimal('0.00')), output_field=output_field)
+
+
+def summarize(queryset, percent=None, amount=None):
+    """Сводка по затрагиваемым товарам для пробного запуска."""
+    aggregates = {
+        'count': Count('pk'),
+        'price_total': Sum('price'),
+    }
+    if percent is not None or amount is not None:
+        new_price = price_expression(percent, amount)
+        aggregates.update(new_price_total=Sum(new_price),
+                          new_price_min=Min(new_price),
+                          new_price_max=Max(new_price))
+    return queryset.order_by().aggregate(**aggregates)
+
+
+def reprice(queryset, percent=None, amount=None, chunk_size=None,
+            dry_run=False):
+    """
+    Изменяет цены товаров на процент и/или сумму
+    пакетными UPDATE по chunk_size строк.
+    """
+    if percent is None and amount is None:
+        raise ValueError('Нужно указать процент или сумму изменения цены')
+    if dry_run:
+        return summarize(queryset, percent, amount)
+
+    expression = price_expression(percent, amount)
+    updated = 0
+    for chunk in iter_id_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            offset = reserve_revisions(chunk)
+            updated += Product.objects.filter(pk__in=chunk).update(
+                price=expression, revision=F('pk') + offset)
+        catalog_bulk_changed.send(sender=Product, action='reprice',
+                                  ids=chunk)
+    return {'count': updated}
+
+
+def move(queryset, subcategory, chunk_size=None, dry_run=False):
+    """Переносит товары в подкатегорию и её категорию."""
+    if dry_run:
+        return summarize(queryset)
+
+    updated = 0
+    for chunk in iter_id_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            offset = reserve_revisions(chunk)
+            updated += Product.objects.filter(pk__in=chunk).update(
+                category_id=subcategory.category_id, subcategory=subcategory,
+                revision=F('pk') + offset)
+        catalog_bulk_changed.send(sender=Product, action='move', ids=chunk)
+    return {'count': updated}
+
+
+def delete(queryset, chunk_size=None, dry_run=False):
+    """
+    Удаляет товары пакетами без загрузки объектов в память:
+    позиции корзин, остатки, связанные данные, отметки об удалении
+    и сами товары обрабатываются одним запросом на пачку.
+    Позиции заказов сохраняются без ссылки на товар.
+    """
+    if dry_run:
+        return summarize(queryset)
+
+    table = connection.ops.quote_name(Product._meta.db_table)
+    deleted = 0
+    for chunk in iter_id_chunks(queryset, chunk_size):
+        with transaction.atomic():
+            offset = reserve_revisions(chunk)
+            CatalogTombstone.objects.bulk_create(
+                CatalogTombstone(model='product', object_id=pk,
+                                 revision=pk + offset)
+                for pk in chunk
+            )
+            CartItem.objects.filter(product_id__in=chunk).delete()
+            StockShard.objects.filter(product_id__in=chunk).delete()
+            ProductTrend.objects.filter(product_id__in=chunk).delete()
+            ProductRelation.objects.filter(
+                Q(product_id__in=chunk) | Q(related_id__in=chunk)
+            ).delete()
+            OrderLine.objects.filter(product_id__in=chunk) \
+                .update(product=None)
+            placeholders = ', '.join(['%s'] * len(chunk))
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'DELETE FROM {table} WHERE id IN ({placeholders})',
+                    chunk
+                )
+                deleted += cursor.rowcount
+        catalog_bulk_changed.send(sender=Product, action='delete', ids=chunk)
+    return {'count': deleted}
@@ -0,0 +1,61 @@
+from django.db import connection
+from django.db.models import Prefetch
+from django.utils import timezone
+from .models import Cart, CartItem, Product
+
+
+def load_cart(user):
+    """Корзина пользователя с позициями и продуктами за два запроса."""
+    cart, _ = Cart.objects.prefetch_related(
+        Prefetch('cart_items',
+                 queryset=CartItem.objects.select_related('product'))
+    ).get_or_create(user=user)
+    return cart
+
+
+def _delete_returning(condition, params, user):
+    """
+    Удаляет позиции корзины пользователя по условию и обновляет
+    дату изменения корзины одним запросом (DELETE ... RETURNING в CTE).
+    """
+    item_table = connection.ops.quote_name(CartItem._meta.db_table)
+    cart_table = connection.ops.quote_name(Cart._meta.db_table)
+    product_table = connection.ops.quote_name(Product._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH deleted AS ('
+            f'DELETE FROM {item_table} AS item '
+            f'USING {cart_table} AS cart, {product_table} AS product '
+            f'WHERE item.cart_id = cart.id AND cart.user_id = %s '
+            f'AND item.product_id = product.id {condition} '
+            f'RETURNING item.cart_id), '
+            f'touched AS ('
+            f'UPDATE {cart_table} SET updated_at = %s '
+            f'WHERE id IN (SELECT cart_id FROM deleted)) '
+            f'SELECT count(*) FROM deleted',
+            [user.pk, *params, timezone.now()]
+        )
+        return cursor.fetchone()[0]
+
+
+def _delete_generic(user, **filters):
+    """То же двумя запросами для БД без изменяющих CTE."""
+    deleted, _ = CartItem.objects.filter(cart__user=user, **filters).delete()
+    if deleted:
+        Cart.objects.filter(user=user).update(updated_at=timezone.now())
+    return deleted
+
+
+def clear_cart(user):
+    """Удаляет все позиции корзины. Возвращает число удалённых позиций."""
+    if connection.vendor == 'postgresql':
+        return _delete_returning('', [], user)
+    return _delete_generic(user)
+
+
+def remove_cart_item(user, product_slug):
+    """Удаляет позицию продукта из корзины. Возвращает 0 или 1."""
+    if connection.vendor == 'postgresql':
+        return _delete_returning('AND product.slug = %s', [product_slug],
+                                 user)
+    return _delete_generic(user, product__slug=product_slug)
@@ -0,0 +1,56 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_GET
+from .models import Subcategory
+
+
+def cache_key(category_id):
+    return f'chained-subcategories:{category_id}'
+
+
+def get_chained_subcategories(category_id, refresh=False):
+    """
+    Возвращает подкатегории категории в формате smart_selects
+    и ETag списка. Результат кэшируется до изменения подкатегорий.
+    """
+    key = cache_key(category_id)
+    cached = None if refresh else cache.get(key)
+    if cached is None:
+        items = [
+            {'value': pk, 'display': name}
+            for pk, name in Subcategory.objects.filter(category_id=category_id)
+            .order_by('name').values_list('pk', 'name')
+        ]
+        digest = hashlib.sha256(
+            json.dumps(items, ensure_ascii=False).encode()).hexdigest()[:32]
+        cached = (items, f'"{digest}"')
+        cache.set(key, cached, None)
+    return cached
+
+
+def invalidate_chained_subcategories(*category_ids):
+    cache.delete_many([cache_key(category_id)
+                       for category_id in category_ids if category_id])
+
+
+@require_GET
+def chained_subcategories(request, category_id):
+    """
+    Замена представления smart_selects для цепочки
+    Product.category → Product.subcategory.
+    """
+    items, etag = get_chained_subcategories(category_id)
+    if etag in [tag.strip() for tag in
+                request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(items, safe=False)
+    response['ETag'] = etag
+    patch_cache_control(response, private=True,
+                        max_age=settings.CHAINED_SELECT_MAX_AGE)
+    return response
@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Cart, CartItem
+
+
+def iter_expired_cart_batches(cutoff, batch_size):
+    """
+    Итерирует id корзин, не изменявшихся с cutoff, пачками
+    по индексу (updated_at, id) без OFFSET.
+    """
+    carts = Cart.objects.filter(updated_at__lt=cutoff) \
+        .order_by('updated_at', 'pk')
+    last = None
+    while True:
+        batch = carts
+        if last is not None:
+            batch = batch.filter(Q(updated_at__gt=last[0]) |
+                                 Q(updated_at=last[0], pk__gt=last[1]))
+        rows = list(batch.values_list('updated_at', 'pk')[:batch_size])
+        if not rows:
+            return
+        yield [pk for _, pk in rows]
+        last = rows[-1]
+
+
+def delete_expired_carts(ttl_days=None, batch_size=None, on_batch=None):
+    """
+    Удаляет корзины, неактивные дольше ttl_days, вместе с позициями.
+    Каждая пачка удаляется в отдельной короткой транзакции;
+    корзины, изменённые после выборки, не удаляются.
+    Возвращает число удалённых корзин и позиций и время работы.
+    """
+    ttl_days = settings.CART_TTL_DAYS if ttl_days is None else ttl_days
+    batch_size = batch_size or settings.CART_CLEANUP_BATCH_SIZE
+    cutoff = timezone.now() - timedelta(days=ttl_days)
+    stats = {'carts': 0, 'items': 0, 'seconds': 0.0}
+    started = time.monotonic()
+    for ids in iter_expired_cart_batches(cutoff, batch_size):
+        with transaction.atomic():
+            _, deleted = Cart.objects.filter(pk__in=ids,
+                                             updated_at__lt=cutoff).delete()
+        stats['carts'] += deleted.get(Cart._meta.label, 0)
+        stats['items'] += deleted.get(CartItem._meta.label, 0)
+        stats['seconds'] = time.monotonic() - started
+        if on_batch is not None:
+            on_batch(stats)
+    stats['seconds'] = time.monotonic() - started
+    return stats
+
+
+def rows_per_second(stats):
+    rows = stats['carts'] + stats['items']
+    return rows / stats['seconds'] if stats['seconds'] else float(rows)
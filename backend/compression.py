@@ -0,0 +1,94 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Допустимые уровни сжатия для каждого алгоритма
+LEVEL_BOUNDS = {
+    'gzip': (1, 9),
+    'br': (0, 11),
+    'zstd': (1, 19),
+}
+
+# Расширения файлов, которые имеет смысл сжимать заранее
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.json', '.map', '.svg',
+                           '.txt', '.html', '.xml')
+
+# Суффиксы заранее сжатых файлов
+FILE_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def _compress_gzip(data, level):
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def _compress_br(data, level):
+    return brotli.compress(data, quality=level)
+
+
+def _compress_zstd(data, level):
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def available_codecs():
+    """Алгоритмы сжатия в порядке предпочтения сервера."""
+    codecs = {}
+    if zstandard is not None:
+        codecs['zstd'] = _compress_zstd
+    if brotli is not None:
+        codecs['br'] = _compress_br
+    codecs['gzip'] = _compress_gzip
+    return codecs
+
+
+def clamp_level(encoding, level):
+    low, high = LEVEL_BOUNDS[encoding]
+    return max(low, min(high, int(level)))
+
+
+def compress(data, encoding, level):
+    """Сжимает данные выбранным алгоритмом с ограниченным уровнем."""
+    return available_codecs()[encoding](data, clamp_level(encoding, level))
+
+
+def parse_accept_encoding(header):
+    """Разбирает Accept-Encoding в словарь {кодировка: q}."""
+    weights = {}
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    return weights
+
+
+def negotiate_encoding(header, supported):
+    """
+    Выбирает кодировку ответа из supported (в порядке предпочтения
+    сервера) по заголовку Accept-Encoding. Возвращает None,
+    если клиент не принимает ни одну из них.
+    """
+    weights = parse_accept_encoding(header or '')
+    default = weights.get('*', 0.0)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, default)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
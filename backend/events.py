@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+# Сообщение подписчику, который не успевал читать события
+RESYNC = {'event': 'resync', 'data': {}}
+
+
+class Subscription:
+    """
+    Очередь событий одного подключения. Пополняется из любого потока,
+    читается в цикле событий, в котором создана.
+    """
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+
+    def put(self, message):
+        self.loop.call_soon_threadsafe(self._put, message)
+
+    def _put(self, message):
+        if self.queue.full():
+            # Пропущенные события не восстановить: клиент перечитает корзину
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = RESYNC
+        self.queue.put_nowait(message)
+
+    async def get(self, timeout):
+        """Следующее событие или None, если за timeout секунд их не было."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class LocalBroker:
+    """Публикация событий подписчикам в пределах одного процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+
+    def subscribe(self, channel):
+        subscription = Subscription(channel)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.put(message)
+            except RuntimeError:
+                # Цикл событий подключения уже закрыт
+                self.unsubscribe(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Публикация через Redis pub/sub: события доходят до подписчиков
+    во всех процессах. Каждый процесс слушает Redis одним фоновым потоком
+    и раздаёт полученное своим подписчикам.
+    """
+
+    prefix = 'events:'
+
+    def __init__(self):
+        super().__init__()
+        self._client = None
+        self._thread = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+        return self._client
+
+    def subscribe(self, channel):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen,
+                                                name='events-listen',
+                                                daemon=True)
+                self._thread.start()
+        return super().subscribe(channel)
+
+    def publish(self, channel, message):
+        self.client.publish(self.prefix + channel,
+                            json.dumps(message, cls=DjangoJSONEncoder))
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.prefix + '*')
+                for item in pubsub.listen():
+                    channel = item['channel'].decode()[len(self.prefix):]
+                    self.deliver(channel, json.loads(item['data']))
+            except Exception:
+                logger.exception('Потеряно соединение с Redis для событий')
+                time.sleep(1)
+
+
+BROKERS = {
+    'local': LocalBroker(),
+    'redis': RedisBroker(),
+}
+
+
+def get_broker():
+    return BROKERS[settings.EVENTS_BROKER]
+
+
+def cart_channel(user_id):
+    return f'cart:{user_id}'
+
+
+def publish_cart_event(user_id, event, data):
+    """
+    Отправляет событие корзины пользователя после фиксации транзакции.
+    Ошибка доставки только записывается в журнал: изменение корзины
+    уже сохранено, а клиенты получат его при переподключении.
+    """
+    channel = cart_channel(user_id)
+    message = {'event': event, 'data': data}
+
+    def publish():
+        try:
+            get_broker().publish(channel, message)
+        except Exception:
+            logger.exception('Не удалось отправить событие корзины')
+
+    transaction.on_commit(publish)
+
+
+def format_event(message):
+    """Сообщение в формате text/event-stream."""
+    data = json.dumps(message['data'], cls=DjangoJSONEncoder,
+                      ensure_ascii=False)
+    return f'event: {message["event"]}\ndata: {data}\n\n'
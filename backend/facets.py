@@ -0,0 +1,95 @@
+from decimal import ROUND_CEILING, Decimal
+
+from django.db.models import Count, DecimalField, F, Max, Min, Value
+from django.db.models.functions import Floor
+
+
+def _bucket(row, key, **fields):
+    return row.setdefault(key, {**fields, 'count': 0,
+                                'min_price': None, 'max_price': None})
+
+
+def _money(value):
+    return None if value is None else f'{value:.2f}'
+
+
+def _format(bucket):
+    return {**bucket, 'min_price': _money(bucket['min_price']),
+            'max_price': _money(bucket['max_price'])}
+
+
+def _add(bucket, count, min_price, max_price):
+    bucket['count'] += count
+    if bucket['min_price'] is None or min_price < bucket['min_price']:
+        bucket['min_price'] = min_price
+    if bucket['max_price'] is None or max_price > bucket['max_price']:
+        bucket['max_price'] = max_price
+
+
+def bounded_step(queryset, price_step, max_buckets):
+    """
+    Шаг гистограммы не меньше price_step, при котором в диапазон цен
+    товаров queryset попадает не больше max_buckets интервалов.
+    """
+    prices = queryset.order_by().aggregate(low=Min('price'),
+                                           high=Max('price'))
+    if prices['low'] is None:
+        return price_step
+    min_step = ((prices['high'] - prices['low']) / (max_buckets - 1)) \
+        .quantize(Decimal('0.01'), rounding=ROUND_CEILING)
+    return max(price_step, min_step)
+
+
+def product_facets(queryset, price_step, max_buckets=None):
+    """
+    Фасеты по товарам queryset одним сгруппированным запросом:
+    число товаров и диапазон цен по категориям и подкатегориям,
+    гистограмма цен с шагом price_step. С max_buckets шаг сначала
+    увеличивается до ограничения числа интервалов (ещё один запрос).
+    """
+    if max_buckets:
+        price_step = bounded_step(queryset, price_step, max_buckets)
+    output_field = DecimalField(max_digits=12, decimal_places=0)
+    rows = queryset.order_by().values(
+        'category_id', 'category__slug', 'category__name',
+        'subcategory_id', 'subcategory__slug', 'subcategory__name',
+        bucket=Floor(F('price') / Value(price_step),
+                     output_field=output_field),
+    ).annotate(count=Count('pk'), min_price=Min('price'),
+               max_price=Max('price'))
+
+    total = {'count': 0, 'min_price': None, 'max_price': None}
+    categories = {}
+    histogram = {}
+    for row in rows:
+        stats = (row['count'], row['min_price'], row['max_price'])
+        _add(total, *stats)
+        category = _bucket(categories, row['category_id'],
+                           id=row['category_id'],
+                           slug=row['category__slug'],
+                           name=row['category__name'],
+                           subcategories={})
+        _add(category, *stats)
+        _add(_bucket(category['subcategories'], row['subcategory_id'],
+                     id=row['subcategory_id'],
+                     slug=row['subcategory__slug'],
+                     name=row['subcategory__name']), *stats)
+        low = Decimal(row['bucket']) * price_step
+        histogram[low] = histogram.get(low, 0) + row['count']
+
+    for category in categories.values():
+        category['subcategories'] = [
+            _format(item) for item in sorted(
+                category['subcategories'].values(),
+                key=lambda item: item['name'])
+        ]
+    return {
+        **_format(total),
+        'categories': [_format(item) for item in sorted(
+            categories.values(), key=lambda item: item['name'])],
+        'histogram': [
+            {'from': _money(low), 'to': _money(low + price_step),
+             'count': count}
+            for low, count in sorted(histogram.items())
+        ],
+    }
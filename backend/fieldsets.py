@@ -0,0 +1,108 @@
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(name='fields',
+                     description='Поля ответа через запятую',
+                     required=False, type=str,
+                     location=OpenApiParameter.QUERY),
+    OpenApiParameter(name='exclude',
+                     description='Исключаемые поля ответа через запятую',
+                     required=False, type=str,
+                     location=OpenApiParameter.QUERY),
+]
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+def parse_fieldset(query_params, available):
+    """
+    Поля ответа по параметрам fields и exclude (имена через запятую).
+    Без параметров — все поля. Неизвестное имя — ошибка 400.
+    """
+    requested = _split(query_params.get('fields', ''))
+    excluded = _split(query_params.get('exclude', ''))
+    unknown = [name for name in requested + excluded if name not in available]
+    if unknown:
+        raise serializers.ValidationError(
+            {'fields': [f'Неизвестное поле: {name}' for name in unknown]}
+        )
+    fieldset = [name for name in available
+                if not requested or name in requested]
+    return [name for name in fieldset if name not in excluded]
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Сериализатор, выводящий только поля из аргумента fields.
+    Для полей без простого source (SerializerMethodField) нужные
+    столбцы указываются в sparse_columns.
+    """
+
+    sparse_columns = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def field_lookups(cls, name):
+        if name in cls.sparse_columns:
+            return cls.sparse_columns[name]
+        source = cls._declared_fields.get(name)
+        source = source.source if source is not None and source.source \
+            else name
+        return [source.replace('.', '__')]
+
+
+def prune_queryset(queryset, serializer_class, fieldset):
+    """
+    Ограничивает запрос столбцами полей fieldset: only() по нужным
+    столбцам, select_related и prefetch_related — только для
+    запрошенных связей.
+    """
+    meta = queryset.model._meta
+    only, related, prefetch = {meta.pk.name}, set(), set()
+    for name in fieldset:
+        for lookup in serializer_class.field_lookups(name):
+            first = lookup.split('__', 1)[0]
+            field = meta.get_field(first)
+            if field.one_to_many or field.many_to_many:
+                prefetch.add(first)
+                continue
+            only.add(lookup)
+            if '__' in lookup:
+                related.add(first)
+    queryset = queryset.only(*only)
+    if related:
+        queryset = queryset.select_related(*related)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class SparseFieldsMixin:
+    """
+    Параметры fields и exclude для списков: лишние поля не
+    сериализуются, а их столбцы и связи не читаются из БД.
+    """
+
+    def get_fieldset(self):
+        if not hasattr(self, '_fieldset'):
+            available = list(self.get_serializer_class()().fields)
+            self._fieldset = parse_fieldset(self.request.query_params,
+                                            available)
+        return self._fieldset
+
+    def get_queryset(self):
+        return prune_queryset(super().get_queryset(),
+                              self.get_serializer_class(),
+                              self.get_fieldset())
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs['fields'] = self.get_fieldset()
+        return super().get_serializer(*args, **kwargs)
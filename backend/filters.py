@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+
+PRODUCT_FILTER_PARAMETERS = [
+    OpenApiParameter(name='category', description='Slug категории',
+                     required=False, type=str,
+                     location=OpenApiParameter.QUERY),
+    OpenApiParameter(name='subcategory', description='Slug подкатегории',
+                     required=False, type=str,
+                     location=OpenApiParameter.QUERY),
+    OpenApiParameter(name='min_price', description='Минимальная цена',
+                     required=False, type=float,
+                     location=OpenApiParameter.QUERY),
+    OpenApiParameter(name='max_price', description='Максимальная цена',
+                     required=False, type=float,
+                     location=OpenApiParameter.QUERY),
+]
+
+
+class ProductFilterSerializer(serializers.Serializer):
+    category = serializers.SlugField(required=False)
+    subcategory = serializers.SlugField(required=False)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                         min_value=0, required=False)
+    max_price = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                         min_value=0, required=False)
+
+
+class FacetsQuerySerializer(ProductFilterSerializer):
+    price_step = serializers.DecimalField(max_digits=10, decimal_places=2,
+                                          min_value=Decimal('0.01'),
+                                          required=False)
+
+
+def product_filter_params(query_params):
+    """
+    Проверенные параметры фильтра товаров: category, subcategory
+    (slug), min_price, max_price. Некорректные значения — ошибка 400.
+    """
+    serializer = ProductFilterSerializer(data=query_params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def filter_products(queryset, query_params):
+    """Фильтрует товары по параметрам запроса (product_filter_params)."""
+    params = product_filter_params(query_params)
+    if 'category' in params:
+        queryset = queryset.filter(category__slug=params['category'])
+    if 'subcategory' in params:
+        queryset = queryset.filter(subcategory__slug=params['subcategory'])
+    if 'min_price' in params:
+        queryset = queryset.filter(price__gte=params['min_price'])
+    if 'max_price' in params:
+        queryset = queryset.filter(price__lte=params['max_price'])
+    return queryset
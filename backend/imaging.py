@@ -0,0 +1,66 @@
+import io
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+from .taskqueue import enqueue
+
+decode_semaphore = threading.BoundedSemaphore(
+    settings.IMAGE_DECODE_CONCURRENCY)
+
+
+class DeferredStrategy:
+    """
+    Стратегия imagekit: уменьшенные копии создаются фоновой задачей
+    после сохранения исходного изображения, а не в потоке запроса.
+    Если копии ещё нет (задача не выполнена, изображение загружено
+    раньше), она создаётся при первом обращении к URL; наличие файла
+    imagekit запоминает в кэше.
+    """
+
+    def on_source_saved(self, file):
+        instance = file.generator.source.instance
+        enqueue('generate_renditions', instance._meta.label_lower,
+                instance.pk, unique=True)
+
+    def on_existence_required(self, file):
+        file.generate()
+
+    def on_content_required(self, file):
+        file.generate()
+
+
+def configure_pillow():
+    """Ограничивает число пикселей, которое Pillow согласится декодировать."""
+    Image.MAX_IMAGE_PIXELS = settings.IMAGE_MAX_MEGAPIXELS * 1_000_000
+
+
+def downscale_master(field_file):
+    """
+    Уменьшает только что загруженное изображение до
+    IMAGE_MASTER_MAX_SIDE по большей стороне перед сохранением.
+    JPEG декодируется сразу в уменьшенном масштабе (draft),
+    число одновременных декодирований ограничено семафором.
+    """
+    if not field_file or field_file._committed:
+        return
+    max_side = settings.IMAGE_MASTER_MAX_SIDE
+    with decode_semaphore:
+        field_file.seek(0)
+        with Image.open(field_file) as img:
+            width, height = img.size
+            if width * height > settings.IMAGE_MAX_MEGAPIXELS * 1_000_000:
+                raise ValidationError('Слишком большое разрешение изображения')
+            if max(img.size) <= max_side:
+                field_file.seek(0)
+                return
+            image_format = img.format
+            img.draft(img.mode, (max_side, max_side))
+            img.thumbnail((max_side, max_side))
+            img = ImageOps.exif_transpose(img)
+            buffer = io.BytesIO()
+            options = {'quality': 90} if image_format == 'JPEG' else {}
+            img.save(buffer, format=image_format, **options)
+    field_file.file = ContentFile(buffer.getvalue(), name=field_file.name)
@@ -0,0 +1,74 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from backend.models import CatalogRevision, Category, Product
+from backend.serializers import CategorySerializer, ProductSerializer
+from backend.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает чтение каталога через ORM и из снимка в памяти: '
+            'список категорий и страница товаров с фильтром.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=200,
+                            help='Число повторов каждой операции')
+        parser.add_argument('--page-size', type=int, default=20,
+                            help='Размер страницы товаров')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        page_size = options['page_size']
+
+        tracemalloc.start()
+        started = time.perf_counter()
+        snapshot = build_snapshot(CatalogRevision.current())
+        build_seconds = time.perf_counter() - started
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.stdout.write(
+            f'Снимок: {len(snapshot.categories)} категорий, '
+            f'{len(snapshot.products)} товаров, сборка '
+            f'{build_seconds * 1000:.1f} мс, {memory / 1024 / 1024:.1f} МБ'
+        )
+        if not snapshot.products:
+            self.stdout.write(self.style.WARNING('Каталог пуст'))
+            return
+
+        sample = snapshot.products[len(snapshot.products) // 2]
+        params = {'category': sample.category_slug}
+
+        def orm_categories():
+            categories = Category.objects.prefetch_related('subcategories')
+            return CategorySerializer(categories, many=True).data
+
+        def orm_products():
+            queryset = Product.objects.filter(
+                category__slug=params['category']
+            ).select_related('category', 'subcategory')[:page_size]
+            return ProductSerializer(queryset, many=True).data
+
+        def snapshot_categories():
+            return [record.data for record in snapshot.categories]
+
+        def snapshot_products():
+            return [record.data for record in
+                    snapshot.filter_products(params)[:page_size]]
+
+        for name, orm, memory_path in (
+                ('Категории', orm_categories, snapshot_categories),
+                ('Страница товаров', orm_products, snapshot_products)):
+            orm_ms = self.measure(orm, repeat)
+            memory_ms = self.measure(memory_path, repeat)
+            self.stdout.write(
+                f'{name}: ORM {orm_ms:.3f} мс, снимок {memory_ms:.3f} мс '
+                f'(в {orm_ms / max(memory_ms, 1e-6):.0f} раз быстрее)'
+            )
+
+    def measure(self, func, repeat):
+        """Среднее время одного вызова, мс."""
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat * 1000
@@ -0,0 +1,98 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from backend import orders
+from backend.models import Cart, CartItem, Category, Product, Subcategory
+
+
+class Command(BaseCommand):
+    help = ('Нагрузочный тест оформления заказов одного товара '
+            'параллельными потоками при разном числе частей остатка. '
+            'Имеет смысл только на PostgreSQL.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=16,
+                            help='Число параллельных покупателей')
+        parser.add_argument('--orders', type=int, default=500,
+                            help='Число заказов в каждом прогоне')
+        parser.add_argument('--shards', type=int, nargs='+',
+                            default=[1, settings.STOCK_SHARDS],
+                            help='Варианты числа частей остатка')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            self.stdout.write(self.style.WARNING(
+                f'БД {connection.vendor} не поддерживает SKIP LOCKED, '
+                'результаты не показательны'))
+
+        marker = uuid.uuid4().hex[:8]
+        category = Category.objects.create(name=f'Тест заказов {marker}')
+        subcategory = Subcategory.objects.create(category=category,
+                                                 name=f'Тест {marker}')
+        product = Product.objects.create(name=f'Горячий товар {marker}',
+                                         price=1, category=category,
+                                         subcategory=subcategory)
+        users = [get_user_model().objects.create_user(
+                     username=f'bench-{marker}-{number}')
+                 for number in range(options['workers'])]
+        try:
+            for shards in options['shards']:
+                self.run(product, users, shards, options['orders'])
+        finally:
+            get_user_model().objects.filter(pk__in=[user.pk
+                                                    for user in users]) \
+                .delete()
+            category.delete()
+
+    def run(self, product, users, shards, total):
+        orders.set_stock(product, total, shards)
+        remaining = iter(range(total))
+        lock = threading.Lock()
+        stats = {'orders': 0, 'out_of_stock': 0, 'errors': 0}
+
+        def worker(user):
+            cart, _ = Cart.objects.get_or_create(user=user)
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    CartItem.objects.create(cart=cart, product=product,
+                                            quantity=1, price=product.price)
+                    try:
+                        orders.checkout(user)
+                        result = 'orders'
+                    except orders.OutOfStock:
+                        CartItem.objects.filter(cart=cart).delete()
+                        result = 'out_of_stock'
+                    except Exception:
+                        CartItem.objects.filter(cart=cart).delete()
+                        result = 'errors'
+                    with lock:
+                        stats[result] += 1
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(user,))
+                   for user in users]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        left = orders.get_stock([product.pk])[product.pk]
+        style = self.style.SUCCESS if left + stats['orders'] == total \
+            else self.style.ERROR
+        self.stdout.write(style(
+            f'Частей: {shards}, заказов: {stats["orders"]}, '
+            f'отказов: {stats["out_of_stock"]}, ошибок: {stats["errors"]}, '
+            f'{stats["orders"] / seconds:.0f} заказов/с, '
+            f'остаток: {left}'
+        ))
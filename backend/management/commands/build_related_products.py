@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from backend.recommendations import build_related_products
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает связанные товары («покупают вместе») '
+            'по корзинам, изменённым после прошлого запуска.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Пересчитать все товары')
+        parser.add_argument('--top-k', type=int,
+                            default=settings.RELATED_PRODUCTS_TOP_K,
+                            help='Число связанных товаров на товар')
+
+    def handle(self, *args, **options):
+        result = build_related_products(full=options['full'],
+                                        top_k=options['top_k'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано товаров: {result["products"]}, '
+            f'связей: {result["relations"]}'
+        ))
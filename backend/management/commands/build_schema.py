@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from backend.schema import render_schema, variant_paths, write_schema
+
+
+class Command(BaseCommand):
+    help = ('Генерирует OpenAPI-схему и её сжатые варианты '
+            'в SCHEMA_FILE. С флагом --check проверяет актуальность схемы.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Завершиться ошибкой, если сохранённая схема устарела'
+        )
+
+    def handle(self, *args, **options):
+        content = render_schema()
+        path = variant_paths()['identity']
+
+        if options['check']:
+            if not path.exists():
+                raise CommandError(f'Схема не найдена: {path}')
+            if path.read_bytes() != content:
+                raise CommandError(
+                    f'Схема {path} устарела, выполните '
+                    f'"python manage.py build_schema"'
+                )
+            self.stdout.write(self.style.SUCCESS('Схема актуальна'))
+            return
+
+        paths = write_schema(content)
+        for encoding, variant in paths.items():
+            if variant.exists():
+                self.stdout.write(f'{encoding}: {variant} '
+                                  f'({variant.stat().st_size} байт)')
+        self.stdout.write(self.style.SUCCESS(
+            f'Схема записана в {settings.SCHEMA_FILE}'))
@@ -0,0 +1,62 @@
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from backend import bulk
+from backend.models import Subcategory, Product
+
+
+class Command(BaseCommand):
+    help = ('Массовое изменение товаров пакетными UPDATE: '
+            'изменение цен, перенос между категориями и удаление.')
+
+    def add_arguments(self, parser):
+        selection = parser.add_argument_group('Выбор товаров')
+        selection.add_argument('--category', help='Slug категории')
+        selection.add_argument('--subcategory', help='Slug подкатегории')
+        selection.add_argument('--slugs', help='Slug товаров через запятую')
+
+        operation = parser.add_argument_group('Операция')
+        operation.add_argument('--percent', type=Decimal,
+                               help='Изменить цену на процент (например, -10)')
+        operation.add_argument('--amount', type=Decimal,
+                               help='Изменить цену на сумму')
+        operation.add_argument('--move-to',
+                               help='Slug подкатегории для переноса')
+        operation.add_argument('--delete', action='store_true',
+                               help='Удалить товары')
+
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Показать сводку без изменений')
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options['category']:
+            queryset = queryset.filter(category__slug=options['category'])
+        if options['subcategory']:
+            queryset = queryset.filter(
+                subcategory__slug=options['subcategory'])
+        if options['slugs']:
+            queryset = queryset.filter(slug__in=options['slugs'].split(','))
+
+        common = {'chunk_size': options['chunk_size'],
+                  'dry_run': options['dry_run']}
+        try:
+            if options['delete']:
+                result = bulk.delete(queryset, **common)
+            elif options['move_to']:
+                subcategory = Subcategory.objects.get(slug=options['move_to'])
+                result = bulk.move(queryset, subcategory, **common)
+            elif options['percent'] is not None or \
+                    options['amount'] is not None:
+                result = bulk.reprice(queryset, percent=options['percent'],
+                                      amount=options['amount'], **common)
+            else:
+                raise CommandError('Не указана операция')
+        except Subcategory.DoesNotExist:
+            raise CommandError('Подкатегория не найдена')
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        prefix = 'Пробный запуск' if options['dry_run'] else 'Готово'
+        details = ', '.join(f'{key}: {value}' for key, value in result.items())
+        self.stdout.write(self.style.SUCCESS(f'{prefix} — {details}'))
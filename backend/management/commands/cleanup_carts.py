@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from backend import cleanup
+
+
+class Command(BaseCommand):
+    help = 'Удаляет корзины, неактивные дольше заданного срока, пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl-days', type=float,
+                            default=settings.CART_TTL_DAYS,
+                            help='Срок хранения неактивной корзины, дней')
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.CART_CLEANUP_BATCH_SIZE,
+                            help='Число корзин в одной пачке')
+
+    def handle(self, *args, **options):
+        stats = cleanup.delete_expired_carts(options['ttl_days'],
+                                             options['batch_size'],
+                                             on_batch=self.report)
+        self.stdout.write(self.style.SUCCESS(
+            f'Удалено корзин: {stats["carts"]}, позиций: {stats["items"]} '
+            f'за {stats["seconds"]:.2f} с '
+            f'({cleanup.rows_per_second(stats):.0f} строк/с)'
+        ))
+
+    def report(self, stats):
+        self.stdout.write(f'Корзин: {stats["carts"]}, '
+                          f'позиций: {stats["items"]}, '
+                          f'{cleanup.rows_per_second(stats):.0f} строк/с')
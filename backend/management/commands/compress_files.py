@@ -0,0 +1,38 @@
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from backend.compression import (COMPRESSIBLE_EXTENSIONS, FILE_SUFFIXES,
+                                 LEVEL_BOUNDS, available_codecs, compress)
+
+
+class Command(BaseCommand):
+    help = ('Создаёт заранее сжатые варианты (.gz/.br) текстовых файлов '
+            'в STATIC_ROOT (после collectstatic) или в указанных каталогах.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help='Каталоги для обработки (по умолчанию STATIC_ROOT)')
+
+    def handle(self, *args, **options):
+        roots = [Path(path) for path in options['paths']] or \
+            [Path(settings.STATIC_ROOT)]
+        encodings = [encoding for encoding in available_codecs()
+                     if encoding in FILE_SUFFIXES]
+        created = 0
+        for root in roots:
+            for path in root.rglob('*'):
+                if not path.is_file() or \
+                        path.suffix.lower() not in COMPRESSIBLE_EXTENSIONS:
+                    continue
+                content = path.read_bytes()
+                for encoding in encodings:
+                    target = path.with_name(path.name + FILE_SUFFIXES[encoding])
+                    if target.exists() and \
+                            target.stat().st_mtime >= path.stat().st_mtime:
+                        continue
+                    compressed = compress(content, encoding,
+                                          LEVEL_BOUNDS[encoding][1])
+                    if len(compressed) < len(content):
+                        target.write_bytes(compressed)
+                        created += 1
+        self.stdout.write(self.style.SUCCESS(f'Создано сжатых файлов: {created}'))
@@ -0,0 +1,65 @@
+import posixpath
+import time
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from backend.models import Category, Subcategory, Product
+from backend.storage import ContentAddressedStorage
+
+MODELS = (Category, Subcategory, Product)
+
+
+class Command(BaseCommand):
+    help = ('Удаляет изображения в хранилище по хэшу содержимого, на которые '
+            'не ссылается ни один объект каталога, вместе с их копиями.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24,
+                            help='Не удалять файлы моложе указанного возраста')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Только показать файлы для удаления')
+
+    def handle(self, *args, **options):
+        deadline = time.time() - options['grace_hours'] * 3600
+        removed = 0
+        for model in MODELS:
+            field = model._meta.get_field('image')
+            storage = field.storage
+            if not isinstance(storage, ContentAddressedStorage):
+                continue
+            referenced = set(model.objects.exclude(image='')
+                             .exclude(image__isnull=True)
+                             .values_list('image', flat=True))
+            for name in self.iter_files(storage, field.upload_to.rstrip('/')):
+                if name in referenced or \
+                        storage.get_modified_time(name).timestamp() > deadline:
+                    continue
+                removed += 1
+                self.stdout.write(f'Удаление: {name}')
+                if not options['dry_run']:
+                    storage.delete(name)
+                    self.delete_renditions(name)
+
+        prefix = 'Пробный запуск, к удалению' if options['dry_run'] else 'Удалено'
+        self.stdout.write(self.style.SUCCESS(f'{prefix} файлов: {removed}'))
+
+    def iter_files(self, storage, directory):
+        if not storage.exists(directory):
+            return
+        subdirectories, _ = storage.listdir(directory)
+        for subdirectory in subdirectories:
+            path = posixpath.join(directory, subdirectory)
+            _, files = storage.listdir(path)
+            for file_name in files:
+                yield posixpath.join(path, file_name)
+
+    def delete_renditions(self, name):
+        """Удаляет уменьшенные копии imagekit для исходного файла."""
+        directory = posixpath.join(settings.IMAGEKIT_CACHEFILE_DIR,
+                                   posixpath.splitext(name)[0])
+        if not default_storage.exists(directory):
+            return
+        _, files = default_storage.listdir(directory)
+        for file_name in files:
+            default_storage.delete(posixpath.join(directory, file_name))
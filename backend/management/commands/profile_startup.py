@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from backend.startup import measure_startup
+
+
+class Command(BaseCommand):
+    help = 'Показывает время загрузки процесса по фазам и импортам модулей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20,
+                            help='Число самых медленных модулей')
+        parser.add_argument('--tree', action='store_true',
+                            help='Вывести дерево импортов')
+        parser.add_argument('--min-ms', type=float, default=5,
+                            help='Порог суммарного времени для дерева, мс')
+        parser.add_argument('--check', action='store_true',
+                            help='Завершиться с ошибкой при превышении '
+                                 'STARTUP_TIME_BUDGET')
+
+    def handle(self, *args, **options):
+        report = measure_startup()
+        imports = report['imports']
+
+        for name, seconds in report['phases']:
+            self.stdout.write(f'{name:<14} {seconds * 1000:8.1f} мс')
+
+        self.stdout.write('\nСамые медленные модули (собственное время):')
+        for name, self_us, cumulative_us, _ in sorted(
+                imports, key=lambda entry: entry[1],
+                reverse=True)[:options['limit']]:
+            self.stdout.write(f'{self_us / 1000:8.1f} {cumulative_us / 1000:8.1f}'
+                              f' мс  {name}')
+
+        if options['tree']:
+            self.stdout.write('\nДерево импортов (суммарное время):')
+            # -X importtime печатает модуль после его зависимостей
+            for name, _, cumulative_us, depth in reversed(imports):
+                if cumulative_us >= options['min_ms'] * 1000:
+                    self.stdout.write(f'{cumulative_us / 1000:8.1f} мс  '
+                                      f'{"  " * depth}{name}')
+
+        total = report['total']
+        style = self.style.SUCCESS if total <= settings.STARTUP_TIME_BUDGET \
+            else self.style.WARNING
+        self.stdout.write(style(
+            f'\nВсего: {total:.2f} с, модулей: {len(report["modules"])}, '
+            f'бюджет: {settings.STARTUP_TIME_BUDGET:.2f} с'
+        ))
+        if options['check'] and total > settings.STARTUP_TIME_BUDGET:
+            raise CommandError('Время загрузки превышает STARTUP_TIME_BUDGET')
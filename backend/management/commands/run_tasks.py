@@ -0,0 +1,56 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from backend import taskqueue
+
+
+def run_in_thread(task_obj):
+    try:
+        return taskqueue.execute(task_obj)
+    finally:
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = 'Обработчик фоновых задач из очереди в БД.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2,
+                            help='Число одновременно выполняемых задач')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Пауза между опросами пустой очереди, сек')
+        parser.add_argument('--once', action='store_true',
+                            help='Выполнить готовые задачи и завершиться')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.stdout.write(f'Обработчик {worker_id}, потоков: {concurrency}')
+
+        taskqueue.schedule_periodic_tasks()
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            while True:
+                close_old_connections()
+                taskqueue.release_stale_tasks()
+                free = concurrency - len(running)
+                claimed = taskqueue.claim(worker_id, free) if free else []
+                for task_obj in claimed:
+                    running.add(executor.submit(run_in_thread, task_obj))
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                done, running = wait(running,
+                                     timeout=options['poll_interval'],
+                                     return_when=FIRST_COMPLETED)
+                for future in done:
+                    status = 'OK' if future.result() else 'ошибка'
+                    self.stdout.write(f'Задача выполнена: {status}')
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from backend import bulk, orders
+from backend.models import Product
+
+
+class Command(BaseCommand):
+    help = ('Задаёт остаток товаров, распределяя его по STOCK_SHARDS '
+            'частям. Без частей остатка заказ товара невозможен.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('quantity', type=int, help='Остаток каждого товара')
+
+        selection = parser.add_argument_group('Выбор товаров')
+        selection.add_argument('--category', help='Slug категории')
+        selection.add_argument('--subcategory', help='Slug подкатегории')
+        selection.add_argument('--slugs', help='Slug товаров через запятую')
+        selection.add_argument('--missing', action='store_true',
+                               help='Только товары без частей остатка')
+
+        parser.add_argument('--shards', type=int, default=None,
+                            help='Число частей (по умолчанию STOCK_SHARDS)')
+        parser.add_argument('--chunk-size', type=int, default=None)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Показать сводку без изменений')
+
+    def handle(self, *args, **options):
+        queryset = Product.objects.all()
+        if options['category']:
+            queryset = queryset.filter(category__slug=options['category'])
+        if options['subcategory']:
+            queryset = queryset.filter(
+                subcategory__slug=options['subcategory'])
+        if options['slugs']:
+            queryset = queryset.filter(slug__in=options['slugs'].split(','))
+        if options['missing']:
+            queryset = queryset.filter(stock_shards__isnull=True)
+
+        if options['dry_run']:
+            result = bulk.summarize(queryset)
+        else:
+            result = orders.bulk_set_stock(queryset, options['quantity'],
+                                           shards=options['shards'],
+                                           chunk_size=options['chunk_size'])
+
+        prefix = 'Пробный запуск' if options['dry_run'] else 'Готово'
+        details = ', '.join(f'{key}: {value}' for key, value in result.items())
+        self.stdout.write(self.style.SUCCESS(f'{prefix} — {details}'))
@@ -0,0 +1,39 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from backend.querylog import aggregate, read_log
+
+
+class Command(BaseCommand):
+    help = 'Сводка журнала медленных запросов по отпечаткам SQL.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=10,
+                            help='Число худших запросов')
+        parser.add_argument('--hours', type=float,
+                            help='Только записи за последние N часов')
+        parser.add_argument('--plans', action='store_true',
+                            help='Выводить планы запросов')
+
+    def handle(self, *args, **options):
+        since = time.time() - options['hours'] * 3600 \
+            if options['hours'] else None
+        groups = aggregate(read_log(settings.SLOW_QUERY_LOG_FILE, since))
+        if not groups:
+            self.stdout.write('Медленных запросов нет')
+            return
+
+        for group in groups[:options['limit']]:
+            self.stdout.write(self.style.WARNING(
+                f'{group["fingerprint"]}: {group["count"]} раз, '
+                f'всего {group["total_ms"]:.0f} мс, '
+                f'среднее {group["avg_ms"]:.1f} мс, '
+                f'макс. {group["max_ms"]:.1f} мс'
+            ))
+            self.stdout.write(f'  {group["sql"]}')
+            if group['sources']:
+                self.stdout.write(f'  Источники: {", ".join(group["sources"])}')
+            if options['plans'] and group['plan']:
+                for line in group['plan'].splitlines():
+                    self.stdout.write(f'    {line}')
@@ -0,0 +1,91 @@
+import re
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from .compression import available_codecs, compress, negotiate_encoding
+from .querylog import log_slow_queries, set_source
+from .routers import use_primary
+
+re_compressible_type = re.compile(
+    r'^(text/|application/(.+\+)?(json|javascript|xml))'
+)
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы крупнее COMPRESSION_MIN_SIZE алгоритмом, выбранным
+    по Accept-Encoding (zstd, br, gzip — из доступных в окружении).
+    Уровень сжатия задаётся в COMPRESSION_LEVELS и ограничивается
+    допустимыми границами алгоритма.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (response.streaming
+                or response.has_header('Content-Encoding')
+                or response.status_code != 200
+                or len(response.content) < settings.COMPRESSION_MIN_SIZE
+                or not re_compressible_type.match(
+                    response.get('Content-Type', ''))):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'),
+                                      available_codecs())
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding,
+                              settings.COMPRESSION_LEVELS[encoding])
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # Сжатое представление не совпадает побайтно с исходным
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Сбрасывает привязку к основной БД в начале каждого запроса.
+    Изменяющие запросы (POST, PUT, PATCH, DELETE) целиком читают
+    с основной БД.
+    """
+
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with use_primary(request.method not in self.safe_methods):
+            return self.get_response(request)
+
+
+class SlowQueryLogMiddleware:
+    """
+    Журнал медленных запросов к БД (backend.querylog) с именем
+    представления, которое их выполнило. Подключается только
+    при SLOW_QUERY_LOG = True.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with log_slow_queries(f'{request.method} {request.path}'):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        set_source(f'{request.method} {request.resolver_match.view_name}')
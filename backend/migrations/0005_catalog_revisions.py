@@ -0,0 +1,71 @@
+# Generated by Django 5.2.11 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+def assign_initial_revisions(apps, schema_editor):
+    """Присваивает существующим объектам каталога уникальные ревизии."""
+    db_alias = schema_editor.connection.alias
+    revision = 0
+    for model_name in ('Category', 'Subcategory', 'Product'):
+        model = apps.get_model('backend', model_name)
+        objects = model.objects.using(db_alias)
+        for pk in objects.order_by('pk').values_list('pk', flat=True):
+            revision += 1
+            objects.filter(pk=pk).update(revision=revision)
+    CatalogRevision = apps.get_model('backend', 'CatalogRevision')
+    CatalogRevision.objects.using(db_alias).update_or_create(
+        pk=1, defaults={'value': revision})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0004_alter_product_subcategory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.BigIntegerField(default=0, verbose_name='Текущая ревизия')),
+            ],
+            options={
+                'verbose_name': 'Ревизия каталога',
+                'verbose_name_plural': 'Ревизии каталога',
+            },
+        ),
+        migrations.CreateModel(
+            name='CatalogTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('category', 'Категория'), ('subcategory', 'Подкатегория'), ('product', 'Продукт')], max_length=20, verbose_name='Модель')),
+                ('object_id', models.BigIntegerField(verbose_name='ID объекта')),
+                ('revision', models.BigIntegerField(db_index=True, verbose_name='Ревизия')),
+                ('deleted_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата удаления')),
+            ],
+            options={
+                'verbose_name': 'Удалённый объект каталога',
+                'verbose_name_plural': 'Удалённые объекты каталога',
+                'ordering': ('revision',),
+            },
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Ревизия'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Ревизия'),
+        ),
+        migrations.AddField(
+            model_name='subcategory',
+            name='revision',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False, verbose_name='Ревизия'),
+        ),
+        migrations.RunPython(assign_initial_revisions,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.11 on 2026-10-19 17:11
+
+import backend.storage
+import backend.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0007_image_dimensions_validator'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Максимальный размер: 5МВ', null=True, storage=backend.storage.ContentAddressedStorage(), upload_to='categories/', validators=[backend.validators.validate_image_size, backend.validators.validate_image_dimensions], verbose_name='Изображение'),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Максимальный размер: 5МВ', null=True, storage=backend.storage.ContentAddressedStorage(), upload_to='products/', validators=[backend.validators.validate_image_size, backend.validators.validate_image_dimensions], verbose_name='Изображение'),
+        ),
+        migrations.AlterField(
+            model_name='subcategory',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Максимальный размер: 5МВ', null=True, storage=backend.storage.ContentAddressedStorage(), upload_to='subcategories/', validators=[backend.validators.validate_image_size, backend.validators.validate_image_dimensions], verbose_name='Изображение'),
+        ),
+    ]
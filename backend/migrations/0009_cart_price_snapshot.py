@@ -0,0 +1,39 @@
+# Generated by Django 5.2.11 on 2026-10-19 19:00
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_product_prices(apps, schema_editor):
+    """Заполняет цену позиций корзин текущей ценой продукта."""
+    CartItem = apps.get_model('backend', 'CartItem')
+    Product = apps.get_model('backend', 'Product')
+    db_alias = schema_editor.connection.alias
+    CartItem.objects.using(db_alias).update(price=Subquery(
+        Product.objects.filter(pk=OuterRef('product_id')).values('price')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0008_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='prices_changed',
+            field=models.BooleanField(default=False, verbose_name='Цены изменились'),
+        ),
+        migrations.AddField(
+            model_name='cartitem',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0'), max_digits=10, verbose_name='Цена на момент добавления'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_product_prices,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.11 on 2026-10-19 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0009_cart_price_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cart',
+            index=models.Index(fields=['updated_at', 'id'], name='backend_car_updated_336519_idx'),
+        ),
+    ]
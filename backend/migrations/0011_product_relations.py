@@ -0,0 +1,40 @@
+# Generated by Django 5.2.11 on 2026-10-19 17:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0010_cart_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecommendationState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_run', models.DateTimeField(blank=True, null=True, verbose_name='Последний пересчёт')),
+            ],
+            options={
+                'verbose_name': 'Состояние рекомендаций',
+                'verbose_name_plural': 'Состояние рекомендаций',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductRelation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveIntegerField(verbose_name='Число общих корзин')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='relations', to='backend.product', verbose_name='Продукт')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_to', to='backend.product', verbose_name='Связанный продукт')),
+            ],
+            options={
+                'verbose_name': 'Связанный продукт',
+                'verbose_name_plural': 'Связанные продукты',
+                'indexes': [models.Index(fields=['product', '-score'], name='backend_pro_product_5f9cfb_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'related'), name='unique_product_relation')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.11 on 2026-10-19 17:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0011_product_relations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductTrend',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trend', serialize=False, to='backend.product', verbose_name='Продукт')),
+                ('score', models.FloatField(default=0, verbose_name='Популярность')),
+                ('updated_at', models.DateTimeField(verbose_name='Момент расчёта')),
+            ],
+            options={
+                'verbose_name': 'Популярность товара',
+                'verbose_name_plural': 'Популярность товаров',
+            },
+        ),
+    ]
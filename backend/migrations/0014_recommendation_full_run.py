@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('backend', '0013_orders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recommendationstate',
+            name='last_full_run',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Последний полный пересчёт'),
+        ),
+    ]
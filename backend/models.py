@@ -1,14 +1,107 @@
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
+from django.utils import timezone
 from imagekit.models import ImageSpecField
 from imagekit.processors import ResizeToFill
-from .validators import validate_image_size
+from .storage import content_addressed_storage
+from .validators import validate_image_size, validate_image_dimensions
 from .utils import generate_unique_slug
 from smart_selects.db_fields import ChainedForeignKey
 
 
-class Category(models.Model):
+class CatalogRevision(models.Model):
+    """
+    Счётчик ревизий каталога. Хранится в единственной строке,
+    блокировка которой упорядочивает изменения каталога.
+    """
+
+    value = models.BigIntegerField(
+        default=0,
+        verbose_name='Текущая ревизия'
+    )
+
+    class Meta:
+        verbose_name = 'Ревизия каталога'
+        verbose_name_plural = 'Ревизии каталога'
+
+    @classmethod
+    def current(cls):
+        counter = cls.objects.filter(pk=1).values_list('value', flat=True)
+        return counter.first() or 0
+
+    @classmethod
+    def next_value(cls, count=1):
+        """
+        Резервирует count ревизий и возвращает последнюю из них.
+        Вызывать внутри транзакции изменения каталога.
+        """
+        updated = cls.objects.filter(pk=1).update(value=F('value') + count)
+        if not updated:
+            cls.objects.get_or_create(pk=1)
+            cls.objects.filter(pk=1).update(value=F('value') + count)
+        return cls.objects.values_list('value', flat=True).get(pk=1)
+
+
+class CatalogTombstone(models.Model):
+    """Запись об удалённом объекте каталога для дельта-синхронизации."""
+
+    MODEL_CHOICES = (
+        ('category', 'Категория'),
+        ('subcategory', 'Подкатегория'),
+        ('product', 'Продукт'),
+    )
+
+    model = models.CharField(
+        max_length=20,
+        choices=MODEL_CHOICES,
+        verbose_name='Модель'
+    )
+    object_id = models.BigIntegerField(
+        verbose_name='ID объекта'
+    )
+    revision = models.BigIntegerField(
+        db_index=True,
+        verbose_name='Ревизия'
+    )
+    deleted_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата удаления'
+    )
+
+    class Meta:
+        verbose_name = 'Удалённый объект каталога'
+        verbose_name_plural = 'Удалённые объекты каталога'
+        ordering = ('revision',)
+
+
+class RevisionedModel(models.Model):
+    """
+    Абстрактная модель каталога: каждое сохранение
+    присваивает объекту новую ревизию.
+    """
+
+    revision = models.BigIntegerField(
+        default=0,
+        db_index=True,
+        editable=False,
+        verbose_name='Ревизия'
+    )
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'revision'}
+        with transaction.atomic():
+            self.revision = CatalogRevision.next_value()
+            super().save(*args, **kwargs)
+
+
+class Category(RevisionedModel):
     """Модель категорий"""
 
     name = models.CharField(
@@ -24,10 +117,11 @@ class Category(models.Model):
     )
     image = models.ImageField(
         upload_to='categories/',
+        storage=content_addressed_storage,
         verbose_name='Изображение',
         blank=True,
         null=True,
-        validators=[validate_image_size],
+        validators=[validate_image_size, validate_image_dimensions],
         help_text='Максимальный размер: 5МВ'
     )
 
@@ -45,7 +139,7 @@ class Category(models.Model):
         super().save(*args, **kwargs)
 
 
-class Subcategory(models.Model):
+class Subcategory(RevisionedModel):
     """Модель подкатегорий"""
 
     name = models.CharField(
@@ -66,10 +160,11 @@ class Subcategory(models.Model):
     )
     image = models.ImageField(
         upload_to='subcategories/',
+        storage=content_addressed_storage,
         verbose_name='Изображение',
         blank=True,
         null=True,
-        validators=[validate_image_size],
+        validators=[validate_image_size, validate_image_dimensions],
         help_text='Максимальный размер: 5МВ'
     )
 
@@ -87,7 +182,7 @@ class Subcategory(models.Model):
         super().save(*args, **kwargs)
 
 
-class Product(models.Model):
+class Product(RevisionedModel):
     """
     Модель продукта, которая содержит основную информацию
     о продукте и связь с категорией и подкатегорией.
@@ -129,10 +224,11 @@ class Product(models.Model):
     )
     image = models.ImageField(
         upload_to='products/',
+        storage=content_addressed_storage,
         verbose_name='Изображение',
         blank=True,
         null=True,
-        validators=[validate_image_size],
+        validators=[validate_image_size, validate_image_dimensions],
         help_text='Максимальный размер: 5МВ'
     )
     image_small = ImageSpecField(
@@ -185,11 +281,18 @@ class Cart(models.Model):
         auto_now=True,
         verbose_name='Дата обновления'
     )
+    prices_changed = models.BooleanField(
+        default=False,
+        verbose_name='Цены изменились'
+    )
 
     class Meta:
         verbose_name = 'Корзина'
         verbose_name_plural = 'Корзины'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
 
 
 class CartItem(models.Model):
@@ -214,6 +317,11 @@ class CartItem(models.Model):
     quantity = models.PositiveIntegerField(
         verbose_name='Количество',
         default=1)
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name='Цена на момент добавления'
+    )
 
     class Meta:
         verbose_name = 'Выбранная позиция'
@@ -223,6 +331,281 @@ class CartItem(models.Model):
     def __str__(self):
         return f'{self.product.name} X {self.quantity}'
 
+    def save(self, *args, **kwargs):
+        if self.price is None:
+            self.price = self.product.price
+        super().save(*args, **kwargs)
+
+    @property
+    def total_price(self):
+        return self.price * self.quantity
+
+
+class Task(models.Model):
+    """Фоновая задача в очереди, хранящейся в БД."""
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'В очереди'),
+        (STATUS_RUNNING, 'Выполняется'),
+        (STATUS_FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(
+        max_length=100,
+        verbose_name='Задача'
+    )
+    args = models.JSONField(
+        default=list,
+        verbose_name='Аргументы'
+    )
+    unique_key = models.CharField(
+        max_length=255,
+        blank=True,
+        db_index=True,
+        verbose_name='Ключ уникальности'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+        verbose_name='Статус'
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=3,
+        verbose_name='Максимум попыток'
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Выполнить после'
+    )
+    locked_by = models.CharField(
+        max_length=100,
+        blank=True,
+        verbose_name='Обработчик'
+    )
+    locked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Взята в работу'
+    )
+    last_error = models.TextField(
+        blank=True,
+        verbose_name='Последняя ошибка'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        ordering = ('run_after',)
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f'{self.name}{tuple(self.args)}'
+
+
+class ProductRelation(models.Model):
+    """
+    Товар, который часто покупают вместе с данным:
+    top-K соседей по числу общих корзин (backend.recommendations).
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='relations',
+        verbose_name='Продукт'
+    )
+    related = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='related_to',
+        verbose_name='Связанный продукт'
+    )
+    score = models.PositiveIntegerField(
+        verbose_name='Число общих корзин'
+    )
+
+    class Meta:
+        verbose_name = 'Связанный продукт'
+        verbose_name_plural = 'Связанные продукты'
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'related'],
+                                    name='unique_product_relation'),
+        ]
+        indexes = [
+            models.Index(fields=['product', '-score']),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id} -> {self.related_id} ({self.score})'
+
+
+class RecommendationState(models.Model):
+    """Время последних пересчётов связанных товаров (единственная строка)."""
+
+    last_run = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последний пересчёт'
+    )
+    last_full_run = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Последний полный пересчёт'
+    )
+
+    class Meta:
+        verbose_name = 'Состояние рекомендаций'
+        verbose_name_plural = 'Состояние рекомендаций'
+
+
+class ProductTrend(models.Model):
+    """
+    Популярность товара по добавлениям в корзину с затуханием:
+    score уменьшается вдвое за TRENDING_HALF_LIFE_HOURS (backend.trending).
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trend',
+        verbose_name='Продукт'
+    )
+    score = models.FloatField(
+        default=0,
+        verbose_name='Популярность'
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Момент расчёта'
+    )
+
+    class Meta:
+        verbose_name = 'Популярность товара'
+        verbose_name_plural = 'Популярность товаров'
+
+
+class StockShard(models.Model):
+    """
+    Часть остатка товара. Остаток разбит на STOCK_SHARDS строк,
+    чтобы одновременные заказы одного товара блокировали
+    разные строки (backend.orders).
+    """
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='stock_shards',
+        verbose_name='Продукт'
+    )
+    shard = models.PositiveSmallIntegerField(
+        verbose_name='Номер части'
+    )
+    quantity = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Остаток'
+    )
+
+    class Meta:
+        verbose_name = 'Остаток товара'
+        verbose_name_plural = 'Остатки товаров'
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'shard'],
+                                    name='unique_stock_shard'),
+        ]
+
+    def __str__(self):
+        return f'{self.product_id}#{self.shard}: {self.quantity}'
+
+
+class Order(models.Model):
+    """Заказ, оформленный из корзины пользователя."""
+
+    STATUS_NEW = 'new'
+    STATUS_CHOICES = [
+        (STATUS_NEW, 'Новый'),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        verbose_name='Пользователь',
+        on_delete=models.CASCADE,
+        related_name='orders'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_NEW,
+        verbose_name='Статус'
+    )
+    total_price = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name='Сумма заказа'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+
+    class Meta:
+        verbose_name = 'Заказ'
+        verbose_name_plural = 'Заказы'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f'Заказ {self.pk}'
+
+
+class OrderLine(models.Model):
+    """Позиция заказа с ценой на момент оформления."""
+
+    order = models.ForeignKey(
+        Order,
+        verbose_name='Заказ',
+        on_delete=models.CASCADE,
+        related_name='lines'
+    )
+    product = models.ForeignKey(
+        Product,
+        verbose_name='Продукт',
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='order_lines'
+    )
+    product_name = models.CharField(
+        max_length=200,
+        verbose_name='Название продукта'
+    )
+    quantity = models.PositiveIntegerField(
+        verbose_name='Количество'
+    )
+    price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name='Цена'
+    )
+
+    class Meta:
+        verbose_name = 'Позиция заказа'
+        verbose_name_plural = 'Позиции заказа'
+
+    def __str__(self):
+        return f'{self.product_name} X {self.quantity}'
+
     @property
     def total_price(self):
-        return self.product.price * self.quantity
+        return self.price * self.quantity
@@ -0,0 +1,153 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+from .bulk import iter_id_chunks
+from .models import Cart, CartItem, Order, OrderLine, StockShard
+
+
+class EmptyCart(Exception):
+    """В корзине нет позиций."""
+
+
+class PricesChanged(Exception):
+    """Цены в корзине изменились, покупатель их ещё не видел."""
+
+
+class OutOfStock(Exception):
+    """Остатка товара не хватает для заказа."""
+
+    def __init__(self, product_id):
+        super().__init__(product_id)
+        self.product_id = product_id
+
+
+def set_stock(product, quantity, shards=None):
+    """Задаёт остаток товара, поровну распределяя его по частям."""
+    set_stock_many([product.pk], quantity, shards)
+
+
+def set_stock_many(product_ids, quantity, shards=None):
+    """
+    Задаёт одинаковый остаток товарам product_ids двумя запросами:
+    прежние части удаляются, новые создаются одной пачкой.
+    """
+    shards = shards or settings.STOCK_SHARDS
+    with transaction.atomic():
+        StockShard.objects.filter(product_id__in=product_ids).delete()
+        StockShard.objects.bulk_create(
+            StockShard(product_id=product_id, shard=number,
+                       quantity=quantity // shards +
+                       (1 if number < quantity % shards else 0))
+            for product_id in product_ids
+            for number in range(shards)
+        )
+
+
+def bulk_set_stock(queryset, quantity, shards=None, chunk_size=None):
+    """Задаёт остаток товарам queryset пачками по BULK_CHUNK_SIZE."""
+    count = 0
+    for chunk in iter_id_chunks(queryset, chunk_size):
+        set_stock_many(chunk, quantity, shards)
+        count += len(chunk)
+    return {'count': count}
+
+
+def get_stock(product_ids):
+    """Суммарные остатки товаров: {id товара: количество}."""
+    rows = StockShard.objects.filter(product_id__in=product_ids) \
+        .values('product_id').annotate(total=Sum('quantity')) \
+        .values_list('product_id', 'total')
+    return {product_id: 0 for product_id in product_ids} | dict(rows)
+
+
+def _take(product_id, quantity, skip_locked):
+    """
+    Блокирует части остатка товара и списывает с них quantity.
+    Возвращает False, если в заблокированных частях не хватило остатка.
+    """
+    shards = StockShard.objects.filter(product_id=product_id,
+                                       quantity__gt=0)
+    if connection.features.has_select_for_update_skip_locked:
+        shards = shards.select_for_update(skip_locked=skip_locked)
+    else:
+        shards = shards.select_for_update()
+    changed = []
+    for shard in shards.order_by('shard'):
+        taken = min(shard.quantity, quantity)
+        shard.quantity -= taken
+        quantity -= taken
+        changed.append(shard)
+        if not quantity:
+            StockShard.objects.bulk_update(changed, ['quantity'])
+            return True
+    return False
+
+
+def reserve_stock(quantities):
+    """
+    Списывает остатки {id товара: количество} в текущей транзакции.
+
+    Сначала берутся только свободные части (SKIP LOCKED): одновременные
+    заказы одного товара не ждут друг друга. Если свободных частей
+    не хватило, списание повторяется с ожиданием блокировок.
+    Товары обрабатываются по возрастанию id, поэтому ожидание
+    не приводит к взаимной блокировке.
+    """
+    for product_id in sorted(quantities):
+        quantity = quantities[product_id]
+        try:
+            with transaction.atomic():
+                if not _take(product_id, quantity, skip_locked=True):
+                    # Откат точки сохранения снимает взятые блокировки
+                    raise OutOfStock(product_id)
+        except OutOfStock:
+            with transaction.atomic():
+                if not _take(product_id, quantity, skip_locked=False):
+                    raise
+
+
+def checkout(user):
+    """
+    Оформляет заказ из корзины пользователя в одной транзакции:
+    списывает остатки, создаёт заказ с ценами из корзины
+    и очищает корзину. Возвращает заказ. Пока у корзины стоит
+    prices_changed или цена позиции расходится с ценой товара,
+    заказ не оформляется (PricesChanged); расходящиеся позиции
+    при этом получают текущие цены.
+    """
+    with transaction.atomic():
+        cart = Cart.objects.select_for_update().filter(user=user).first()
+        items = [] if cart is None else list(
+            CartItem.objects.filter(cart=cart).select_related('product')
+            .order_by('product_id')
+        )
+        if not items:
+            raise EmptyCart()
+        # Цена товара могла измениться до выполнения задачи пересчёта
+        stale = [item for item in items if item.price != item.product.price]
+        if stale:
+            for item in stale:
+                item.price = item.product.price
+            CartItem.objects.bulk_update(stale, ['price'])
+        elif not cart.prices_changed:
+            return _place_order(user, cart, items)
+    raise PricesChanged()
+
+
+def _place_order(user, cart, items):
+    """Списывает остатки и создаёт заказ из позиций корзины."""
+    reserve_stock({item.product_id: item.quantity for item in items})
+    order = Order.objects.create(
+        user=user,
+        total_price=sum(item.total_price for item in items)
+    )
+    OrderLine.objects.bulk_create(
+        OrderLine(order=order, product_id=item.product_id,
+                  product_name=item.product.name,
+                  quantity=item.quantity, price=item.price)
+        for item in items
+    )
+    CartItem.objects.filter(cart=cart).delete()
+    Cart.objects.filter(pk=cart.pk).update(updated_at=timezone.now())
+    return order
@@ -0,0 +1,36 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор для больших таблиц: для запроса без фильтров берёт
+    оценку числа строк из статистики PostgreSQL (pg_class.reltuples)
+    вместо полного COUNT(*).
+    """
+
+    # Ниже этого порога оценка неточна, а точный подсчёт дешёв
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate >= self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where or query.distinct:
+            return None
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [self.object_list.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import OuterRef, Subquery
+from .models import Cart, CartItem, Product
+
+
+def current_price():
+    """Подзапрос текущей цены продукта позиции корзины."""
+    return Subquery(Product.objects.filter(pk=OuterRef('product_id'))
+                    .values('price')[:1])
+
+
+def _reprice_postgresql(product_ids):
+    """
+    Обновляет снимки цен и помечает корзины одним запросом:
+    UPDATE ... FROM с RETURNING внутри CTE.
+    """
+    item_table = connection.ops.quote_name(CartItem._meta.db_table)
+    cart_table = connection.ops.quote_name(Cart._meta.db_table)
+    product_table = connection.ops.quote_name(Product._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'WITH changed AS ('
+            f'UPDATE {item_table} AS item SET price = product.price '
+            f'FROM {product_table} AS product '
+            f'WHERE product.id = item.product_id '
+            f'AND item.product_id = ANY(%s) '
+            f'AND item.price <> product.price '
+            f'RETURNING item.cart_id) '
+            f'UPDATE {cart_table} SET prices_changed = TRUE '
+            f'WHERE id IN (SELECT cart_id FROM changed)',
+            [list(product_ids)]
+        )
+        return cursor.rowcount
+
+
+def _reprice_generic(product_ids):
+    """Тот же пересчёт двумя запросами с коррелированным подзапросом."""
+    items = CartItem.objects.filter(product_id__in=product_ids) \
+        .exclude(price=current_price())
+    with transaction.atomic():
+        carts = Cart.objects.filter(
+            pk__in=items.values('cart_id')
+        ).update(prices_changed=True)
+        items.update(price=current_price())
+    return carts
+
+
+def reprice_cart_items(product_ids, chunk_size=None):
+    """
+    Переносит новые цены продуктов в позиции корзин
+    пачками по chunk_size продуктов и помечает затронутые корзины.
+    Возвращает число помеченных корзин.
+    """
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    reprice = _reprice_postgresql if connection.vendor == 'postgresql' \
+        else _reprice_generic
+    product_ids = sorted(set(product_ids))
+    flagged = 0
+    for start in range(0, len(product_ids), chunk_size):
+        flagged += reprice(product_ids[start:start + chunk_size])
+    return flagged
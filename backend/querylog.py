@@ -0,0 +1,225 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from hashlib import md5
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Источник запросов текущего запроса/задачи (имя представления)
+_source = ContextVar('slow_query_source', default=None)
+
+re_string = re.compile(r"'(?:[^']|'')*'")
+re_number = re.compile(r'\b\d+(?:\.\d+)?\b')
+re_in_list = re.compile(r'\bIN \((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+re_space = re.compile(r'\s+')
+re_explainable = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+
+# Точка сохранения вокруг EXPLAIN внутри транзакции
+EXPLAIN_SAVEPOINT = 'slow_query_explain'
+
+
+def normalize(sql):
+    """SQL без значений: литералы и списки IN заменены заполнителями."""
+    sql = re_string.sub('?', sql)
+    sql = re_number.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = re_in_list.sub('IN (...)', sql)
+    return re_space.sub(' ', sql).strip()
+
+
+def fingerprint(normalized_sql):
+    return md5(normalized_sql.encode()).hexdigest()[:16]
+
+
+def explain(connection, sql, params):
+    """
+    План запроса без выполнения (PostgreSQL: EXPLAIN (ANALYZE off),
+    SQLite: EXPLAIN QUERY PLAN). Отдельный курсор, чтобы не потерять
+    результат исходного запроса; None для прочих запросов и БД.
+    """
+    if not re_explainable.match(sql):
+        return None
+    prefixes = {'postgresql': 'EXPLAIN (ANALYZE off) ',
+                'sqlite': 'EXPLAIN QUERY PLAN '}
+    if connection.vendor not in prefixes:
+        return None
+    # Ошибка EXPLAIN в PostgreSQL прерывает всю транзакцию: внутри
+    # atomic план снимается в точке сохранения и откатывается к ней
+    savepoint = connection.in_atomic_block and \
+        connection.features.uses_savepoints
+    cursor = connection.create_cursor()
+    try:
+        if savepoint:
+            cursor.execute(connection.ops.savepoint_create_sql(
+                EXPLAIN_SAVEPOINT))
+        try:
+            cursor.execute(prefixes[connection.vendor] + sql, params)
+            return '\n'.join(' '.join(str(column) for column in row)
+                             for row in cursor.fetchall())
+        except Exception:
+            if savepoint:
+                cursor.execute(connection.ops.savepoint_rollback_sql(
+                    EXPLAIN_SAVEPOINT))
+            raise
+        finally:
+            if savepoint:
+                cursor.execute(connection.ops.savepoint_commit_sql(
+                    EXPLAIN_SAVEPOINT))
+    except Exception:
+        logger.exception('Не удалось получить план запроса')
+        return None
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """
+    Обёртка execute_wrapper: запросы дольше SLOW_QUERY_THRESHOLD_MS
+    с вероятностью SLOW_QUERY_SAMPLE_RATE и не больше
+    SLOW_QUERY_MAX_PER_MINUTE в минуту на процесс пишутся строкой JSON
+    в SLOW_QUERY_LOG_FILE. План одного и того же запроса снимается
+    не чаще раза в SLOW_QUERY_EXPLAIN_INTERVAL секунд.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        self._window_start = 0
+        self._window_count = 0
+        self._explained = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+            try:
+                self.record(context['connection'], sql, params, many,
+                            duration_ms)
+            except Exception:
+                logger.exception('Не удалось записать медленный запрос')
+        return result
+
+    def allow(self, now):
+        if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+            return False
+        with self._lock:
+            if now - self._window_start >= 60:
+                self._window_start, self._window_count = now, 0
+            if self._window_count >= settings.SLOW_QUERY_MAX_PER_MINUTE:
+                return False
+            self._window_count += 1
+            return True
+
+    def should_explain(self, key, now):
+        with self._lock:
+            if now - self._explained.get(key, -float('inf')) < \
+                    settings.SLOW_QUERY_EXPLAIN_INTERVAL:
+                return False
+            self._explained[key] = now
+            return True
+
+    def record(self, connection, sql, params, many, duration_ms):
+        now = time.monotonic()
+        if not self.allow(now):
+            return
+        normalized = normalize(sql)
+        key = fingerprint(normalized)
+        plan = None
+        if not many and self.should_explain(key, now):
+            plan = explain(connection, sql, params)
+        self.write({
+            'time': time.time(),
+            'duration_ms': round(duration_ms, 3),
+            'fingerprint': key,
+            'sql': normalized,
+            'source': _source.get(),
+            'database': connection.alias,
+            'plan': plan,
+        })
+
+    def write(self, entry):
+        path = settings.SLOW_QUERY_LOG_FILE
+        line = json.dumps(entry, ensure_ascii=False) + '\n'
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as log_file:
+                log_file.write(line)
+
+
+slow_query_log = SlowQueryLog()
+
+
+@contextmanager
+def log_slow_queries(source=None):
+    """
+    Подключает журнал медленных запросов ко всем БД на время блока,
+    если он включён (SLOW_QUERY_LOG).
+    """
+    if not settings.SLOW_QUERY_LOG:
+        yield
+        return
+    token = _source.set(source)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(slow_query_log))
+            yield
+    finally:
+        _source.reset(token)
+
+
+def set_source(source):
+    """Уточняет источник запросов внутри log_slow_queries()."""
+    _source.set(source)
+
+
+def read_log(path, since=None):
+    """Записи журнала (JSON lines), начиная с момента since (unix time)."""
+    if not path.exists():
+        return
+    with open(path, encoding='utf-8') as log_file:
+        for line in log_file:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if since is None or entry['time'] >= since:
+                yield entry
+
+
+def aggregate(entries):
+    """
+    Сводка по отпечаткам запросов: число, суммарное, среднее и
+    максимальное время, источники и последний снятый план.
+    Отсортирована по суммарному времени.
+    """
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry['fingerprint'], {
+            'fingerprint': entry['fingerprint'], 'sql': entry['sql'],
+            'count': 0, 'total_ms': 0, 'max_ms': 0,
+            'sources': set(), 'plan': None,
+        })
+        group['count'] += 1
+        group['total_ms'] += entry['duration_ms']
+        group['max_ms'] = max(group['max_ms'], entry['duration_ms'])
+        if entry.get('source'):
+            group['sources'].add(entry['source'])
+        if entry.get('plan'):
+            group['plan'] = entry['plan']
+    for group in groups.values():
+        group['avg_ms'] = group['total_ms'] / group['count']
+        group['sources'] = sorted(group['sources'])
+    return sorted(groups.values(), key=lambda group: group['total_ms'],
+                  reverse=True)
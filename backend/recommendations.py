@@ -0,0 +1,93 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import Cart, CartItem, ProductRelation, RecommendationState
+
+
+def iter_cart_products(product_ids, chunk_size):
+    """
+    Потоково отдаёт наборы продуктов корзин, содержащих хотя бы
+    один из product_ids, без загрузки всех позиций в память.
+    """
+    carts = CartItem.objects.filter(product_id__in=product_ids) \
+        .values('cart_id')
+    rows = CartItem.objects.filter(cart_id__in=carts) \
+        .order_by('cart_id') \
+        .values_list('cart_id', 'product_id') \
+        .iterator(chunk_size=chunk_size)
+    for _, items in groupby(rows, key=itemgetter(0)):
+        yield {product_id for _, product_id in items}
+
+
+def count_cooccurrences(product_ids, chunk_size):
+    """
+    Строки разреженной матрицы совместных покупок для product_ids:
+    {продукт: Counter({сосед: число общих корзин})}.
+    """
+    targets = set(product_ids)
+    matrix = defaultdict(Counter)
+    for products in iter_cart_products(product_ids, chunk_size):
+        for product_id in products & targets:
+            row = matrix[product_id]
+            row.update(products)
+            del row[product_id]
+    return matrix
+
+
+def store_top_k(product_ids, matrix, top_k):
+    """Заменяет связи product_ids на top-K соседей из матрицы."""
+    relations = [
+        ProductRelation(product_id=product_id, related_id=related_id,
+                        score=score)
+        for product_id in product_ids
+        for related_id, score in matrix.get(product_id, Counter())
+        .most_common(top_k)
+    ]
+    with transaction.atomic():
+        ProductRelation.objects.filter(product_id__in=product_ids).delete()
+        ProductRelation.objects.bulk_create(relations)
+    return len(relations)
+
+
+def build_related_products(full=False, top_k=None, chunk_size=None):
+    """
+    Пересчитывает связанные товары. Без full пересчитываются только
+    продукты из корзин, изменённых после прошлого запуска: их строки
+    матрицы считаются заново по всем корзинам, где они встречаются.
+    Удалённые позиции и корзины так не учитываются, поэтому раз
+    в RELATED_PRODUCTS_FULL_INTERVAL секунд пересчёт полный.
+    """
+    top_k = top_k or settings.RELATED_PRODUCTS_TOP_K
+    chunk_size = chunk_size or settings.BULK_CHUNK_SIZE
+    started = timezone.now()
+    state, _ = RecommendationState.objects.get_or_create(pk=1)
+    full_interval = timedelta(seconds=settings.RELATED_PRODUCTS_FULL_INTERVAL)
+    if state.last_full_run is None or \
+            started - state.last_full_run >= full_interval:
+        full = True
+
+    items = CartItem.objects.all()
+    if not full and state.last_run is not None:
+        items = items.filter(cart__in=Cart.objects.filter(
+            updated_at__gte=state.last_run))
+    product_ids = sorted(set(items.values_list('product_id', flat=True)))
+
+    if full:
+        ProductRelation.objects.exclude(product_id__in=items.values(
+            'product_id')).delete()
+    stored = 0
+    for start in range(0, len(product_ids), chunk_size):
+        chunk = product_ids[start:start + chunk_size]
+        stored += store_top_k(chunk, count_cooccurrences(chunk, chunk_size),
+                              top_k)
+
+    finished = {'last_run': started}
+    if full:
+        finished['last_full_run'] = started
+    RecommendationState.objects.filter(pk=1).update(**finished)
+    return {'products': len(product_ids), 'relations': stored}
@@ -0,0 +1,115 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+from .models import CatalogRevision, Product
+from .serializers import ProductSerializer
+from .singleflight import SingleFlight
+
+
+def cache_key(prefix, request):
+    """
+    Ключ по схеме, хосту, пути и нормализованной строке запроса
+    (порядок, пустые). Схема и хост входят в ключ, так как ответы
+    содержат абсолютные URL (пагинация, изображения).
+    """
+    params = sorted((name, value)
+                    for name, values in request.query_params.lists()
+                    for value in values if value != '')
+    query = urlencode(params)
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    digest = hashlib.md5(url.encode()).hexdigest()
+    return f'{prefix}:{digest}'
+
+
+class CatalogResponseCache:
+    """
+    Кэш данных ответов каталога, привязанный к ревизии каталога.
+
+    Запись свежая, пока не истёк CATALOG_CACHE_TIMEOUT и ревизия
+    не изменилась. Устаревшую запись пересчитывает один обработчик
+    (блокировка в кэше), остальные ещё до CATALOG_CACHE_STALE секунд
+    получают прежние данные. Одновременные пересчёты одного ключа
+    внутри процесса объединяются.
+    """
+
+    def __init__(self):
+        self.flight = SingleFlight()
+
+    def get(self, key, compute):
+        version = CatalogRevision.current()
+        entry = cache.get(key)
+        if entry is not None:
+            if entry['version'] == version and \
+                    entry['expires'] > time.time():
+                return entry['data']
+            lock_key = f'{key}:lock'
+            if not cache.add(lock_key, 1, settings.CATALOG_CACHE_LOCK_TIMEOUT):
+                return entry['data']
+            try:
+                return self.flight.do(key, self.refresh, key, version, compute)
+            finally:
+                cache.delete(lock_key)
+        return self.flight.do(key, self.refresh, key, version, compute)
+
+    def refresh(self, key, version, compute):
+        data = compute()
+        timeout = settings.CATALOG_CACHE_TIMEOUT
+        cache.set(key, {
+            'version': version,
+            'expires': time.time() + timeout,
+            'data': data,
+        }, timeout + settings.CATALOG_CACHE_STALE)
+        return data
+
+
+catalog_cache = CatalogResponseCache()
+
+
+class AnonymousCacheMixin:
+    """
+    Отдаёт анонимным пользователям список из catalog_cache.
+    Ключ строится из cache_prefix представления и параметров запроса.
+    """
+
+    cache_prefix = None
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated or not settings.CATALOG_CACHE_TIMEOUT:
+            return super().list(request, *args, **kwargs)
+
+        def compute():
+            return super(AnonymousCacheMixin, self) \
+                .list(request, *args, **kwargs).data
+
+        data = catalog_cache.get(cache_key(self.cache_prefix, request),
+                                 compute)
+        return Response(data)
+
+
+def cached_products(slugs):
+    """
+    Сериализованные товары по списку slug: {slug: данные}.
+    Каждый товар кэшируется под своим ключом с ревизией каталога;
+    недостающие в кэше читаются одним запросом и дописываются в кэш.
+    Несуществующих slug в результате нет.
+    """
+    prefix = f'catalog:product:{CatalogRevision.current()}'
+    keys = {f'{prefix}:{slug}': slug for slug in slugs}
+    products = {keys[key]: data
+                for key, data in cache.get_many(list(keys)).items()}
+    misses = [slug for slug in slugs if slug not in products]
+    if misses:
+        queryset = Product.objects.filter(slug__in=misses) \
+            .select_related('category', 'subcategory')
+        fetched = {data['slug']: data for data in
+                   ProductSerializer(queryset, many=True).data}
+        if settings.CATALOG_CACHE_TIMEOUT:
+            cache.set_many({f'{prefix}:{slug}': data
+                            for slug, data in fetched.items()},
+                           settings.CATALOG_CACHE_TIMEOUT)
+        products.update(fetched)
+    return products
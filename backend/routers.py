@@ -0,0 +1,63 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+# Модели каталога, которые можно читать с реплик
+REPLICA_MODELS = {
+    'backend.category',
+    'backend.subcategory',
+    'backend.product',
+    'backend.catalogrevision',
+    'backend.catalogtombstone',
+    'backend.productrelation',
+}
+
+_use_primary = ContextVar('use_primary', default=False)
+
+
+def pin_to_primary():
+    """До конца текущего контекста (запроса) читать только с основной БД."""
+    _use_primary.set(True)
+
+
+@contextmanager
+def use_primary(enabled=True):
+    """Контекст, в котором чтения идут с основной БД (или сброшены)."""
+    token = _use_primary.set(enabled)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Направляет чтения каталога на реплики из DATABASE_REPLICAS,
+    остальные чтения и все записи — на основную БД.
+    После первой записи контекст закрепляется за основной БД,
+    чтобы читать свои же изменения без задержки репликации.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or _use_primary.get() or \
+                model._meta.label_lower not in REPLICA_MODELS:
+            return PRIMARY
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
@@ -0,0 +1,138 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.module_loading import import_string
+from django.views import View
+from .compression import (FILE_SUFFIXES, LEVEL_BOUNDS, available_codecs,
+                          compress, negotiate_encoding)
+
+CONTENT_TYPE = 'application/vnd.oai.openapi+json'
+
+
+def render_schema():
+    """Генерирует OpenAPI-схему проекта в формате JSON."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def compress_schema(content):
+    """Возвращает сжатые варианты схемы: {кодировка: байты}."""
+    return {encoding: compress(content, encoding, LEVEL_BOUNDS[encoding][1])
+            for encoding in available_codecs()
+            if encoding in FILE_SUFFIXES}
+
+
+def variant_paths():
+    """Пути к файлам схемы: {кодировка: путь}."""
+    path = settings.SCHEMA_FILE
+    paths = {'identity': path}
+    for encoding, suffix in FILE_SUFFIXES.items():
+        paths[encoding] = path.with_name(path.name + suffix)
+    return paths
+
+
+def write_schema(content):
+    """Записывает схему и её сжатые варианты на диск."""
+    paths = variant_paths()
+    paths['identity'].parent.mkdir(parents=True, exist_ok=True)
+    paths['identity'].write_bytes(content)
+    variants = compress_schema(content)
+    for encoding in FILE_SUFFIXES:
+        if encoding in variants:
+            paths[encoding].write_bytes(variants[encoding])
+        else:
+            paths[encoding].unlink(missing_ok=True)
+    return paths
+
+
+class SchemaCache:
+    """
+    Схема, вычисленная один раз на процесс: читается из файла,
+    собранного командой build_schema, либо генерируется при первом запросе.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._variants = None
+
+    def get(self):
+        if self._variants is None:
+            with self._lock:
+                if self._variants is None:
+                    self._variants = self._load()
+        return self._variants
+
+    def clear(self):
+        with self._lock:
+            self._variants = None
+
+    def _load(self):
+        paths = variant_paths()
+        if paths['identity'].exists():
+            content = paths['identity'].read_bytes()
+            encoded = {encoding: path.read_bytes()
+                       for encoding, path in paths.items()
+                       if encoding != 'identity' and path.exists()}
+        else:
+            content = render_schema()
+            encoded = compress_schema(content)
+
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        variants = {'identity': (content, f'"{digest}"')}
+        for encoding, body in encoded.items():
+            variants[encoding] = (body, f'"{digest}-{encoding}"')
+        return variants
+
+
+schema_cache = SchemaCache()
+
+
+class CachedSchemaView(View):
+    """
+    Отдаёт OpenAPI-схему из кэша процесса со строгим ETag
+    и заранее сжатыми вариантами gzip/br.
+    """
+
+    def get(self, request, *args, **kwargs):
+        variants = schema_cache.get()
+        encoding = negotiate_encoding(
+            request.headers.get('Accept-Encoding'),
+            [name for name in FILE_SUFFIXES if name in variants]
+        ) or 'identity'
+        content, etag = variants[encoding]
+
+        if_none_match = request.headers.get('If-None-Match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')]:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=CONTENT_TYPE)
+            if encoding != 'identity':
+                response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Accept-Encoding'])
+        patch_cache_control(response, public=True, no_cache=True)
+        return response
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    Представление, которое импортирует класс dotted_path при первом
+    запросе: генератор схемы и его зависимости не грузятся при старте.
+    """
+    view = None
+
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    dispatch.csrf_exempt = True
+    return dispatch
@@ -1,6 +1,9 @@
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
-from .models import Category, Subcategory, Product, Cart, CartItem
+from .models import (Category, Subcategory, Product, Cart, CartItem,
+                     CatalogTombstone, Order, OrderLine)
+from .fieldsets import SparseFieldsSerializerMixin
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth import authenticate
 
@@ -13,7 +16,8 @@ class SubcategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'image']
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsSerializerMixin,
+                         serializers.ModelSerializer):
     subcategories = SubcategorySerializer(many=True, read_only=True)
 
     class Meta:
@@ -21,7 +25,10 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'image', 'subcategories']
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(SparseFieldsSerializerMixin,
+                        serializers.ModelSerializer):
+    sparse_columns = {'images': ['image']}
+
     category_name = serializers.CharField(source='category.name',
                                           read_only=True)
     subcategory_name = serializers.CharField(source='subcategory.name',
@@ -49,11 +56,37 @@ class ProductSerializer(serializers.ModelSerializer):
     def get_images(self, obj):
         if not obj.image:
             return []
-        return [
-            obj.image_small.url,
-            obj.image_medium.url,
-            obj.image_large.url
-        ]
+        renditions = [obj.image_small, obj.image_medium, obj.image_large]
+        if self.context.get('stored_names'):
+            # URL по имени копии: без проверки файла и создания копии
+            return [file.storage.url(file.name) for file in renditions]
+        return [file.url for file in renditions]
+
+
+class CategoryChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Category
+        fields = ['id', 'name', 'slug', 'image', 'revision']
+
+
+class SubcategoryChangeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Subcategory
+        fields = ['id', 'category', 'name', 'slug', 'image', 'revision']
+
+
+class ProductChangeSerializer(ProductSerializer):
+    class Meta(ProductSerializer.Meta):
+        fields = ProductSerializer.Meta.fields + ['category', 'subcategory',
+                                                 'revision']
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source='object_id')
+
+    class Meta:
+        model = CatalogTombstone
+        fields = ['model', 'id', 'revision']
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -74,6 +107,7 @@ class LoginSerializer(serializers.Serializer):
     def validate(self, data):
         user = authenticate(**data)
         if user and user.is_active:
+            data['user'] = user
             return data
         raise serializers.ValidationError('Неверные данные')
 
@@ -89,7 +123,7 @@ class CartItemSerializer(serializers.ModelSerializer):
                                                 queryset=Product.objects.all(),
                                                 write_only=True)
     product_name = serializers.CharField(source='product.name', read_only=True)
-    product_price = serializers.DecimalField(source='product.price',
+    product_price = serializers.DecimalField(source='price',
                                              max_digits=10,
                                              decimal_places=2,
                                              read_only=True)
@@ -114,10 +148,46 @@ class CartSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Cart
-        fields = ['id', 'items', 'total_items', 'total_price']
+        fields = ['id', 'items', 'total_items', 'total_price',
+                  'prices_changed']
 
     def get_total_items(self, obj):
         return sum(item.quantity for item in obj.cart_items.all())
 
     def get_total_price(self, obj):
         return sum(item.total_price for item in obj.cart_items.all())
+
+
+class OrderLineSerializer(serializers.ModelSerializer):
+    product_slug = serializers.SlugRelatedField(source='product',
+                                                slug_field='slug',
+                                                read_only=True)
+    total_price = serializers.DecimalField(max_digits=12,
+                                           decimal_places=2,
+                                           read_only=True)
+
+    class Meta:
+        model = OrderLine
+        fields = ['product_slug', 'product_name', 'price', 'quantity',
+                  'total_price']
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    lines = OrderLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Order
+        fields = ['id', 'status', 'total_price', 'created_at', 'lines']
+
+
+class ProductBatchSerializer(serializers.Serializer):
+    slugs = serializers.ListField(child=serializers.SlugField(),
+                                  allow_empty=False)
+
+    def validate_slugs(self, value):
+        limit = settings.PRODUCT_BATCH_MAX_SIZE
+        if len(value) > limit:
+            raise serializers.ValidationError(
+                f'Не больше {limit} товаров за запрос')
+        # Повторы убираются с сохранением порядка
+        return list(dict.fromkeys(value))
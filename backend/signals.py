@@ -0,0 +1,79 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+from .chaining import invalidate_chained_subcategories
+from .imaging import downscale_master
+from .taskqueue import enqueue
+from .models import (Category, Subcategory, Product,
+                     CatalogRevision, CatalogTombstone)
+
+# Массовое изменение товаров одним пакетом (backend.bulk).
+# Аргументы: action ('reprice', 'move', 'delete'), ids — id товаров пакета.
+catalog_bulk_changed = Signal()
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Subcategory)
+@receiver(post_delete, sender=Product)
+def create_catalog_tombstone(sender, instance, **kwargs):
+    """Сохраняет отметку об удалении объекта каталога."""
+    CatalogTombstone.objects.create(
+        model=sender._meta.model_name,
+        object_id=instance.pk,
+        revision=CatalogRevision.next_value()
+    )
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Subcategory)
+@receiver(pre_save, sender=Product)
+def assign_raw_revision(sender, instance, raw, **kwargs):
+    """
+    Присваивает ревизию объекту из фикстуры: loaddata сохраняет
+    без save() модели, и объект остался бы с ревизией 0.
+    """
+    if raw:
+        instance.revision = CatalogRevision.next_value()
+
+
+@receiver(pre_save, sender=Subcategory)
+def remember_subcategory_category(sender, instance, **kwargs):
+    """Запоминает прежнюю категорию подкатегории перед сохранением."""
+    instance._previous_category_id = None
+    if instance.pk is not None:
+        instance._previous_category_id = Subcategory.objects \
+            .filter(pk=instance.pk) \
+            .values_list('category_id', flat=True).first()
+
+
+@receiver(post_save, sender=Subcategory)
+@receiver(post_delete, sender=Subcategory)
+def invalidate_subcategory_chain(sender, instance, **kwargs):
+    """Сбрасывает кэш списков подкатегорий для админки."""
+    category_ids = {instance.category_id,
+                    getattr(instance, '_previous_category_id', None)}
+    category_ids.discard(None)
+    invalidate_chained_subcategories(*category_ids)
+    for category_id in category_ids:
+        enqueue('warm_chained_subcategories', category_id, unique=True)
+
+
+@receiver(pre_save, sender=Category)
+@receiver(pre_save, sender=Subcategory)
+@receiver(pre_save, sender=Product)
+def downscale_uploaded_image(sender, instance, **kwargs):
+    """Уменьшает загруженное изображение до максимального размера."""
+    downscale_master(instance.image)
+
+
+@receiver(post_save, sender=Product)
+def schedule_cart_reprice(sender, instance, created, **kwargs):
+    """Ставит в очередь пересчёт корзин после изменения продукта."""
+    if not created:
+        enqueue('reprice_cart_items', [instance.pk], unique=True)
+
+
+@receiver(catalog_bulk_changed, sender=Product)
+def schedule_bulk_cart_reprice(sender, action, ids, **kwargs):
+    """Ставит в очередь пересчёт корзин для пачки переоценённых товаров."""
+    if action == 'reprice':
+        enqueue('reprice_cart_items', list(ids))
@@ -0,0 +1,210 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.response import Response
+from .models import CatalogRevision, Category, Product
+from .serializers import CategorySerializer, ProductSerializer
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotUnavailable(Exception):
+    """Снимок не собран: списки читаются из БД."""
+
+
+def absolute_url(request, url):
+    """Абсолютный URL для request, как у ImageField с request в контексте."""
+    return request.build_absolute_uri(url) if url else url
+
+
+class CategoryRecord:
+    """
+    Категория в снимке: slug и готовое представление для API.
+    URL изображений в представлении относительные: снимок общий
+    для всех хостов, абсолютными их делает render().
+    """
+
+    __slots__ = ('id', 'slug', 'data')
+
+    def __init__(self, id, slug, data):
+        self.id = id
+        self.slug = slug
+        self.data = data
+
+    def render(self, fieldset, request):
+        """Представление с полями fieldset и URL изображений для request."""
+        data = {name: self.data[name] for name in fieldset}
+        if 'image' in data:
+            data['image'] = absolute_url(request, data['image'])
+        if 'subcategories' in data:
+            data['subcategories'] = [
+                {**subcategory,
+                 'image': absolute_url(request, subcategory['image'])}
+                for subcategory in data['subcategories']
+            ]
+        return data
+
+
+class ProductRecord:
+    """Товар в снимке: столбцы для фильтров и готовое представление."""
+
+    __slots__ = ('id', 'name', 'slug', 'price', 'category_id',
+                 'category_slug', 'subcategory_id', 'subcategory_slug',
+                 'data')
+
+    def __init__(self, id, name, slug, price, category_id, category_slug,
+                 subcategory_id, subcategory_slug, data):
+        self.id = id
+        self.name = name
+        self.slug = slug
+        self.price = price
+        self.category_id = category_id
+        self.category_slug = category_slug
+        self.subcategory_id = subcategory_id
+        self.subcategory_slug = subcategory_slug
+        self.data = data
+
+    def render(self, fieldset, request):
+        """Представление только с полями fieldset (URL изображений
+        относительные, как у ProductSerializer)."""
+        if len(fieldset) == len(self.data):
+            return self.data
+        return {name: self.data[name] for name in fieldset}
+
+
+class CatalogSnapshot:
+    """
+    Неизменяемый снимок каталога на ревизию version. Записи хранятся
+    в порядке сортировки моделей (как вернула БД), поэтому фильтрация
+    сохраняет порядок выдачи списков.
+    """
+
+    def __init__(self, version, categories, products):
+        self.version = version
+        self.categories = categories
+        self.products = products
+
+    def filter_products(self, params):
+        """Товары по проверенным параметрам фильтра (product_filter_params)."""
+        category = params.get('category')
+        subcategory = params.get('subcategory')
+        min_price = params.get('min_price')
+        max_price = params.get('max_price')
+        return [
+            record for record in self.products
+            if (category is None or record.category_slug == category)
+            and (subcategory is None or record.subcategory_slug == subcategory)
+            and (min_price is None or record.price >= min_price)
+            and (max_price is None or record.price <= max_price)
+        ]
+
+
+def build_snapshot(version):
+    """
+    Читает каталог тремя запросами и собирает снимок с ревизией version.
+    URL изображений строятся по именам файлов, без обращения к хранилищу;
+    запись, которую не удалось сериализовать, пропускается.
+    """
+    context = {'stored_names': True}
+    categories = []
+    for category in Category.objects.prefetch_related('subcategories'):
+        try:
+            data = CategorySerializer(category, context=context).data
+        except Exception:
+            logger.exception('Категория %s не попала в снимок', category.pk)
+            continue
+        categories.append(CategoryRecord(category.pk, category.slug,
+                                         dict(data)))
+    products = []
+    for product in Product.objects.select_related('category', 'subcategory'):
+        try:
+            data = ProductSerializer(product, context=context).data
+        except Exception:
+            logger.exception('Товар %s не попал в снимок', product.pk)
+            continue
+        products.append(ProductRecord(
+            product.pk, product.name, product.slug, product.price,
+            product.category_id, product.category.slug,
+            product.subcategory_id, product.subcategory.slug, dict(data)
+        ))
+    return CatalogSnapshot(version, categories, products)
+
+
+class SnapshotHolder:
+    """
+    Снимок каталога в памяти процесса. Ревизия каталога проверяется
+    не чаще раза в CATALOG_SNAPSHOT_CHECK_INTERVAL секунд; при её
+    изменении снимок пересобирается одним потоком, остальные ждут его.
+    Если пересборка не удалась, до следующей проверки отдаётся прежний
+    снимок, а без него — SnapshotUnavailable.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._checked_at = 0
+        self.flight = SingleFlight()
+
+    def get(self):
+        snapshot = self._snapshot
+        now = time.monotonic()
+        if now - self._checked_at < settings.CATALOG_SNAPSHOT_CHECK_INTERVAL:
+            if snapshot is None:
+                raise SnapshotUnavailable
+            return snapshot
+        version = CatalogRevision.current()
+        if snapshot is None or snapshot.version != version:
+            try:
+                snapshot = self.flight.do(f'snapshot:{version}',
+                                          build_snapshot, version)
+            except Exception as error:
+                logger.exception('Не удалось собрать снимок каталога')
+                with self._lock:
+                    self._checked_at = now
+                if snapshot is None:
+                    raise SnapshotUnavailable from error
+                return snapshot
+        with self._lock:
+            if self._snapshot is None or \
+                    self._snapshot.version <= snapshot.version:
+                self._snapshot = snapshot
+            self._checked_at = now
+        return snapshot
+
+    def clear(self):
+        with self._lock:
+            self._snapshot = None
+            self._checked_at = 0
+
+
+catalog_snapshot = SnapshotHolder()
+
+
+class SnapshotListMixin:
+    """
+    Отдаёт список из снимка каталога без запросов к таблицам каталога,
+    если включён CATALOG_SNAPSHOT; без снимка — из БД. Записи выбирает
+    snapshot_records(), поля ответа — get_fieldset() (SparseFieldsMixin).
+    """
+
+    def snapshot_records(self, snapshot):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not settings.CATALOG_SNAPSHOT:
+            return super().list(request, *args, **kwargs)
+        try:
+            snapshot = catalog_snapshot.get()
+        except SnapshotUnavailable:
+            return super().list(request, *args, **kwargs)
+        records = self.snapshot_records(snapshot)
+        fieldset = self.get_fieldset()
+        page = self.paginate_queryset(records)
+        data = [record.render(fieldset, request)
+                for record in (records if page is None else page)]
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+
+# Выполняется в отдельном процессе с -X importtime: чистый интерпретатор
+# без уже загруженных модулей текущего процесса.
+PROBE = '''
+import json, sys, time
+started = time.perf_counter()
+phases = []
+
+def phase(name, func):
+    begin = time.perf_counter()
+    func()
+    phases.append((name, time.perf_counter() - begin))
+
+import django
+from django.conf import settings
+phase('settings', lambda: settings.INSTALLED_APPS)
+phase('django.setup', django.setup)
+from django.urls import get_resolver
+phase('urls', lambda: get_resolver().url_patterns)
+from django.core.wsgi import get_wsgi_application
+phase('wsgi', get_wsgi_application)
+print(json.dumps({'phases': phases,
+                  'total': time.perf_counter() - started,
+                  'modules': sorted(sys.modules)}))
+'''
+
+
+def parse_importtime(output):
+    """
+    Разбирает вывод -X importtime в список
+    (модуль, собственное время, суммарное время в мкс, глубина).
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        if not self_us.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return entries
+
+
+def measure_startup():
+    """
+    Запускает загрузку проекта в новом процессе и возвращает
+    {'phases': [(фаза, сек)], 'total': сек, 'modules': [...],
+    'imports': parse_importtime(...)}.
+    """
+    env = dict(os.environ)
+    env.setdefault('DJANGO_SETTINGS_MODULE', 'shop.settings')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        check=True
+    )
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report['imports'] = parse_importtime(result.stderr)
+    return report
@@ -0,0 +1,144 @@
+import mimetypes
+import posixpath
+import re
+from functools import lru_cache
+from pathlib import Path
+
+from django.http import (FileResponse, Http404, HttpResponse,
+                         HttpResponseNotModified, StreamingHttpResponse)
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from .compression import FILE_SUFFIXES, negotiate_encoding
+
+re_range = re.compile(r'^bytes=(\d*)-(\d*)$')
+CHUNK_SIZE = 64 * 1024
+
+
+def resolve_path(document_root, path):
+    """Возвращает путь к файлу внутри document_root или вызывает Http404."""
+    root = Path(document_root).resolve()
+    path = posixpath.normpath(path).lstrip('/')
+    full_path = (root / path).resolve()
+    if root not in full_path.parents or not full_path.is_file():
+        raise Http404('Файл не найден')
+    return full_path
+
+
+def parse_range(header, size):
+    """
+    Разбирает одиночный диапазон "bytes=start-end".
+    Возвращает (start, end) включительно, None для некорректного
+    заголовка и False для диапазона за пределами файла.
+    """
+    match = re_range.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if start == '':
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def read_range(path, start, end):
+    with open(path, 'rb') as file:
+        file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = file.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@lru_cache(maxsize=None)
+def hashed_static_names():
+    """
+    Имена статических файлов с хэшем содержимого из манифеста
+    collectstatic (ManifestStaticFilesStorage); без манифеста — пусто.
+    """
+    from django.contrib.staticfiles.storage import staticfiles_storage
+
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def serve(request, path, document_root, max_age=0, immutable=False,
+          immutable_pattern=None, immutable_names=None,
+          immutable_max_age=None):
+    """
+    Отдаёт файл из document_root для продакшн-режима:
+    заранее сжатые варианты (.br/.gz), ETag/Last-Modified,
+    запросы диапазонов (Range) и долгоживущие заголовки кэширования.
+    Пути, совпадающие с immutable_pattern или входящие в
+    immutable_names(), кэшируются как неизменяемые.
+    """
+    if immutable_pattern and re.match(immutable_pattern, path) or \
+            immutable_names and path in immutable_names():
+        immutable = True
+        max_age = immutable_max_age or max_age
+    full_path = resolve_path(document_root, path)
+    content_type, _ = mimetypes.guess_type(str(full_path))
+    content_type = content_type or 'application/octet-stream'
+
+    variants = {}
+    for name, suffix in FILE_SUFFIXES.items():
+        variant = full_path.with_name(full_path.name + suffix)
+        if variant.is_file():
+            variants[name] = variant
+
+    range_header = request.headers.get('Range')
+    encoding = None
+    file_path = full_path
+    if variants and not range_header:
+        encoding = negotiate_encoding(request.headers.get('Accept-Encoding'),
+                                      list(variants))
+        if encoding:
+            file_path = variants[encoding]
+
+    stat = file_path.stat()
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+    if etag in [tag.strip() for tag in
+                request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+    elif range_header and request.headers.get('If-Range', etag) == etag:
+        byte_range = parse_range(range_header, stat.st_size)
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{stat.st_size}'
+        elif byte_range is None:
+            response = FileResponse(open(file_path, 'rb'),
+                                    content_type=content_type)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(file_path, start, end),
+                status=206,
+                content_type=content_type
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+            response['Content-Length'] = str(end - start + 1)
+    else:
+        response = FileResponse(open(file_path, 'rb'),
+                                content_type=content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Accept-Ranges'] = 'bytes'
+    if variants:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if immutable:
+        patch_cache_control(response, public=True, max_age=max_age,
+                            immutable=True)
+    elif max_age:
+        patch_cache_control(response, public=True, max_age=max_age)
+    return response
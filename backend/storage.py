@@ -0,0 +1,52 @@
+import hashlib
+import os
+import posixpath
+
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище, именующее файлы по SHA-256 содержимого:
+    <каталог upload_to>/<2 символа хэша>/<хэш>.<расширение>.
+    Одинаковые загрузки сохраняются один раз, а имя файла
+    никогда не меняет содержимое, поэтому URL можно кэшировать навсегда.
+    """
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        digest = self.content_hash(content)
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        name = posixpath.join(directory, digest[:2], digest + extension)
+        if self.exists(name):
+            # Свежее время изменения: gc_media не удалит файл, на который
+            # снова ссылаются, как давно осиротевший
+            try:
+                os.utime(self.path(name))
+            except FileNotFoundError:
+                pass
+            else:
+                return name
+        saved_name = super().save(name, content, max_length)
+        if saved_name != name:
+            # Такой же файл успели сохранить параллельно
+            self.delete(saved_name)
+        return name
+
+    @staticmethod
+    def content_hash(content):
+        sha256 = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return sha256.hexdigest()
+
+
+content_addressed_storage = ContentAddressedStorage()
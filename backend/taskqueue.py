@@ -0,0 +1,148 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import Task
+from .querylog import log_slow_queries
+from .routers import use_primary
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(name, max_attempts=3, every=None):
+    """
+    Регистрирует функцию как фоновую задачу с именем name.
+    Задача с every (сек) периодическая: после выполнения она
+    снова ставится в очередь через every секунд.
+    """
+    def decorator(func):
+        func.task_name = name
+        func.max_attempts = max_attempts
+        func.every = every
+        registry[name] = func
+        return func
+    return decorator
+
+
+def make_unique_key(name, args):
+    return f'{name}:{json.dumps(args, sort_keys=True)}'[:255]
+
+
+def enqueue(name, *args, unique=False, delay=None):
+    """
+    Ставит задачу в очередь после фиксации текущей транзакции.
+    При TASKS_EAGER выполняет её сразу в текущем потоке.
+    Если unique=True, задача не дублируется, пока такая же ждёт в очереди.
+    """
+    if name not in registry:
+        raise KeyError(f'Неизвестная задача: {name}')
+    args = list(args)
+    if settings.TASKS_EAGER:
+        registry[name](*args)
+        return
+
+    def create():
+        unique_key = make_unique_key(name, args) if unique else ''
+        if unique and Task.objects.filter(
+                unique_key=unique_key, status=Task.STATUS_PENDING).exists():
+            return
+        Task.objects.create(
+            name=name,
+            args=args,
+            unique_key=unique_key,
+            max_attempts=registry[name].max_attempts,
+            run_after=timezone.now() + (delay or timedelta()),
+        )
+
+    transaction.on_commit(create)
+
+
+def schedule_periodic_tasks():
+    """Ставит в очередь периодические задачи, которых в ней ещё нет."""
+    for name, func in registry.items():
+        if not func.every:
+            continue
+        unique_key = make_unique_key(name, [])
+        if Task.objects.filter(unique_key=unique_key).exists():
+            continue
+        Task.objects.create(name=name, args=[], unique_key=unique_key,
+                            max_attempts=func.max_attempts,
+                            run_after=timezone.now())
+
+
+def reschedule(task_obj, error=''):
+    """Возвращает периодическую задачу в очередь до следующего запуска."""
+    every = registry[task_obj.name].every
+    Task.objects.filter(pk=task_obj.pk).update(
+        status=Task.STATUS_PENDING, attempts=0, locked_by='', locked_at=None,
+        last_error=error,
+        run_after=timezone.now() + timedelta(seconds=every))
+
+
+def release_stale_tasks():
+    """Возвращает в очередь задачи зависших обработчиков."""
+    deadline = timezone.now() - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    return Task.objects.filter(status=Task.STATUS_RUNNING,
+                               locked_at__lt=deadline) \
+        .update(status=Task.STATUS_PENDING, locked_by='', locked_at=None)
+
+
+def claim(worker_id, limit):
+    """
+    Забирает до limit готовых задач. Строки, заблокированные
+    другими обработчиками, пропускаются (SKIP LOCKED).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.STATUS_PENDING, run_after__lte=now)
+            .order_by('run_after')
+            .values_list('pk', flat=True)[:limit]
+        )
+        Task.objects.filter(pk__in=ids).update(
+            status=Task.STATUS_RUNNING, locked_by=worker_id, locked_at=now,
+            attempts=F('attempts') + 1
+        )
+    return list(Task.objects.filter(pk__in=ids))
+
+
+def execute(task_obj):
+    """
+    Выполняет задачу. Успешная задача удаляется из очереди,
+    неуспешная повторяется с экспоненциальной задержкой.
+    Периодическая задача вместо удаления ждёт следующего запуска.
+    """
+    periodic = bool(registry[task_obj.name].every)
+    try:
+        # Задачи читают только с основной БД: реплика может отставать
+        with use_primary(), log_slow_queries(f'task {task_obj.name}'):
+            registry[task_obj.name](*task_obj.args)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Задача %s завершилась ошибкой', task_obj)
+        if task_obj.attempts >= task_obj.max_attempts:
+            if periodic:
+                reschedule(task_obj, error)
+            else:
+                Task.objects.filter(pk=task_obj.pk).update(
+                    status=Task.STATUS_FAILED, last_error=error)
+            return False
+        delay = settings.TASKS_RETRY_DELAY * 2 ** (task_obj.attempts - 1)
+        Task.objects.filter(pk=task_obj.pk).update(
+            status=Task.STATUS_PENDING, locked_by='', locked_at=None,
+            last_error=error,
+            run_after=timezone.now() + timedelta(seconds=delay))
+        return False
+    if periodic:
+        reschedule(task_obj)
+    else:
+        Task.objects.filter(pk=task_obj.pk).delete()
+    return True
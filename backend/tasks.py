@@ -0,0 +1,56 @@
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from imagekit.models.fields.utils import ImageSpecFileDescriptor
+from . import cleanup, pricing, recommendations, trending
+from .chaining import get_chained_subcategories
+from .taskqueue import task
+
+logger = logging.getLogger(__name__)
+
+
+@task('generate_renditions')
+def generate_renditions(model_label, pk):
+    """Генерирует все уменьшенные копии изображения объекта."""
+    model = apps.get_model(model_label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return
+    for name, attr in vars(model).items():
+        if isinstance(attr, ImageSpecFileDescriptor) and \
+                getattr(instance, attr.source_field_name):
+            getattr(instance, name).generate()
+
+
+@task('warm_chained_subcategories')
+def warm_chained_subcategories(category_id):
+    """Заполняет кэш списка подкатегорий после фиксации изменений."""
+    get_chained_subcategories(category_id, refresh=True)
+
+
+@task('reprice_cart_items')
+def reprice_cart_items(product_ids):
+    """Переносит новые цены продуктов в позиции корзин."""
+    pricing.reprice_cart_items(product_ids)
+
+
+@task('delete_expired_carts', every=settings.CART_CLEANUP_INTERVAL)
+def delete_expired_carts():
+    """Удаляет неактивные корзины пачками."""
+    stats = cleanup.delete_expired_carts()
+    logger.info('Удалено корзин: %s, позиций: %s, %.0f строк/с',
+                stats['carts'], stats['items'],
+                cleanup.rows_per_second(stats))
+
+
+@task('build_related_products', every=settings.RELATED_PRODUCTS_INTERVAL)
+def build_related_products():
+    """Пересчитывает связанные товары по изменённым корзинам."""
+    recommendations.build_related_products()
+
+
+@task('rebuild_trending', every=settings.TRENDING_REBUILD_INTERVAL)
+def rebuild_trending():
+    """Пересчитывает список популярных товаров."""
+    trending.rebuild_trending()
@@ -0,0 +1,144 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class LocalStore:
+    """Счётчики в памяти процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            value, expires = self._counters.get(key, (0, 0))
+            if expires <= now:
+                value, expires = 0, now + timeout
+            self._counters[key] = (value + 1, expires)
+            if len(self._counters) > 10000:
+                self._purge(now)
+            return value + 1
+
+    def get(self, key):
+        with self._lock:
+            value, expires = self._counters.get(key, (0, 0))
+        return value if expires > time.monotonic() else 0
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+
+    def _purge(self, now):
+        for key in [key for key, (_, expires) in self._counters.items()
+                    if expires <= now]:
+            del self._counters[key]
+
+
+class CacheStore:
+    """Счётчики в общем кэше Django (Redis в продакшне)."""
+
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def incr(self, key, timeout):
+        self.cache.add(key, 0, timeout)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Ключ истёк между add и incr
+            self.cache.set(key, 1, timeout)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key) or 0
+
+    def clear(self):
+        self.cache.clear()
+
+
+STORES = {
+    'local': LocalStore(),
+    'cache': CacheStore(),
+}
+
+
+def get_store():
+    return STORES[settings.THROTTLE_STORE]
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты по скользящему окну: счётчики текущего
+    и предыдущего окна, вклад предыдущего убывает со временем.
+    Проверка стоит одну атомарную операцию инкремента и одно чтение.
+
+    Область задаётся атрибутом throttle_scope представления,
+    частота — в DEFAULT_THROTTLE_RATES под ключом
+    '<throttle_scope>_<scope_suffix>'.
+    """
+
+    scope_suffix = None
+
+    def __init__(self):
+        # Частота определяется по представлению в allow_request
+        pass
+
+    def allow_request(self, request, view):
+        view_scope = getattr(view, 'throttle_scope', None)
+        if view_scope is None:
+            return True
+        self.scope = f'{view_scope}_{self.scope_suffix}'
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        if self.rate is None:
+            return True
+
+        ident = self.get_ident_value(request)
+        if not ident:
+            return True
+        key = self.cache_format % {'scope': self.scope, 'ident': ident}
+
+        store = get_store()
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current = store.incr(f'{key}:{window}', self.duration * 2)
+        previous = store.get(f'{key}:{window - 1}')
+        self.elapsed = self.now % self.duration / self.duration
+        estimated = previous * (1 - self.elapsed) + current
+        return estimated <= self.num_requests
+
+    def wait(self):
+        return self.duration * (1 - self.elapsed)
+
+    def get_ident_value(self, request):
+        raise NotImplementedError
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Ограничение по IP-адресу клиента."""
+
+    scope_suffix = 'ip'
+
+    def get_ident_value(self, request):
+        return self.get_ident(request)
+
+
+class UsernameRateThrottle(SlidingWindowThrottle):
+    """Ограничение по имени пользователя из тела запроса."""
+
+    scope_suffix = 'username'
+
+    def get_ident_value(self, request):
+        username = request.data.get('username')
+        if not isinstance(username, str):
+            return None
+        return username.strip().lower()[:150]
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+from .singleflight import SingleFlight
+
+token_flight = SingleFlight()
+
+
+def _get_or_create_token(user):
+    token = Token.objects.filter(user=user).first()
+    if token is not None:
+        return token
+    try:
+        with transaction.atomic():
+            return Token.objects.create(user=user)
+    except IntegrityError:
+        # Токен успел создать другой процесс
+        return Token.objects.get(user=user)
+
+
+def get_token(user):
+    """
+    Возвращает токен пользователя, создавая его при необходимости.
+    Одновременные запросы одного пользователя выполняют один запрос к БД.
+    """
+    return token_flight.do(user.pk, _get_or_create_token, user)
+
+
+# Соль отделяет токены потока событий от прочих подписей SECRET_KEY
+STREAM_TOKEN_SALT = 'backend.cart-events'
+
+
+def get_stream_token(user):
+    """
+    Короткоживущий подписанный токен для потока событий корзины.
+    Годится только для /api/cart/events/: EventSource передаёт его
+    в URL, и постоянный токен API не попадает в журналы и историю.
+    """
+    return signing.dumps(user.pk, salt=STREAM_TOKEN_SALT, compress=True)
+
+
+def stream_token_user_id(value):
+    """id пользователя из токена потока или None, если токен неверен или истёк."""
+    try:
+        return signing.loads(value, salt=STREAM_TOKEN_SALT,
+                             max_age=settings.EVENTS_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Product, ProductTrend
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'trending:products'
+
+trending_flight = SingleFlight()
+
+
+def decay(score, updated_at, now):
+    """Значение score, рассчитанного в updated_at, на момент now."""
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    elapsed = (now - updated_at).total_seconds()
+    return score * 0.5 ** (elapsed / half_life)
+
+
+def store_counts(counts):
+    """
+    Добавляет накопленные события к популярности товаров пачкой:
+    старое значение затухает до текущего момента.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        existing = ProductTrend.objects.select_for_update() \
+            .in_bulk(list(counts))
+        for product_id, trend in existing.items():
+            trend.score = decay(trend.score, trend.updated_at, now) + \
+                counts[product_id]
+            trend.updated_at = now
+        ProductTrend.objects.bulk_update(existing.values(),
+                                         ['score', 'updated_at'])
+        new_ids = Product.objects.filter(
+            pk__in=[pk for pk in counts if pk not in existing]
+        ).values_list('pk', flat=True)
+        ProductTrend.objects.bulk_create(
+            [ProductTrend(product_id=pk, score=counts[pk], updated_at=now)
+             for pk in new_ids],
+            ignore_conflicts=True
+        )
+
+
+class TrendingBuffer:
+    """
+    Счётчики добавлений в корзину в памяти процесса.
+    record() не обращается к БД; накопленное записывается пачкой
+    фоновым потоком раз в TRENDING_FLUSH_INTERVAL секунд
+    (при 0 — только явным вызовом flush()).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+        self._thread = None
+
+    def record(self, product_id, count=1):
+        with self._lock:
+            self._counts[product_id] = self._counts.get(product_id, 0) + count
+            if self._thread is None and settings.TRENDING_FLUSH_INTERVAL:
+                self._thread = threading.Thread(target=self._run,
+                                                name='trending-flush',
+                                                daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        with self._lock:
+            counts, self._counts = self._counts, {}
+        if counts:
+            store_counts(counts)
+        return len(counts)
+
+    def _run(self):
+        while True:
+            time.sleep(settings.TRENDING_FLUSH_INTERVAL)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Не удалось записать популярность товаров')
+            finally:
+                connection.close()
+
+
+trending_buffer = TrendingBuffer()
+
+
+def rebuild_trending():
+    """
+    Пересчитывает отсортированный список популярных товаров и кладёт
+    его в кэш. Давно не обновлявшиеся записи удаляются.
+    """
+    now = timezone.now()
+    half_life = timedelta(hours=settings.TRENDING_HALF_LIFE_HOURS)
+    ProductTrend.objects.filter(updated_at__lt=now - half_life * 10).delete()
+    rows = ProductTrend.objects.values_list('product_id', 'score',
+                                            'updated_at')
+    ranked = sorted(((decay(score, updated_at, now), product_id)
+                     for product_id, score, updated_at in rows),
+                    reverse=True)[:settings.TRENDING_SIZE]
+    product_ids = [product_id for _, product_id in ranked]
+    cache.set(CACHE_KEY, product_ids, None)
+    return product_ids
+
+
+def get_trending_ids():
+    """Список id популярных товаров из кэша (с пересчётом при пустом)."""
+    product_ids = cache.get(CACHE_KEY)
+    if product_ids is None:
+        product_ids = trending_flight.do(CACHE_KEY, rebuild_trending)
+    return product_ids
@@ -1,16 +1,27 @@
 from django.urls import path
 from .views import (CategoryView, ProductView, RegisterView,
                     LoginView, CartDetailView, CartAddUpdateView,
-                    CartRemoveView, CartClearView)
+                    CartRemoveView, CartClearView, CatalogChangesView,
+                    RelatedProductsView, ProductFacetsView,
+                    TrendingProductsView, CheckoutView, CartEventsView,
+                    CartEventsTokenView, ProductBatchView)
 
 urlpatterns = [
     path('categories/', CategoryView.as_view(), name='category-list'),
     path('products/', ProductView.as_view(), name='product-list'),
+    path('products/batch/', ProductBatchView.as_view(), name='product-batch'),
+    path('products/facets/', ProductFacetsView.as_view(), name='product-facets'),
+    path('products/trending/', TrendingProductsView.as_view(), name='product-trending'),
+    path('products/<slug:slug>/related/', RelatedProductsView.as_view(), name='product-related'),
+    path('catalog/changes/', CatalogChangesView.as_view(), name='catalog-changes'),
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', LoginView.as_view(), name='login'),
     path('cart/', CartDetailView.as_view(), name='cart-detail'),
     path('cart/items/', CartAddUpdateView.as_view(), name='cart-add-update'),
     path('cart/items/<slug:product_slug>/', CartRemoveView.as_view(), name='cart-remove'),
     path('cart/clear/', CartClearView.as_view(), name='cart-clear'),
+    path('cart/events/', CartEventsView.as_view(), name='cart-events'),
+    path('cart/events/token/', CartEventsTokenView.as_view(), name='cart-events-token'),
+    path('orders/checkout/', CheckoutView.as_view(), name='order-checkout'),
 
 ]
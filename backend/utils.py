@@ -1,5 +1,4 @@
 from django.utils.text import slugify
-from unidecode import unidecode
 
 
 def generate_unique_slug(
@@ -11,6 +10,9 @@ def generate_unique_slug(
     """
 
     if instance.pk is None:
+        # Импорт при первом создании объекта, а не при старте процесса
+        from unidecode import unidecode
+
         value = str(getattr(instance, field_name))
         slug = slugify(unidecode(value))
         if not slug:
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from PIL import Image
 
 
 def validate_image_size(image):
@@ -10,3 +12,33 @@ def validate_image_size(image):
         raise ValidationError(
             f"Размер файла {size_mb:.1f}MB превышает максимальный 5MB"
         )
+
+
+def validate_image_dimensions(image):
+    """
+    Проверяет формат и размеры изображения по заголовку файла,
+    не декодируя пиксели (защита от decompression bomb).
+    """
+    try:
+        image.seek(0)
+        with Image.open(image) as img:
+            image_format = img.format
+            width, height = img.size
+    except Image.DecompressionBombError:
+        raise ValidationError('Слишком большое разрешение изображения')
+    except (OSError, SyntaxError):
+        raise ValidationError('Файл не является изображением')
+    finally:
+        image.seek(0)
+
+    if image_format not in settings.IMAGE_ALLOWED_FORMATS:
+        raise ValidationError(
+            f"Формат {image_format} не поддерживается, допустимы: "
+            f"{', '.join(settings.IMAGE_ALLOWED_FORMATS)}"
+        )
+    megapixels = width * height / 1_000_000
+    if megapixels > settings.IMAGE_MAX_MEGAPIXELS:
+        raise ValidationError(
+            f"Разрешение {width}x{height} ({megapixels:.1f} Мп) превышает "
+            f"максимальное {settings.IMAGE_MAX_MEGAPIXELS} Мп"
+        )
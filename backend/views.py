@@ -1,48 +1,321 @@
+from decimal import Decimal
+
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParameter
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.generics import ListAPIView, RetrieveAPIView, DestroyAPIView
+from rest_framework.exceptions import NotFound
+from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.authtoken.models import Token
-from django.contrib.auth import authenticate
 from .serializers import (CategorySerializer, ProductSerializer,
                           RegisterSerializer, LoginSerializer,
-                          UserSerializer, CartSerializer, CartItemSerializer)
-from .models import Category, Product, Cart, CartItem
+                          UserSerializer, CartSerializer, CartItemSerializer,
+                          CategoryChangeSerializer, SubcategoryChangeSerializer,
+                          ProductChangeSerializer, TombstoneSerializer,
+                          OrderSerializer, ProductBatchSerializer)
+from .models import (Category, Subcategory, Product, Cart, CartItem,
+                     CatalogRevision, CatalogTombstone, Order, OrderLine)
+from . import carts, orders
+from .events import (cart_channel, format_event, get_broker,
+                     publish_cart_event)
+from .facets import product_facets
+from .fieldsets import FIELDSET_PARAMETERS, SparseFieldsMixin
+from .filters import (PRODUCT_FILTER_PARAMETERS, FacetsQuerySerializer,
+                      filter_products, product_filter_params)
+from .snapshot import SnapshotListMixin
+from .response_cache import (AnonymousCacheMixin, cache_key, catalog_cache,
+                             cached_products)
+from .throttling import IPRateThrottle, UsernameRateThrottle
+from .tokens import get_stream_token, get_token, stream_token_user_id
+from .trending import get_trending_ids, trending_buffer
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import Prefetch
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
 
 
 @extend_schema(
     tags=['catalog'],
     summary="Список категорий",
     description="Возвращает список всех категорий с подкатегориями",
+    parameters=FIELDSET_PARAMETERS,
     responses={200: CategorySerializer(many=True)},
     auth=[]
 )
-class CategoryView(ListAPIView):
+class CategoryView(AnonymousCacheMixin, SnapshotListMixin, SparseFieldsMixin,
+                   ListAPIView):
     """Просмотр категорий с подкатегориями."""
 
+    cache_prefix = 'catalog:categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
 
+    def snapshot_records(self, snapshot):
+        return snapshot.categories
+
 
 @extend_schema(
     tags=['catalog'],
     summary="Список товаров",
     description="Возвращает список всех товаров с детальной информацией",
+    parameters=PRODUCT_FILTER_PARAMETERS + FIELDSET_PARAMETERS,
     responses={200: ProductSerializer(many=True)},
     auth=[]
 )
-class ProductView(ListAPIView):
+class ProductView(AnonymousCacheMixin, SnapshotListMixin, SparseFieldsMixin,
+                  ListAPIView):
     """Просмотр списка продуктов."""
 
-    queryset = Product.objects.all() \
-        .select_related('category', 'subcategory')
+    cache_prefix = 'catalog:products'
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        return filter_products(super().get_queryset(),
+                               self.request.query_params)
+
+    def snapshot_records(self, snapshot):
+        return snapshot.filter_products(
+            product_filter_params(self.request.query_params))
+
+
+@extend_schema(
+    tags=['catalog'],
+    summary="Товары по списку slug",
+    description="""
+    Возвращает товары в порядке переданных slug (повторы убираются).
+    Несуществующие slug перечисляются в `missing`.
+    Не больше PRODUCT_BATCH_MAX_SIZE slug за запрос; для длинных списков
+    есть вариант POST.
+    """,
+    parameters=[
+        OpenApiParameter(
+            name='slugs',
+            description='Slug товаров через запятую',
+            required=True,
+            type=str,
+            location=OpenApiParameter.QUERY)
+    ],
+    responses={
+        200: OpenApiResponse(description="Товары и ненайденные slug"),
+        400: OpenApiResponse(description="Некорректный список slug")
+    },
+    auth=[]
+)
+class ProductBatchView(APIView):
+    """Товары по списку slug с кэшем на каждый товар."""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        slugs = request.query_params.get('slugs', '')
+        return self.batch({'slugs': [slug for slug in slugs.split(',')
+                                     if slug]})
+
+    @extend_schema(request=ProductBatchSerializer,
+                   parameters=[])
+    def post(self, request):
+        return self.batch(request.data)
+
+    def batch(self, data):
+        serializer = ProductBatchSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        slugs = serializer.validated_data['slugs']
+        products = cached_products(slugs)
+        return Response({
+            'results': [products[slug] for slug in slugs if slug in products],
+            'missing': [slug for slug in slugs if slug not in products],
+        })
+
+
+@extend_schema(
+    tags=['catalog'],
+    summary="Фасеты товаров",
+    description="""
+    Для товаров, отобранных фильтрами, возвращает общее число и диапазон
+    цен, те же показатели по категориям и подкатегориям и гистограмму
+    цен с шагом `price_step` (по умолчанию FACETS_PRICE_STEP). Слишком
+    малый шаг увеличивается до FACETS_MAX_BUCKETS интервалов гистограммы.
+    """,
+    parameters=PRODUCT_FILTER_PARAMETERS + [
+        OpenApiParameter(
+            name='price_step',
+            description='Шаг гистограммы цен',
+            required=False,
+            type=float,
+            location=OpenApiParameter.QUERY)
+    ],
+    responses={
+        200: OpenApiResponse(description="Фасеты товаров"),
+        400: OpenApiResponse(description="Некорректные параметры")
+    },
+    auth=[]
+)
+class ProductFacetsView(APIView):
+    """Фасеты товаров одним сгруппированным запросом."""
+
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = FacetsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        price_step = params.validated_data.get('price_step')
+        max_buckets = settings.FACETS_MAX_BUCKETS
+        if price_step is None:
+            price_step = Decimal(settings.FACETS_PRICE_STEP)
+            max_buckets = None
+
+        def compute():
+            queryset = filter_products(Product.objects.all(),
+                                       request.query_params)
+            return product_facets(queryset, price_step, max_buckets)
+
+        if request.user.is_authenticated:
+            return Response(compute())
+        return Response(catalog_cache.get(
+            cache_key('catalog:facets', request), compute))
+
+
+@extend_schema(
+    tags=['catalog'],
+    summary="Популярные товары",
+    description="""
+    Товары, которые чаще всего добавляют в корзину в последнее время
+    (вклад старых добавлений затухает со временем).
+    """,
+    responses={200: ProductSerializer(many=True)},
+    auth=[]
+)
+class TrendingProductsView(ListAPIView):
+    """Популярные товары из заранее рассчитанного списка."""
+
+    serializer_class = ProductSerializer
+    permission_classes = [AllowAny]
+    pagination_class = None
+
+    def get_queryset(self):
+        product_ids = get_trending_ids()
+        products = Product.objects.filter(pk__in=product_ids) \
+            .select_related('category', 'subcategory') \
+            .in_bulk()
+        return [products[pk] for pk in product_ids if pk in products]
+
+
+@extend_schema(
+    tags=['catalog'],
+    summary="Связанные товары",
+    description="Товары, которые чаще всего покупают вместе с данным",
+    parameters=[
+        OpenApiParameter(
+            name='slug',
+            description='Slug товара',
+            required=True,
+            type=str,
+            location=OpenApiParameter.PATH)
+    ],
+    responses={
+        200: ProductSerializer(many=True),
+        404: OpenApiResponse(description="Товар не найден")
+    },
+    auth=[]
+)
+class RelatedProductsView(ListAPIView):
+    """Связанные товары по заранее рассчитанным совместным покупкам."""
+
     serializer_class = ProductSerializer
     permission_classes = [AllowAny]
+    pagination_class = None
+
+    def get_queryset(self):
+        return Product.objects \
+            .filter(related_to__product__slug=self.kwargs['slug']) \
+            .select_related('category', 'subcategory') \
+            .order_by('-related_to__score', 'pk')
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if not response.data:
+            # Связей нет: отличаем товар без связей от несуществующего
+            get_object_or_404(Product, slug=kwargs['slug'])
+        return response
+
+
+@extend_schema(
+    tags=['catalog'],
+    summary="Изменения каталога",
+    description="""
+    Возвращает категории, подкатегории и товары, изменённые после
+    ревизии `since`, а также список удалённых объектов.
+
+    - Первая синхронизация: `since=0`
+    - Следующий запрос: `since` = значение `revision` из ответа
+    - Если `has_more` = true, изменения нужно дозапросить
+    """,
+    parameters=[
+        OpenApiParameter(
+            name='since',
+            description='Последняя полученная клиентом ревизия',
+            required=False,
+            type=int,
+            location=OpenApiParameter.QUERY)
+    ],
+    responses={
+        200: OpenApiResponse(description="Изменения каталога"),
+        400: OpenApiResponse(description="Некорректная ревизия")
+    },
+    auth=[]
+)
+class CatalogChangesView(APIView):
+    """Дельта-синхронизация каталога по ревизиям."""
+
+    permission_classes = [AllowAny]
+    sources = (
+        ('categories', Category.objects.all(), CategoryChangeSerializer),
+        ('subcategories', Subcategory.objects.all(),
+         SubcategoryChangeSerializer),
+        ('products', Product.objects.select_related('category', 'subcategory'),
+         ProductChangeSerializer),
+        ('deleted', CatalogTombstone.objects.all(), TombstoneSerializer),
+    )
+
+    def get(self, request):
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            since = -1
+        if since < 0:
+            return Response({'since': 'Ожидается неотрицательное целое число'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        limit = settings.CATALOG_CHANGES_LIMIT
+        revision = max(since, CatalogRevision.current())
+        changes = {
+            key: list(queryset.filter(revision__gt=since)
+                      .order_by('revision')[:limit + 1])
+            for key, queryset, _ in self.sources
+        }
+        revisions = sorted(obj.revision
+                           for objects in changes.values()
+                           for obj in objects)
+        has_more = len(revisions) > limit
+        if has_more:
+            revision = revisions[limit - 1]
+
+        data = {'revision': revision, 'has_more': has_more}
+        for key, _, serializer_class in self.sources:
+            objects = [obj for obj in changes[key] if obj.revision <= revision]
+            data[key] = serializer_class(objects, many=True,
+                                         context={'request': request}).data
+        return Response(data, status=status.HTTP_200_OK)
 
 
 @extend_schema(
@@ -70,12 +343,14 @@ class RegisterView(APIView):
     """Регистрация нового пользователя."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle]
+    throttle_scope = 'register'
 
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            token, created = Token.objects.get_or_create(user=user)
+            token = get_token(user)
             return Response({
                 'user': UserSerializer(user).data,
                 'token': token.key
@@ -112,12 +387,14 @@ class LoginView(APIView):
     """Авторизация пользователя."""
 
     permission_classes = [AllowAny]
+    throttle_classes = [IPRateThrottle, UsernameRateThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
-            user = authenticate(**serializer.validated_data)
-            token, created = Token.objects.get_or_create(user=user)
+            user = serializer.validated_data['user']
+            token = get_token(user)
             return Response({
                 'user': UserSerializer(user).data,
                 'token': token.key
@@ -138,8 +415,7 @@ class CartDetailView(RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        cart, _ = Cart.objects.get_or_create(user=self.request.user)
-        return cart
+        return carts.load_cart(self.request.user)
 
 
 @extend_schema(
@@ -180,12 +456,24 @@ class CartAddUpdateView(APIView):
         with transaction.atomic():
             cart_item, created = CartItem.objects.get_or_create(cart=cart,
                                                                 product=product,
-                                                                defaults={'quantity': quantity})
+                                                                defaults={'quantity': quantity,
+                                                                          'price': product.price})
             if not created:
                 cart_item.quantity = quantity
+                cart_item.price = product.price
                 cart_item.save()
-
-        cart_serializer = CartSerializer(cart)
+            cart.prices_changed = False
+            cart.save(update_fields=['prices_changed', 'updated_at'])
+
+        trending_buffer.record(product.pk)
+        cart_serializer = CartSerializer(carts.load_cart(request.user))
+        cart_data = cart_serializer.data
+        publish_cart_event(request.user.pk, 'item', {
+            'item': next(item for item in cart_data['items']
+                         if item['id'] == cart_item.pk),
+            'total_items': cart_data['total_items'],
+            'total_price': cart_data['total_price'],
+        })
         if created:
             return Response({
                 'message': 'Товар добавлен в корзину',
@@ -219,32 +507,24 @@ class CartAddUpdateView(APIView):
         404: OpenApiResponse(description="Товар не найден в корзине")
     }
 )
-class CartRemoveView(DestroyAPIView):
+class CartRemoveView(APIView):
     """Удаление товара из корзины по product_slug."""
 
     permission_classes = [IsAuthenticated]
 
-    def get_queryset(self):
-        cart, _ = Cart.objects.get_or_create(user=self.request.user)
-        return cart.cart_items.all()
-
-    def get_object(self):
-        product_slug = self.kwargs['product_slug']
-        cart = Cart.objects.get(user=self.request.user)
-
-        cart_item = get_object_or_404(CartItem,
-                                      cart=cart,
-                                      product__slug=product_slug)
-        return cart_item
-
-    def destroy(self, request, *args, **kwargs):
-        cart_item = self.get_object()
-        cart = cart_item.cart
-        cart_item.delete()
+    def delete(self, request, product_slug):
+        if not carts.remove_cart_item(request.user, product_slug):
+            raise NotFound('Товар не найден в корзине')
 
+        cart_data = CartSerializer(carts.load_cart(request.user)).data
+        publish_cart_event(request.user.pk, 'remove', {
+            'product_slug': product_slug,
+            'total_items': cart_data['total_items'],
+            'total_price': cart_data['total_price'],
+        })
         return Response({
             'message': 'Товар успешно удален из корзины',
-            'cart': CartSerializer(cart).data
+            'cart': cart_data
         }, status=status.HTTP_200_OK)
 
 
@@ -265,10 +545,146 @@ class CartClearView(APIView):
     permission_classes = [IsAuthenticated]
 
     def delete(self, request):
-        cart = get_object_or_404(Cart, user=request.user)
-        if not cart.cart_items.exists():
+        if not carts.clear_cart(request.user):
+            # Ничего не удалено: различаем пустую и отсутствующую корзину
+            get_object_or_404(Cart, user=request.user)
             return Response({'detail': 'Корзина уже пуста'},
                             status=status.HTTP_400_BAD_REQUEST)
-        cart.cart_items.all().delete()
+        publish_cart_event(request.user.pk, 'clear', {})
         return Response({'detail': 'Корзина успешно очищена'},
                         status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['orders'],
+    summary="Оформление заказа",
+    description="""
+    Оформляет заказ из корзины текущего пользователя: списывает остатки
+    товаров, фиксирует цены из корзины и очищает корзину. Если цены
+    в корзине изменились (prices_changed) или расходятся с текущими
+    ценами товаров, возвращает 409 с обновлённой корзиной; повторный
+    запрос оформит заказ по показанным ценам.
+    """,
+    request=None,
+    responses={
+        201: OrderSerializer,
+        400: OpenApiResponse(description="Корзина пуста"),
+        401: OpenApiResponse(description="Не авторизован"),
+        409: OpenApiResponse(description="Недостаточно товара на складе "
+                                         "или изменились цены")
+    }
+)
+class CheckoutView(APIView):
+    """Оформление заказа из корзины."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        try:
+            order = orders.checkout(request.user)
+        except orders.EmptyCart:
+            return Response({'detail': 'Корзина пуста'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        except orders.PricesChanged:
+            # Флаг снимается до чтения корзины: новое изменение цен
+            # после этого снова остановит оформление
+            Cart.objects.filter(user=request.user).update(prices_changed=False)
+            return Response({
+                'detail': 'Цены в корзине изменились',
+                'cart': CartSerializer(carts.load_cart(request.user)).data
+            }, status=status.HTTP_409_CONFLICT)
+        except orders.OutOfStock as error:
+            product = Product.objects.get(pk=error.product_id)
+            return Response({
+                'detail': 'Недостаточно товара на складе',
+                'product_slug': product.slug,
+                'available': orders.get_stock([product.pk])[product.pk]
+            }, status=status.HTTP_409_CONFLICT)
+
+        publish_cart_event(request.user.pk, 'clear', {'order_id': order.pk})
+
+        order = Order.objects.prefetch_related(
+            Prefetch('lines',
+                     queryset=OrderLine.objects.select_related('product'))
+        ).get(pk=order.pk)
+        return Response(OrderSerializer(order).data,
+                        status=status.HTTP_201_CREATED)
+
+
+@extend_schema(
+    tags=['cart'],
+    summary="Токен потока изменений корзины",
+    description="""
+    Выдаёт короткоживущий токен для GET /api/cart/events/?token=...
+    (EventSource в браузере не передаёт заголовки). Токен действует
+    EVENTS_TOKEN_MAX_AGE секунд и годится только для потока корзины;
+    перед каждым подключением нужен новый токен.
+    """,
+    request=None,
+    responses={200: OpenApiResponse(description="Токен и срок действия, сек")}
+)
+class CartEventsTokenView(APIView):
+    """Выдача токена потока изменений корзины."""
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return Response({
+            'token': get_stream_token(request.user),
+            'expires_in': settings.EVENTS_TOKEN_MAX_AGE
+        })
+
+
+async def token_user(request):
+    """
+    Пользователь по токену API из заголовка Authorization: Token <ключ>
+    или по токену потока из параметра token (CartEventsTokenView).
+    """
+    keyword, _, key = request.headers.get('Authorization', '').partition(' ')
+    if keyword == 'Token' and key:
+        token = await Token.objects.select_related('user') \
+            .filter(key=key, user__is_active=True).afirst()
+        return token.user if token else None
+    user_id = stream_token_user_id(request.GET.get('token', ''))
+    if user_id is None:
+        return None
+    return await User.objects.filter(pk=user_id, is_active=True).afirst()
+
+
+class CartEventsView(View):
+    """
+    Поток изменений корзины текущего пользователя (text/event-stream).
+    Первое событие snapshot содержит корзину целиком, далее приходят
+    item, remove и clear. Требует ASGI-сервер.
+    """
+
+    async def get(self, request):
+        user = await token_user(request)
+        if user is None:
+            return JsonResponse(
+                {'detail': 'Учетные данные не были предоставлены.'},
+                status=status.HTTP_401_UNAUTHORIZED
+            )
+        response = StreamingHttpResponse(self.stream(user),
+                                         content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, user):
+        broker = get_broker()
+        # Подписка до чтения корзины: изменения между ними не теряются
+        subscription = broker.subscribe(cart_channel(user.pk))
+        try:
+            snapshot = await sync_to_async(
+                lambda: CartSerializer(carts.load_cart(user)).data
+            )()
+            yield format_event({'event': 'snapshot', 'data': snapshot})
+            while True:
+                message = await subscription.get(settings.EVENTS_KEEPALIVE)
+                if message is None:
+                    yield ': keepalive\n\n'
+                else:
+                    yield format_event(message)
+        finally:
+            broker.unsubscribe(subscription)
@@ -14,6 +14,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Пустые переменные из .env (KEY=) означают значение по умолчанию:
+# os.getenv('KEY') or <по умолчанию>
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -52,6 +54,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'backend.middleware.SlowQueryLogMiddleware',
+    'backend.middleware.ReplicaRoutingMiddleware',
+    'backend.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -94,6 +99,38 @@ DATABASES = {
     }
 }
 
+# Реплики для чтения каталога (backend.routers.ReplicaRouter):
+# хосты через запятую, остальные параметры как у основной БД.
+# Тестовые базы для реплик не создаются (TEST MIRROR).
+DATABASE_REPLICAS = []
+replica_hosts = os.getenv('POSTGRES_REPLICA_HOSTS') or ''
+for number, host in enumerate(filter(None, replica_hosts.split(','))):
+    alias = f'replica_{number}'
+    DATABASES[alias] = {**DATABASES['default'], 'HOST': host.strip(),
+                        'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['backend.routers.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Для нескольких процессов укажите REDIS_URL, иначе кэш локален для процесса
+
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -130,10 +167,40 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+if not DEBUG:
+    # Имена статических файлов с хэшем содержимого можно кэшировать навсегда
+    STORAGES = {
+        'default': {
+            'BACKEND': 'django.core.files.storage.FileSystemStorage',
+        },
+        'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+        },
+    }
+
+# Раздача static/media самим приложением вне DEBUG.
+# Файлы с хэшем в имени (манифест collectstatic и MEDIA_IMMUTABLE_PATHS)
+# кэшируются как неизменяемые на STATIC_CACHE_MAX_AGE, остальные —
+# на MEDIA_CACHE_MAX_AGE.
+SERVE_FILES = (os.getenv('SERVE_FILES') or 'False') == 'True'
+STATIC_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+MEDIA_CACHE_MAX_AGE = 24 * 60 * 60
+# Изображения с именем по хэшу содержимого и их уменьшенные копии не меняются
+MEDIA_IMMUTABLE_PATHS = r'^(\w+/[0-9a-f]{2}/[0-9a-f]{64}\.\w+$|CACHE/images/\w+/[0-9a-f]{2}/[0-9a-f]{64}/)'
+
+# Сжатие ответов (backend.middleware.CompressionMiddleware)
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_LEVELS = {
+    'gzip': 6,
+    'br': 4,
+    'zstd': 3,
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -152,8 +219,25 @@ REST_FRAMEWORK = {
 
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+
+    # Частоты для backend.throttling: '<throttle_scope>_ip' и
+    # '<throttle_scope>_username' (скользящее окно).
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_username': '5/min',
+        'register_ip': '10/hour',
+    },
+
+    # Число доверенных прокси перед приложением: IP клиента берётся
+    # из X-Forwarded-For с конца, по записи ближайшего к прокси клиента.
+    # 0 — заголовок не учитывается, IP клиента — REMOTE_ADDR.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES') or 0),
 }
 
+# Хранилище счётчиков ограничения частоты запросов:
+# 'cache' — общий кэш (CACHES), 'local' — память процесса.
+THROTTLE_STORE = os.getenv('THROTTLE_STORE') or 'cache'
+
 USE_DJANGO_JQUERY = True
 
 SPECTACULAR_SETTINGS = {
@@ -162,3 +246,105 @@ SPECTACULAR_SETTINGS = {
     'VERSION': '1.0.0',
     'SERVE_INCLUDE_SCHEMA': False,
 }
+
+# Заранее собранная схема (python manage.py build_schema).
+# Если файла нет, схема генерируется при первом запросе и хранится в памяти.
+SCHEMA_FILE = BASE_DIR / 'schema' / 'openapi.json'
+
+# Время кэширования списков подкатегорий для админки (smart_selects), сек
+CHAINED_SELECT_MAX_AGE = 300
+
+# Кэш списков каталога для анонимных пользователей, сек:
+# время свежести, сколько ещё отдавать устаревшие данные во время
+# пересчёта и время блокировки пересчёта. 0 в TIMEOUT отключает кэш.
+CATALOG_CACHE_TIMEOUT = 60
+CATALOG_CACHE_STALE = 300
+CATALOG_CACHE_LOCK_TIMEOUT = 30
+
+# Снимок каталога в памяти процесса (backend.snapshot): списки категорий
+# и товаров без запросов к таблицам каталога.
+# Ревизия каталога проверяется не чаще раза в CHECK_INTERVAL сек.
+CATALOG_SNAPSHOT = (os.getenv('CATALOG_SNAPSHOT') or 'True') == 'True'
+CATALOG_SNAPSHOT_CHECK_INTERVAL = 1
+
+# Максимальное число товаров в одном запросе /api/products/batch/
+PRODUCT_BATCH_MAX_SIZE = 100
+
+# Шаг гистограммы цен в /api/products/facets/ по умолчанию и наибольшее
+# число интервалов гистограммы при шаге из запроса (price_step)
+FACETS_PRICE_STEP = 1000
+FACETS_MAX_BUCKETS = 100
+
+# Максимальное число изменений каталога в одном ответе /api/catalog/changes/
+CATALOG_CHANGES_LIMIT = 500
+
+# Размер пачки для массовых операций с товарами (backend.bulk)
+BULK_CHUNK_SIZE = 1000
+
+# Фоновые задачи (backend.taskqueue, команда run_tasks).
+# В режиме TASKS_EAGER задачи выполняются сразу, без обработчика.
+TASKS_EAGER = (os.getenv('TASKS_EAGER') or 'False') == 'True'
+TASKS_RETRY_DELAY = 10
+TASKS_LOCK_TIMEOUT = 10 * 60
+
+# Корзины без изменений дольше CART_TTL_DAYS удаляются задачей
+# delete_expired_carts (раз в CART_CLEANUP_INTERVAL сек) или командой
+# cleanup_carts пачками по CART_CLEANUP_BATCH_SIZE.
+CART_TTL_DAYS = int(os.getenv('CART_TTL_DAYS') or 30)
+CART_CLEANUP_INTERVAL = 60 * 60
+CART_CLEANUP_BATCH_SIZE = 1000
+
+# Популярные товары (backend.trending): период записи счётчиков процесса
+# в БД (0 — только вручную), период пересчёта списка, сек,
+# время полураспада популярности, ч, и длина списка.
+TRENDING_FLUSH_INTERVAL = 10
+TRENDING_REBUILD_INTERVAL = 60
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_SIZE = 20
+
+# Связанные товары («покупают вместе»): число соседей на товар
+# и период инкрементального пересчёта задачей build_related_products, сек.
+# Раз в FULL_INTERVAL сек пересчёт полный: инкрементальный не видит
+# удалённых позиций и корзин.
+RELATED_PRODUCTS_TOP_K = 10
+RELATED_PRODUCTS_INTERVAL = 60 * 60
+RELATED_PRODUCTS_FULL_INTERVAL = 24 * 60 * 60
+
+# События корзины (backend.events, /api/cart/events/): 'local' — подписчики
+# текущего процесса, 'redis' — всех процессов через Redis pub/sub.
+# Интервал комментария keepalive, сек, и длина очереди одного подключения.
+# Срок действия токена потока (/api/cart/events/token/), сек: проверяется
+# при подключении, после переподключения нужен новый токен.
+EVENTS_BROKER = os.getenv('EVENTS_BROKER') or 'local'
+EVENTS_REDIS_URL = os.getenv('REDIS_URL')
+EVENTS_KEEPALIVE = 15
+EVENTS_QUEUE_SIZE = 100
+EVENTS_TOKEN_MAX_AGE = 60
+
+# Число частей, на которые делится остаток товара (backend.orders):
+# одновременные заказы одного товара списывают остаток с разных строк
+STOCK_SHARDS = int(os.getenv('STOCK_SHARDS') or 8)
+
+# Журнал медленных запросов к БД (backend.querylog, отчёт — команда
+# slow_queries): порог, мс, доля записываемых запросов, предел записей
+# в минуту на процесс и период повторного снятия плана одного запроса, сек.
+SLOW_QUERY_LOG = (os.getenv('SLOW_QUERY_LOG') or 'False') == 'True'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS') or 100)
+SLOW_QUERY_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_SAMPLE_RATE') or 1)
+SLOW_QUERY_MAX_PER_MINUTE = 60
+SLOW_QUERY_EXPLAIN_INTERVAL = 300
+SLOW_QUERY_LOG_FILE = BASE_DIR / 'logs' / 'slow_queries.jsonl'
+
+# Допустимое время загрузки процесса (настройки, приложения, urls, wsgi),
+# сек: проверяется командой profile_startup --check
+STARTUP_TIME_BUDGET = float(os.getenv('STARTUP_TIME_BUDGET') or 3)
+
+# Уменьшенные копии изображений создаются фоновой задачей, а если её
+# ещё не было — при первом обращении к URL копии
+IMAGEKIT_DEFAULT_CACHEFILE_STRATEGY = 'backend.imaging.DeferredStrategy'
+
+# Загрузка изображений: проверка по заголовку и уменьшение исходника
+IMAGE_ALLOWED_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+IMAGE_MAX_MEGAPIXELS = 40
+IMAGE_MASTER_MAX_SIDE = 2048
+IMAGE_DECODE_CONCURRENCY = 2
@@ -15,25 +15,42 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from django.conf import settings
 from django.conf.urls.static import static
-from drf_spectacular.views import (SpectacularAPIView,
-                                   SpectacularSwaggerView,
-                                   SpectacularRedocView)
+from backend.chaining import chained_subcategories
+from backend.schema import CachedSchemaView, lazy_view
+from backend.static import hashed_static_names, serve
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('chaining/filter/backend/Subcategory/category/backend/Product/subcategory/<int:category_id>/',
+         chained_subcategories, name='chained-subcategories'),
     path('chaining/', include('smart_selects.urls')),
     path('api/', include('backend.urls')),
 
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc')
+    path('api/schema/', CachedSchemaView.as_view(), name='schema'),
+    path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
+    path('api/redoc/', lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc')
 
 ]
 
-if settings.DEBUG:
+if settings.SERVE_FILES:
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve, {
+            'document_root': settings.STATIC_ROOT,
+            'max_age': settings.MEDIA_CACHE_MAX_AGE,
+            'immutable_names': hashed_static_names,
+            'immutable_max_age': settings.STATIC_CACHE_MAX_AGE,
+        }),
+        re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve, {
+            'document_root': settings.MEDIA_ROOT,
+            'max_age': settings.MEDIA_CACHE_MAX_AGE,
+            'immutable_pattern': settings.MEDIA_IMMUTABLE_PATHS,
+            'immutable_max_age': settings.STATIC_CACHE_MAX_AGE,
+        }),
+    ]
+elif settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL,
                           document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,218 @@
+import threading
+import time
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from backend.singleflight import SingleFlight
+from backend.throttling import STORES, SlidingWindowThrottle
+from backend.tokens import get_token
+
+User = get_user_model()
+
+
+@mock.patch.object(SlidingWindowThrottle, 'timer', return_value=6030.0)
+class AuthThrottlingTests(APITestCase):
+    """Тесты для ограничения частоты входа и регистрации"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.login_url = reverse('login')
+        self.register_url = reverse('register')
+        self.user = User.objects.create_user(username='testuser',
+                                             password='testpass123')
+        for store in STORES.values():
+            store.clear()
+
+    def login(self, username='testuser', password='testpass123',
+              ip='10.0.0.1'):
+        return self.client.post(self.login_url,
+                                {'username': username, 'password': password},
+                                REMOTE_ADDR=ip)
+
+    def test_login_returns_token(self, timer):
+        """Тест успешного входа"""
+
+        response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['username'], 'testuser')
+        self.assertEqual(response.data['token'], get_token(self.user).key)
+
+    def test_login_authenticates_once(self, timer):
+        """Тест однократной проверки пароля при входе"""
+
+        with mock.patch('backend.serializers.authenticate',
+                        return_value=self.user) as authenticate:
+            response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        authenticate.assert_called_once()
+
+    def test_username_limit_across_ips(self, timer):
+        """Тест ограничения попыток входа для одного имени"""
+
+        for number in range(5):
+            response = self.login(password='wrong', ip=f'10.0.0.{number}')
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+
+        response = self.login(ip='10.0.0.99')
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_throttled_before_password_check(self, timer):
+        """Тест отказа без проверки пароля"""
+
+        for _ in range(5):
+            self.login(password='wrong')
+
+        with mock.patch('backend.serializers.authenticate') as authenticate:
+            response = self.login()
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        authenticate.assert_not_called()
+
+    def test_ip_limit_across_usernames(self, timer):
+        """Тест ограничения попыток входа с одного IP"""
+
+        for number in range(20):
+            self.login(username=f'user{number}')
+
+        response = self.login(username='other')
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_forwarded_for_ignored_without_proxies(self, timer):
+        """Тест ограничения по REMOTE_ADDR при подменённом X-Forwarded-For"""
+
+        for number in range(20):
+            self.client.post(self.login_url,
+                             {'username': f'user{number}', 'password': 'x'},
+                             REMOTE_ADDR='10.0.0.1',
+                             HTTP_X_FORWARDED_FOR=f'192.0.2.{number}')
+
+        response = self.client.post(self.login_url,
+                                    {'username': 'other', 'password': 'x'},
+                                    REMOTE_ADDR='10.0.0.1',
+                                    HTTP_X_FORWARDED_FOR='192.0.2.99')
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_client_ip_behind_proxy(self, timer):
+        """Тест IP клиента от доверенного прокси при подмене начала заголовка"""
+
+        rest_framework = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            for number in range(20):
+                self.client.post(
+                    self.login_url,
+                    {'username': f'user{number}', 'password': 'x'},
+                    REMOTE_ADDR='10.0.0.254',
+                    HTTP_X_FORWARDED_FOR=f'192.0.2.{number}, 203.0.113.5')
+            limited = self.client.post(
+                self.login_url, {'username': 'other', 'password': 'x'},
+                REMOTE_ADDR='10.0.0.254',
+                HTTP_X_FORWARDED_FOR='192.0.2.99, 203.0.113.5')
+            other = self.client.post(
+                self.login_url, {'username': 'other', 'password': 'x'},
+                REMOTE_ADDR='10.0.0.254',
+                HTTP_X_FORWARDED_FOR='203.0.113.6')
+
+        self.assertEqual(limited.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(other.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_previous_window_decays(self, timer):
+        """Тест убывания вклада предыдущего окна"""
+
+        for _ in range(5):
+            self.login(password='wrong')
+
+        # Прошло 3/4 следующего окна: предыдущее весит 5 * 0.25
+        timer.return_value = 6105.0
+        for _ in range(3):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.assertEqual(self.login().status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_register_limit_per_ip(self, timer):
+        """Тест ограничения регистраций с одного IP"""
+
+        for number in range(10):
+            response = self.client.post(self.register_url,
+                                        {'username': f'new{number}',
+                                         'password': 'testpass123'},
+                                        REMOTE_ADDR='10.0.0.5')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.post(self.register_url,
+                                    {'username': 'extra',
+                                     'password': 'testpass123'},
+                                    REMOTE_ADDR='10.0.0.5')
+
+        self.assertEqual(response.status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(User.objects.filter(username='extra').exists())
+
+    @override_settings(THROTTLE_STORE='local')
+    def test_local_store(self, timer):
+        """Тест счётчиков в памяти процесса"""
+
+        for _ in range(5):
+            self.login(password='wrong')
+
+        self.assertEqual(self.login().status_code,
+                         status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+class SingleFlightTests(TestCase):
+    """Тесты для объединения одновременных вызовов"""
+
+    def test_concurrent_calls_share_result(self):
+        """Тест одного выполнения для одновременных вызовов"""
+
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'token'
+
+        leader = threading.Thread(
+            target=lambda: results.append(flight.do('user', compute)))
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(
+            target=lambda: results.append(flight.do('user', compute)))
+            for _ in range(3)]
+        for thread in followers:
+            thread.start()
+        time.sleep(0.2)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['token'] * 4)
+
+    def test_get_token_is_stable(self):
+        """Тест повторного получения токена"""
+
+        user = User.objects.create_user(username='testuser',
+                                        password='testpass123')
+
+        self.assertEqual(get_token(user).key, get_token(user).key)
@@ -0,0 +1,125 @@
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from decimal import Decimal
+from backend import bulk
+from backend.models import (Product, Cart, CartItem, Category, Subcategory,
+                            CatalogTombstone, ProductRelation,
+                            ProductTrend)
+from backend.signals import catalog_bulk_changed
+
+User = get_user_model()
+
+
+class BulkProductsTests(TestCase):
+    """Тесты для массовых операций с товарами"""
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.other_category = Category.objects.create(name='Техника')
+        self.other_subcategory = Subcategory.objects.create(
+            category=self.other_category, name='Стиральные машины')
+        self.products = [
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=self.category,
+                                   subcategory=self.subcategory)
+            for number in range(5)
+        ]
+        self.batches = []
+        catalog_bulk_changed.connect(self.on_bulk_changed)
+
+    def tearDown(self):
+        catalog_bulk_changed.disconnect(self.on_bulk_changed)
+
+    def on_bulk_changed(self, sender, action, ids, **kwargs):
+        self.batches.append((action, list(ids)))
+
+    def test_reprice_percent_in_chunks(self):
+        """Тест изменения цены на процент пачками"""
+
+        result = bulk.reprice(Product.objects.all(), percent=Decimal('-10'),
+                              chunk_size=2)
+
+        self.assertEqual(result['count'], 5)
+        self.assertEqual(set(Product.objects.values_list('price', flat=True)),
+                         {Decimal('90.00')})
+        self.assertEqual(len(self.batches), 3)
+
+    def test_reprice_assigns_unique_revisions(self):
+        """Тест уникальных ревизий после пакетного обновления"""
+
+        old_revision = max(product.revision for product in self.products)
+
+        bulk.reprice(Product.objects.all(), amount=Decimal('5'))
+
+        revisions = list(Product.objects.values_list('revision', flat=True))
+        self.assertEqual(len(set(revisions)), 5)
+        self.assertTrue(all(revision > old_revision
+                            for revision in revisions))
+
+    def test_reprice_does_not_go_below_zero(self):
+        """Тест ограничения цены снизу"""
+
+        bulk.reprice(Product.objects.all(), amount=Decimal('-500'))
+
+        self.assertEqual(set(Product.objects.values_list('price', flat=True)),
+                         {Decimal('0.00')})
+
+    def test_dry_run_changes_nothing(self):
+        """Тест пробного запуска"""
+
+        result = bulk.reprice(Product.objects.all(), percent=Decimal('50'),
+                              dry_run=True)
+
+        self.assertEqual(result['count'], 5)
+        self.assertEqual(result['new_price_total'], Decimal('750.00'))
+        self.assertEqual(set(Product.objects.values_list('price', flat=True)),
+                         {Decimal('100.00')})
+        self.assertEqual(self.batches, [])
+
+    def test_move_products(self):
+        """Тест переноса товаров в другую категорию"""
+
+        bulk.move(Product.objects.filter(pk=self.products[0].pk),
+                  self.other_subcategory)
+
+        self.products[0].refresh_from_db()
+        self.assertEqual(self.products[0].category, self.other_category)
+        self.assertEqual(self.products[0].subcategory, self.other_subcategory)
+
+    def test_delete_products_with_cart_items(self):
+        """Тест пакетного удаления товаров из корзин"""
+
+        user = User.objects.create_user(username='testuser',
+                                        password='testpassword')
+        cart = Cart.objects.create(user=user)
+        CartItem.objects.create(cart=cart, product=self.products[0],
+                                quantity=1)
+
+        result = bulk.delete(Product.objects.all(), chunk_size=2)
+
+        self.assertEqual(result['count'], 5)
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(CartItem.objects.exists())
+        self.assertEqual(CatalogTombstone.objects.filter(
+            model='product').count(), 5)
+
+    def test_delete_products_with_relations(self):
+        """Тест пакетного удаления товаров со связями и популярностью"""
+
+        ProductRelation.objects.create(product=self.products[0],
+                                       related=self.products[1], score=2)
+        ProductRelation.objects.create(product=self.products[4],
+                                       related=self.products[0], score=1)
+        ProductTrend.objects.create(product=self.products[1], score=1,
+                                    updated_at=timezone.now())
+
+        result = bulk.delete(Product.objects.filter(
+            pk__in=[self.products[0].pk, self.products[1].pk]))
+
+        self.assertEqual(result['count'], 2)
+        self.assertFalse(ProductRelation.objects.exists())
+        self.assertFalse(ProductTrend.objects.exists())
@@ -1,3 +1,4 @@
+from django.test import override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
@@ -9,6 +10,7 @@ from backend.models import (Product, Cart, CartItem,
 User = get_user_model()
 
 
+@override_settings(TRENDING_FLUSH_INTERVAL=0)
 class CartAddUpdateViewTests(APITestCase):
     """Тесты для добавления/обновления товаров в корзине"""
 
@@ -0,0 +1,85 @@
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from decimal import Decimal
+from backend import taskqueue
+from backend.cleanup import delete_expired_carts
+from backend.models import (Product, Cart, CartItem, Category, Subcategory,
+                            Task)
+
+User = get_user_model()
+
+
+class CartCleanupTests(TestCase):
+    """Тесты для удаления неактивных корзин"""
+
+    def setUp(self):
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.product = Product.objects.create(name='Смартфон1',
+                                              price=Decimal('100.00'),
+                                              category=self.category,
+                                              subcategory=self.subcategory)
+        self.old_carts = [self.create_cart(f'old{number}', days=40)
+                          for number in range(5)]
+        self.fresh_cart = self.create_cart('fresh', days=1)
+
+    def create_cart(self, username, days):
+        user = User.objects.create_user(username=username,
+                                        password='testpass123')
+        cart = Cart.objects.create(user=user)
+        CartItem.objects.create(cart=cart, product=self.product, quantity=1)
+        Cart.objects.filter(pk=cart.pk).update(
+            updated_at=timezone.now() - timedelta(days=days))
+        return cart
+
+    def test_deletes_only_expired_carts(self):
+        """Тест удаления только просроченных корзин с позициями"""
+
+        stats = delete_expired_carts(ttl_days=30, batch_size=2)
+
+        self.assertEqual(stats['carts'], 5)
+        self.assertEqual(stats['items'], 5)
+        self.assertEqual(list(Cart.objects.all()), [self.fresh_cart])
+        self.assertEqual(CartItem.objects.count(), 1)
+
+    def test_deletes_in_batches(self):
+        """Тест удаления пачками с отчётом по каждой"""
+
+        reports = []
+
+        delete_expired_carts(ttl_days=30, batch_size=2,
+                             on_batch=lambda stats: reports.append(
+                                 stats['carts']))
+
+        self.assertEqual(reports, [2, 4, 5])
+
+    def test_command_reports_rows_per_second(self):
+        """Тест вывода команды cleanup_carts"""
+
+        out = StringIO()
+        call_command('cleanup_carts', '--ttl-days', '30', stdout=out)
+
+        self.assertIn('Удалено корзин: 5, позиций: 5', out.getvalue())
+        self.assertIn('строк/с', out.getvalue())
+
+    @override_settings(TASKS_EAGER=False)
+    def test_periodic_task_is_rescheduled(self):
+        """Тест повторной постановки периодической задачи"""
+
+        taskqueue.schedule_periodic_tasks()
+        taskqueue.schedule_periodic_tasks()
+        task = Task.objects.get(name='delete_expired_carts')
+
+        claimed, = taskqueue.claim('worker', 1)
+        self.assertTrue(taskqueue.execute(claimed))
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.STATUS_PENDING)
+        self.assertEqual(task.attempts, 0)
+        self.assertGreater(task.run_after, timezone.now())
+        self.assertEqual(Cart.objects.count(), 1)
@@ -0,0 +1,201 @@
+import asyncio
+import json
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from decimal import Decimal
+from asgiref.sync import sync_to_async
+from backend.events import LocalBroker, RESYNC, get_broker
+from backend.models import Product, Category, Subcategory, Cart
+
+User = get_user_model()
+
+
+def parse_event(chunk):
+    lines = dict(line.split(': ', 1) for line in chunk.strip().splitlines())
+    return lines['event'], json.loads(lines['data'])
+
+
+@override_settings(TRENDING_FLUSH_INTERVAL=0)
+class CartEventsTests(TestCase):
+    """Тесты для потока событий корзины"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser',
+                                             password='testpass123')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('cart-events')
+        category = Category.objects.create(name='Электроника')
+        subcategory = Subcategory.objects.create(category=category,
+                                                 name='Телефон')
+        self.product = Product.objects.create(name='Смартфон',
+                                              price=Decimal('100.00'),
+                                              category=category,
+                                              subcategory=subcategory)
+
+    async def open_stream(self, **kwargs):
+        response = await self.async_client.get(self.url, **kwargs)
+        return response, aiter(response.streaming_content)
+
+    @sync_to_async
+    def request(self, method, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(*args)
+
+    async def next_event(self, stream):
+        chunk = await asyncio.wait_for(anext(stream), 1)
+        return parse_event(chunk.decode())
+
+    async def test_snapshot_and_changes(self):
+        """Тест снимка корзины и событий изменения"""
+
+        response, stream = await self.open_stream(
+            headers={'Authorization': f'Token {self.token.key}'})
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        event = await self.next_event(stream)
+        cart = await Cart.objects.aget(user=self.user)
+        self.assertEqual(event,
+                         ('snapshot', {'id': cart.pk, 'items': [],
+                                       'total_items': 0, 'total_price': 0,
+                                       'prices_changed': False}))
+
+        await self.request('post', reverse('cart-add-update'),
+                           {'product_slug': self.product.slug,
+                            'quantity': 2})
+        event, data = await self.next_event(stream)
+        self.assertEqual(event, 'item')
+        self.assertEqual(data['item']['quantity'], 2)
+        self.assertEqual(data['total_price'], '200.00')
+
+        await self.request('delete',
+                           reverse('cart-remove', args=[self.product.slug]))
+        self.assertEqual(await self.next_event(stream),
+                         ('remove', {'product_slug': self.product.slug,
+                                     'total_items': 0, 'total_price': 0}))
+        await stream.aclose()
+
+    async def stream_token(self):
+        response = await sync_to_async(self.client.post)(
+            reverse('cart-events-token'))
+        self.assertEqual(response.data['expires_in'], 60)
+        return response.data['token']
+
+    async def test_stream_token_in_query(self):
+        """Тест авторизации токеном потока в параметре token"""
+
+        response, stream = await self.open_stream(
+            query_params={'token': await self.stream_token()})
+
+        event, _ = await self.next_event(stream)
+        self.assertEqual(event, 'snapshot')
+        await stream.aclose()
+
+    async def test_api_token_in_query_rejected(self):
+        """Тест отказа для постоянного токена API в URL"""
+
+        response = await self.async_client.get(
+            self.url, query_params={'token': self.token.key})
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_expired_stream_token(self):
+        """Тест отказа для истёкшего токена потока"""
+
+        token = await self.stream_token()
+
+        with override_settings(EVENTS_TOKEN_MAX_AGE=-1):
+            response = await self.async_client.get(
+                self.url, query_params={'token': token})
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_token_requires_auth(self):
+        """Тест выдачи токена потока только авторизованному пользователю"""
+
+        response = APIClient().post(reverse('cart-events-token'))
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_unauthenticated(self):
+        """Тест подключения без токена"""
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_unsubscribe_on_close(self):
+        """Тест отписки при закрытии соединения"""
+
+        _, stream = await self.open_stream(
+            query_params={'token': await self.stream_token()})
+        await self.next_event(stream)
+        waiting = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+
+        # Так ASGI-сервер завершает поток при отключении клиента
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+        self.assertEqual(get_broker()._subscriptions, {})
+
+
+    def test_broker_error_does_not_fail_request(self):
+        """Тест сохранения изменения корзины при ошибке брокера"""
+
+        with mock.patch.object(LocalBroker, 'publish',
+                               side_effect=ConnectionError), \
+                self.assertLogs('backend.events', 'ERROR'), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('cart-add-update'),
+                                        {'product_slug': self.product.slug,
+                                         'quantity': 1})
+
+        self.assertEqual(response.status_code, 201)
+
+
+class LocalBrokerTests(TestCase):
+    """Тесты для публикации событий в процессе"""
+
+    async def test_publish_to_channel(self):
+        """Тест доставки события подписчикам канала"""
+
+        broker = LocalBroker()
+        first = broker.subscribe('cart:1')
+        other = broker.subscribe('cart:2')
+
+        broker.publish('cart:1', {'event': 'clear', 'data': {}})
+
+        self.assertEqual(await first.get(1), {'event': 'clear', 'data': {}})
+        self.assertIsNone(await other.get(0.01))
+
+    async def test_closed_loop_unsubscribed(self):
+        """Тест отписки подключения с закрытым циклом событий"""
+
+        broker = LocalBroker()
+        subscription = broker.subscribe('cart:1')
+        subscription.loop = asyncio.new_event_loop()
+        subscription.loop.close()
+
+        broker.publish('cart:1', {'event': 'clear', 'data': {}})
+
+        self.assertEqual(broker._subscriptions, {})
+
+    async def test_overflow_resync(self):
+        """Тест замены переполненной очереди событием resync"""
+
+        broker = LocalBroker()
+        subscription = broker.subscribe('cart:1')
+
+        subscription.queue = asyncio.Queue(maxsize=2)
+        for number in range(3):
+            broker.publish('cart:1', {'event': 'item', 'data': number})
+        await asyncio.sleep(0)
+
+        self.assertEqual(await subscription.get(1), RESYNC)
+        self.assertIsNone(await subscription.get(0.01))
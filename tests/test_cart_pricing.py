@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from decimal import Decimal
+from backend import bulk
+from backend.models import Product, Cart, CartItem, Category, Subcategory
+from backend.pricing import reprice_cart_items
+
+User = get_user_model()
+
+
+@override_settings(TASKS_EAGER=True, TRENDING_FLUSH_INTERVAL=0)
+class CartPricingTests(APITestCase):
+    """Тесты для снимков цен в корзине"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser',
+                                             password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.product = Product.objects.create(name='Смартфон1',
+                                              price=Decimal('100.00'),
+                                              category=self.category,
+                                              subcategory=self.subcategory)
+        self.other_product = Product.objects.create(
+            name='Смартфон2', price=Decimal('500.00'),
+            category=self.category, subcategory=self.subcategory)
+        self.cart = Cart.objects.create(user=self.user)
+        self.item = CartItem.objects.create(cart=self.cart,
+                                            product=self.product,
+                                            quantity=2)
+
+    def test_item_stores_price_snapshot(self):
+        """Тест сохранения цены продукта при добавлении"""
+
+        self.assertEqual(self.item.price, Decimal('100.00'))
+        self.assertEqual(self.item.total_price, Decimal('200.00'))
+
+    def test_product_price_change_reprices_cart(self):
+        """Тест пересчёта корзины после изменения цены продукта"""
+
+        self.product.price = Decimal('120.00')
+        self.product.save()
+
+        self.item.refresh_from_db()
+        self.cart.refresh_from_db()
+        self.assertEqual(self.item.price, Decimal('120.00'))
+        self.assertTrue(self.cart.prices_changed)
+
+    def test_unchanged_price_does_not_flag_cart(self):
+        """Тест сохранения продукта без изменения цены"""
+
+        self.product.name = 'Смартфон1 Про'
+        self.product.save()
+
+        self.cart.refresh_from_db()
+        self.assertFalse(self.cart.prices_changed)
+
+    def test_bulk_reprice_updates_carts(self):
+        """Тест пересчёта корзин после массовой переоценки"""
+
+        bulk.reprice(Product.objects.all(), percent=Decimal('10'))
+
+        self.item.refresh_from_db()
+        self.cart.refresh_from_db()
+        self.assertEqual(self.item.price, Decimal('110.00'))
+        self.assertTrue(self.cart.prices_changed)
+
+    def test_reprice_only_touches_given_products(self):
+        """Тест пересчёта только переданных продуктов"""
+
+        Product.objects.filter(pk=self.product.pk) \
+            .update(price=Decimal('150.00'))
+
+        self.assertEqual(reprice_cart_items([self.other_product.pk]), 0)
+        self.assertEqual(reprice_cart_items([self.product.pk]), 1)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.price, Decimal('150.00'))
+
+    def test_cart_detail_uses_snapshot(self):
+        """Тест отображения цены из снимка в корзине"""
+
+        Product.objects.filter(pk=self.product.pk) \
+            .update(price=Decimal('150.00'))
+
+        response = self.client.get(reverse('cart-detail'))
+
+        self.assertEqual(response.data['items'][0]['product_price'],
+                         '100.00')
+        self.assertEqual(response.data['total_price'], Decimal('200.00'))
+        self.assertFalse(response.data['prices_changed'])
+
+    def test_add_to_cart_refreshes_snapshot_and_flag(self):
+        """Тест обновления цены и сброса флага при добавлении товара"""
+
+        Product.objects.filter(pk=self.product.pk) \
+            .update(price=Decimal('150.00'))
+        Cart.objects.filter(pk=self.cart.pk).update(prices_changed=True)
+
+        response = self.client.post(reverse('cart-add-update'),
+                                    {'product_slug': self.product.slug,
+                                     'quantity': 1})
+
+        self.assertEqual(response.data['cart']['items'][0]['product_price'],
+                         '150.00')
+        self.assertFalse(response.data['cart']['prices_changed'])
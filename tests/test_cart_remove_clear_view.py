@@ -0,0 +1,123 @@
+from datetime import timedelta
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from backend.models import (Product, Cart, CartItem,
+                            Category, Subcategory)
+
+User = get_user_model()
+
+
+class CartRemoveClearViewTests(APITestCase):
+    """Тесты для удаления товара и очистки корзины"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser',
+                                             password='testpassword')
+        self.client.force_authenticate(user=self.user)
+
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.product1 = Product.objects.create(name='Смартфон1',
+                                               price=Decimal('100.00'),
+                                               category=self.category,
+                                               subcategory=self.subcategory)
+        self.product2 = Product.objects.create(name='Смартфон2',
+                                               price=Decimal('500.00'),
+                                               category=self.category,
+                                               subcategory=self.subcategory)
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.create(cart=self.cart, product=self.product1,
+                                quantity=2)
+        CartItem.objects.create(cart=self.cart, product=self.product2,
+                                quantity=1)
+        self.old_updated_at = timezone.now() - timedelta(days=1)
+        Cart.objects.filter(pk=self.cart.pk) \
+            .update(updated_at=self.old_updated_at)
+
+    def remove_url(self, product):
+        return reverse('cart-remove', args=[product.slug])
+
+    def test_remove_item(self):
+        """Тест удаления товара из корзины"""
+
+        response = self.client.delete(self.remove_url(self.product1))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['cart']['items']), 1)
+        self.assertEqual(response.data['cart']['total_price'],
+                         Decimal('500.00'))
+        self.cart.refresh_from_db()
+        self.assertGreater(self.cart.updated_at, self.old_updated_at)
+
+    def test_remove_missing_item(self):
+        """Тест удаления товара, которого нет в корзине"""
+
+        CartItem.objects.filter(product=self.product1).delete()
+
+        response = self.client.delete(self.remove_url(self.product1))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_remove_without_cart(self):
+        """Тест удаления товара без корзины"""
+
+        self.cart.delete()
+
+        response = self.client.delete(self.remove_url(self.product1))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_remove_does_not_touch_other_carts(self):
+        """Тест удаления только из своей корзины"""
+
+        other = User.objects.create_user(username='other',
+                                         password='testpassword')
+        other_cart = Cart.objects.create(user=other)
+        CartItem.objects.create(cart=other_cart, product=self.product1)
+
+        self.client.delete(self.remove_url(self.product1))
+
+        self.assertTrue(CartItem.objects.filter(cart=other_cart).exists())
+
+    def test_clear_cart(self):
+        """Тест очистки корзины"""
+
+        response = self.client.delete(reverse('cart-clear'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(CartItem.objects.filter(cart=self.cart).exists())
+        self.cart.refresh_from_db()
+        self.assertGreater(self.cart.updated_at, self.old_updated_at)
+
+    def test_clear_cart_without_existence_checks(self):
+        """Тест очистки корзины без предварительных проверок"""
+
+        # PostgreSQL: один DELETE ... RETURNING, иначе DELETE и UPDATE
+        expected = 1 if connection.vendor == 'postgresql' else 2
+        with self.assertNumQueries(expected):
+            self.client.delete(reverse('cart-clear'))
+
+    def test_clear_empty_cart(self):
+        """Тест очистки пустой корзины"""
+
+        CartItem.objects.all().delete()
+
+        response = self.client.delete(reverse('cart-clear'))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_clear_without_cart(self):
+        """Тест очистки несуществующей корзины"""
+
+        self.cart.delete()
+
+        response = self.client.delete(reverse('cart-clear'))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
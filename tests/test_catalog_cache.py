@@ -0,0 +1,116 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory
+from backend.response_cache import CatalogResponseCache
+
+User = get_user_model()
+
+
+@override_settings(CATALOG_SNAPSHOT=False)
+class CatalogCacheViewTests(APITestCase):
+    """Тесты для кэша списков каталога"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('product-list')
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.product = Product.objects.create(name='Смартфон1',
+                                              price=Decimal('100.00'),
+                                              category=self.category,
+                                              subcategory=self.subcategory)
+
+    def test_repeated_request_served_from_cache(self):
+        """Тест ответа из кэша без запросов товаров"""
+
+        self.client.get(self.url)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+
+    def test_query_string_is_normalized(self):
+        """Тест одного ключа для одинаковых параметров"""
+
+        self.client.get(self.url + '?page=1&search=')
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url + '?page=1')
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'shop.example'])
+    def test_cache_separated_by_host_and_scheme(self):
+        """Тест отдельных записей кэша для разных хостов и схем"""
+
+        for number in range(2, 12):
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=self.category,
+                                   subcategory=self.subcategory)
+
+        other = self.client.get(self.url, HTTP_HOST='shop.example',
+                                secure=True)
+        response = self.client.get(self.url)
+
+        self.assertTrue(other.data['next'].startswith('https://shop.example/'))
+        self.assertTrue(response.data['next'].startswith('http://testserver/'))
+
+    def test_catalog_change_invalidates_cache(self):
+        """Тест обновления кэша после изменения каталога"""
+
+        self.client.get(self.url)
+        self.product.price = Decimal('150.00')
+        self.product.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['results'][0]['price'], '150.00')
+
+    def test_authenticated_user_bypasses_cache(self):
+        """Тест отсутствия кэша для авторизованного пользователя"""
+
+        user = User.objects.create_user(username='testuser',
+                                        password='testpass123')
+        self.client.force_authenticate(user=user)
+        self.client.get(self.url)
+        Product.objects.filter(pk=self.product.pk) \
+            .update(price=Decimal('150.00'))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['results'][0]['price'], '150.00')
+
+
+class CatalogResponseCacheTests(TestCase):
+    """Тесты для пересчёта устаревших записей кэша"""
+
+    def setUp(self):
+        cache.clear()
+        self.cache = CatalogResponseCache()
+
+    def test_stale_entry_served_while_locked(self):
+        """Тест выдачи устаревших данных во время пересчёта"""
+
+        self.cache.get('key', lambda: 'old')
+        compute = mock.Mock(return_value='new')
+
+        with mock.patch('backend.response_cache.CatalogRevision.current',
+                        return_value=100):
+            cache.add('key:lock', 1)
+            self.assertEqual(self.cache.get('key', compute), 'old')
+            compute.assert_not_called()
+
+            cache.delete('key:lock')
+            self.assertEqual(self.cache.get('key', compute), 'new')
+            self.assertEqual(self.cache.get('key', compute), 'new')
+
+        compute.assert_called_once()
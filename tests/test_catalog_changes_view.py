@@ -0,0 +1,140 @@
+import tempfile
+from pathlib import Path
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from PIL import Image
+from backend.models import Product, Category, Subcategory
+
+
+class CatalogChangesViewTests(APITestCase):
+    """Тесты для дельта-синхронизации каталога"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('catalog-changes')
+
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.product1 = Product.objects.create(name='Смартфон1',
+                                               price=Decimal('100.00'),
+                                               category=self.category,
+                                               subcategory=self.subcategory)
+        self.product2 = Product.objects.create(name='Смартфон2',
+                                               price=Decimal('500.00'),
+                                               category=self.category,
+                                               subcategory=self.subcategory)
+
+    def test_initial_sync_returns_all_records(self):
+        """Тест первой синхронизации с since=0"""
+
+        response = self.client.get(self.url, {'since': 0})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['categories']), 1)
+        self.assertEqual(len(response.data['subcategories']), 1)
+        self.assertEqual(len(response.data['products']), 2)
+        self.assertEqual(response.data['deleted'], [])
+        self.assertFalse(response.data['has_more'])
+        self.assertEqual(response.data['revision'], self.product2.revision)
+
+    def test_returns_only_changes_since_revision(self):
+        """Тест получения только изменённых записей"""
+
+        since = self.client.get(self.url).data['revision']
+        self.product1.price = Decimal('150.00')
+        self.product1.save()
+
+        response = self.client.get(self.url, {'since': since})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['categories'], [])
+        self.assertEqual(len(response.data['products']), 1)
+        self.assertEqual(response.data['products'][0]['slug'],
+                         self.product1.slug)
+        self.assertGreater(response.data['revision'], since)
+
+    def test_deleted_records_returned_as_tombstones(self):
+        """Тест возврата удалённых записей"""
+
+        since = self.client.get(self.url).data['revision']
+        product_id = self.product2.pk
+        self.product2.delete()
+
+        response = self.client.get(self.url, {'since': since})
+
+        self.assertEqual(response.data['products'], [])
+        self.assertEqual(response.data['deleted'][0]['model'], 'product')
+        self.assertEqual(response.data['deleted'][0]['id'], product_id)
+
+    def test_cascade_delete_creates_tombstones(self):
+        """Тест удаления категории вместе с вложенными объектами"""
+
+        since = self.client.get(self.url).data['revision']
+        self.category.delete()
+
+        response = self.client.get(self.url, {'since': since})
+
+        deleted_models = sorted(item['model']
+                                for item in response.data['deleted'])
+        self.assertEqual(deleted_models,
+                         ['category', 'product', 'product', 'subcategory'])
+
+    @override_settings(CATALOG_CHANGES_LIMIT=2)
+    def test_changes_are_paginated_by_revision(self):
+        """Тест постраничной выдачи изменений"""
+
+        first = self.client.get(self.url, {'since': 0})
+        self.assertTrue(first.data['has_more'])
+        self.assertEqual(len(first.data['categories']), 1)
+        self.assertEqual(len(first.data['subcategories']), 1)
+        self.assertEqual(first.data['products'], [])
+
+        second = self.client.get(self.url,
+                                 {'since': first.data['revision']})
+        self.assertFalse(second.data['has_more'])
+        self.assertEqual(len(second.data['products']), 2)
+
+    def test_invalid_since(self):
+        """Тест некорректного значения since"""
+
+        response = self.client.get(self.url, {'since': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class CatalogChangesFixturesTests(APITestCase):
+    """Тесты для синхронизации каталога, загруженного из фикстур"""
+
+    fixtures = ['category.json', 'subcategory.json', 'products.json']
+
+    def setUp(self):
+        # Изображения фикстур в репозитории не хранятся
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.settings_override = override_settings(MEDIA_ROOT=media.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        for model in (Category, Subcategory, Product):
+            for obj in model.objects.exclude(image=''):
+                path = Path(media.name) / obj.image.name
+                path.parent.mkdir(parents=True, exist_ok=True)
+                Image.new('RGB', (10, 10)).save(path)
+
+    def test_initial_sync_after_loaddata(self):
+        """Тест первой синхронизации с since=0 после loaddata"""
+
+        response = self.client.get(reverse('catalog-changes'),
+                                   {'since': 0, 'limit': 1000})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['categories']),
+                         Category.objects.count())
+        self.assertEqual(len(response.data['subcategories']),
+                         Subcategory.objects.count())
+        self.assertEqual(len(response.data['products']),
+                         Product.objects.count())
+        self.assertGreater(Product.objects.count(), 0)
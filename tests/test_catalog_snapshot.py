@@ -0,0 +1,219 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from imagekit.cachefiles import ImageCacheFile
+from backend.models import Product, Category, Subcategory, CartItem
+from backend.serializers import ProductSerializer
+from backend.snapshot import catalog_snapshot
+
+User = get_user_model()
+
+
+@override_settings(CATALOG_SNAPSHOT=True, CATALOG_SNAPSHOT_CHECK_INTERVAL=0,
+                   CATALOG_CACHE_TIMEOUT=0, TRENDING_FLUSH_INTERVAL=0)
+class CatalogSnapshotTests(APITestCase):
+    """Тесты для снимка каталога в памяти"""
+
+    def setUp(self):
+        cache.clear()
+        catalog_snapshot.clear()
+        self.client = APIClient()
+        self.electronics = Category.objects.create(name='Электроника')
+        self.phones = Subcategory.objects.create(category=self.electronics,
+                                                 name='Телефон')
+        self.appliances = Category.objects.create(name='Техника')
+        self.washers = Subcategory.objects.create(category=self.appliances,
+                                                  name='Стиральные машины')
+        for name, price, subcategory in (
+                ('Смартфон2', '1500.00', self.phones),
+                ('Смартфон1', '100.00', self.phones),
+                ('Стиралка1', '900.00', self.washers)):
+            Product.objects.create(name=name, price=Decimal(price),
+                                   category=subcategory.category,
+                                   subcategory=subcategory)
+
+    def get(self, name, params=None):
+        return self.client.get(reverse(name), params or {})
+
+    def test_products_match_orm(self):
+        """Тест совпадения списка товаров со списком из БД"""
+
+        params = {'category': self.electronics.slug, 'max_price': '1000'}
+        response = self.get('product-list', params)
+
+        with self.settings(CATALOG_SNAPSHOT=False):
+            cache.clear()
+            expected = self.get('product-list', params)
+        self.assertEqual(response.data, expected.data)
+        self.assertEqual([item['name'] for item in response.data['results']],
+                         ['Смартфон1'])
+
+    def test_categories_match_orm(self):
+        """Тест совпадения списка категорий со списком из БД"""
+
+        response = self.get('category-list', {'fields': 'name,subcategories'})
+
+        with self.settings(CATALOG_SNAPSHOT=False):
+            cache.clear()
+            expected = self.get('category-list',
+                                {'fields': 'name,subcategories'})
+        self.assertEqual(response.data, expected.data)
+
+    @override_settings(ALLOWED_HOSTS=['testserver', 'shop.example'])
+    def test_category_image_urls_for_request_host(self):
+        """Тест абсолютных URL изображений для хоста каждого запроса"""
+
+        Category.objects.filter(pk=self.electronics.pk) \
+            .update(image='categories/electronics.png')
+        Subcategory.objects.filter(pk=self.phones.pk) \
+            .update(image='subcategories/phones.png')
+        self.get('category-list')
+
+        response = self.client.get(reverse('category-list'),
+                                   HTTP_HOST='shop.example', secure=True)
+        with self.settings(CATALOG_SNAPSHOT=False):
+            cache.clear()
+            expected = self.client.get(reverse('category-list'),
+                                       HTTP_HOST='shop.example', secure=True)
+
+        self.assertEqual(response.data, expected.data)
+        electronics = next(item for item in response.data['results']
+                           if item['id'] == self.electronics.pk)
+        self.assertEqual(electronics['image'],
+                         'https://shop.example/media/categories/electronics.png')
+        self.assertEqual(electronics['subcategories'][0]['image'],
+                         'https://shop.example/media/subcategories/phones.png')
+
+    def test_served_with_single_revision_query(self):
+        """Тест ответа из памяти: только проверка ревизии каталога"""
+
+        self.get('product-list')
+
+        with self.assertNumQueries(1):
+            response = self.get('product-list', {'fields': 'name,price'})
+        self.assertEqual(response.data['results'][0],
+                         {'name': 'Смартфон1', 'price': '100.00'})
+
+    def test_missing_image_file(self):
+        """Тест снимка с отсутствующим файлом изображения без создания копий"""
+
+        Product.objects.filter(name='Смартфон1') \
+            .update(image='products/aa/missing.png')
+
+        with mock.patch.object(ImageCacheFile, 'generate') as generate:
+            categories = self.get('category-list')
+            products = self.get('product-list', {'fields': 'name,images'})
+
+        generate.assert_not_called()
+        self.assertEqual(categories.status_code, status.HTTP_200_OK)
+        self.assertEqual(products.status_code, status.HTTP_200_OK)
+        images = products.data['results'][0]['images']
+        self.assertEqual(len(images), 3)
+        self.assertTrue(images[0].startswith(
+            '/media/CACHE/images/products/aa/missing/'))
+
+    def test_failed_record_skipped(self):
+        """Тест снимка без товара, который не удалось сериализовать"""
+
+        get_images = ProductSerializer.get_images
+
+        def failing_images(serializer, obj):
+            if obj.name == 'Смартфон2':
+                raise OSError('broken image')
+            return get_images(serializer, obj)
+
+        with mock.patch.object(ProductSerializer, 'get_images',
+                               failing_images), \
+                self.assertLogs('backend.snapshot', 'ERROR'):
+            response = self.get('product-list')
+
+        self.assertEqual([item['name'] for item in response.data['results']],
+                         ['Смартфон1', 'Стиралка1'])
+
+    def test_failed_rebuild_keeps_previous_snapshot(self):
+        """Тест прежнего снимка при ошибке пересборки"""
+
+        self.get('product-list')
+        Product.objects.get(name='Смартфон1').save()
+
+        with mock.patch('backend.snapshot.build_snapshot',
+                        side_effect=RuntimeError), \
+                self.assertLogs('backend.snapshot', 'ERROR'):
+            response = self.get('product-list', {'fields': 'name'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+
+    def test_orm_fallback_without_snapshot(self):
+        """Тест списка из БД, если снимок не собран"""
+
+        with mock.patch('backend.snapshot.build_snapshot',
+                        side_effect=RuntimeError), \
+                self.assertLogs('backend.snapshot', 'ERROR') as logs:
+            first = self.get('product-list')
+            second = self.get('product-list')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(first.data['count'], 3)
+        self.assertEqual(len(logs.records), 2)
+
+    @override_settings(CATALOG_CACHE_TIMEOUT=60)
+    def test_anonymous_cache_in_front_of_snapshot(self):
+        """Тест ответа анонимному пользователю из кэша без обращения к снимку"""
+
+        self.get('product-list')
+
+        with mock.patch.object(catalog_snapshot, 'get') as get:
+            response = self.get('product-list')
+
+        get.assert_not_called()
+        self.assertEqual(response.data['count'], 3)
+
+    def test_rebuilt_after_catalog_change(self):
+        """Тест пересборки снимка после изменения каталога"""
+
+        self.get('product-list')
+        product = Product.objects.get(name='Смартфон1')
+        product.price = Decimal('50.00')
+        product.save()
+
+        response = self.get('product-list', {'subcategory': self.phones.slug})
+
+        self.assertEqual(response.data['results'][0]['price'], '50.00')
+
+    def test_invalid_filter(self):
+        """Тест некорректного фильтра"""
+
+        response = self.get('product-list', {'min_price': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(CATALOG_SNAPSHOT_CHECK_INTERVAL=60)
+    def test_cart_add_ignores_stale_snapshot(self):
+        """Тест добавления в корзину с ценой и товаром из БД, а не из снимка"""
+
+        user = User.objects.create_user(username='testuser',
+                                        password='testpass123')
+        self.client.force_authenticate(user=user)
+        product = Product.objects.get(name='Смартфон2')
+        deleted_product = Product.objects.get(name='Смартфон1')
+        catalog_snapshot.get()
+        Product.objects.filter(pk=product.pk).update(price=Decimal('1400.00'))
+        deleted_product.delete()
+
+        response = self.client.post(reverse('cart-add-update'),
+                                    {'product_slug': product.slug,
+                                     'quantity': 2})
+        deleted = self.client.post(reverse('cart-add-update'),
+                                   {'product_slug': deleted_product.slug,
+                                    'quantity': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(CartItem.objects.get().price, Decimal('1400.00'))
+        self.assertEqual(deleted.status_code, status.HTTP_400_BAD_REQUEST)
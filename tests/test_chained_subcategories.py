@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.urls import reverse
+from django.test import TestCase
+from rest_framework import status
+from backend.models import Category, Subcategory
+
+
+class ChainedSubcategoriesViewTests(TestCase):
+    """Тесты для списков подкатегорий в форме товара"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Электроника')
+        self.other_category = Category.objects.create(name='Техника')
+        self.phone = Subcategory.objects.create(category=self.category,
+                                                name='Телефон')
+        self.laptop = Subcategory.objects.create(category=self.category,
+                                                 name='Ноутбук')
+        self.url = reverse('chained-subcategories',
+                           args=[self.category.pk])
+
+    def test_returns_sorted_subcategories(self):
+        """Тест списка подкатегорий в формате smart_selects"""
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [
+            {'value': self.laptop.pk, 'display': 'Ноутбук'},
+            {'value': self.phone.pk, 'display': 'Телефон'},
+        ])
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_cached_between_requests(self):
+        """Тест повторного запроса без обращения к БД"""
+
+        self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.json()), 2)
+
+    def test_not_modified_with_etag(self):
+        """Тест ответа 304 при совпадении ETag"""
+
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalidated_on_subcategory_move(self):
+        """Тест сброса кэша при переносе подкатегории"""
+
+        self.client.get(self.url)
+        other_url = reverse('chained-subcategories',
+                            args=[self.other_category.pk])
+        self.assertEqual(self.client.get(other_url).json(), [])
+
+        self.phone.category = self.other_category
+        self.phone.save()
+
+        self.assertEqual(len(self.client.get(self.url).json()), 1)
+        self.assertEqual(len(self.client.get(other_url).json()), 1)
+
+    def test_invalidated_on_subcategory_delete(self):
+        """Тест сброса кэша при удалении подкатегории"""
+
+        self.client.get(self.url)
+
+        self.laptop.delete()
+
+        self.assertEqual(len(self.client.get(self.url).json()), 1)
@@ -0,0 +1,203 @@
+import io
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend import bulk
+from backend.models import (Product, Category, Subcategory, Cart, CartItem,
+                            Order, OrderLine, StockShard)
+from backend.orders import OutOfStock, get_stock, reserve_stock, set_stock
+
+User = get_user_model()
+
+
+class CheckoutViewTests(APITestCase):
+    """Тесты для оформления заказа"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser',
+                                             password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('order-checkout')
+
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.phone = Product.objects.create(name='Смартфон',
+                                            price=Decimal('100.00'),
+                                            category=self.category,
+                                            subcategory=self.subcategory)
+        self.case = Product.objects.create(name='Чехол',
+                                           price=Decimal('10.00'),
+                                           category=self.category,
+                                           subcategory=self.subcategory)
+        set_stock(self.phone, 5)
+        set_stock(self.case, 1)
+        self.cart = Cart.objects.create(user=self.user)
+
+    def test_checkout(self):
+        """Тест оформления заказа из корзины"""
+
+        CartItem.objects.create(cart=self.cart, product=self.phone,
+                                quantity=3)
+        CartItem.objects.create(cart=self.cart, product=self.case,
+                                quantity=1)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total_price'], '310.00')
+        self.assertEqual([line['product_slug']
+                          for line in response.data['lines']],
+                         [self.phone.slug, self.case.slug])
+        self.assertEqual(get_stock([self.phone.pk, self.case.pk]),
+                         {self.phone.pk: 2, self.case.pk: 0})
+        self.assertFalse(self.cart.cart_items.exists())
+
+    def test_checkout_rejected_after_price_change(self):
+        """Тест отказа в оформлении при изменившихся ценах"""
+
+        CartItem.objects.create(cart=self.cart, product=self.phone,
+                                quantity=1)
+        Cart.objects.filter(pk=self.cart.pk).update(prices_changed=True)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['cart']['total_price'],
+                         Decimal('100.00'))
+        self.assertFalse(response.data['cart']['prices_changed'])
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(get_stock([self.phone.pk])[self.phone.pk], 5)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total_price'], '100.00')
+
+    def test_checkout_rejected_before_reprice_task(self):
+        """Тест отказа при смене цены до пересчёта корзин задачей"""
+
+        CartItem.objects.create(cart=self.cart, product=self.phone,
+                                quantity=2)
+        Product.objects.filter(pk=self.phone.pk).update(
+            price=Decimal('120.00'))
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['cart']['total_price'],
+                         Decimal('240.00'))
+        self.assertFalse(Order.objects.exists())
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(OrderLine.objects.get().price, Decimal('120.00'))
+
+    def test_out_of_stock_rolls_back(self):
+        """Тест отказа без частичного списания при нехватке остатка"""
+
+        CartItem.objects.create(cart=self.cart, product=self.phone,
+                                quantity=1)
+        CartItem.objects.create(cart=self.cart, product=self.case,
+                                quantity=2)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['product_slug'], self.case.slug)
+        self.assertEqual(response.data['available'], 1)
+        self.assertEqual(get_stock([self.phone.pk])[self.phone.pk], 5)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.cart.cart_items.count(), 2)
+
+    def test_empty_cart(self):
+        """Тест оформления пустой корзины"""
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unauthenticated(self):
+        """Тест оформления без авторизации"""
+
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_delete_keeps_order_lines(self):
+        """Тест сохранения позиций заказа при удалении товара"""
+
+        CartItem.objects.create(cart=self.cart, product=self.phone,
+                                quantity=1)
+        self.client.post(self.url)
+
+        bulk.delete(Product.objects.filter(pk=self.phone.pk))
+
+        line = OrderLine.objects.get()
+        self.assertIsNone(line.product_id)
+        self.assertEqual(line.product_name, 'Смартфон')
+        self.assertFalse(StockShard.objects.filter(
+            product_id=self.phone.pk).exists())
+
+
+class StockTests(TestCase):
+    """Тесты для остатков товаров по частям"""
+
+    def setUp(self):
+        category = Category.objects.create(name='Электроника')
+        subcategory = Subcategory.objects.create(category=category,
+                                                 name='Телефон')
+        self.product = Product.objects.create(name='Смартфон',
+                                              category=category,
+                                              subcategory=subcategory)
+
+    def test_set_stock_distributes(self):
+        """Тест распределения остатка по частям"""
+
+        set_stock(self.product, 10, shards=4)
+
+        self.assertEqual(list(StockShard.objects.order_by('shard')
+                              .values_list('quantity', flat=True)),
+                         [3, 3, 2, 2])
+
+    def test_reserve_across_shards(self):
+        """Тест списания с нескольких частей"""
+
+        set_stock(self.product, 10, shards=4)
+
+        reserve_stock({self.product.pk: 7})
+
+        self.assertEqual(get_stock([self.product.pk])[self.product.pk], 3)
+
+    def test_reserve_more_than_stock(self):
+        """Тест отказа при нехватке остатка"""
+
+        set_stock(self.product, 2, shards=2)
+
+        with self.assertRaises(OutOfStock):
+            reserve_stock({self.product.pk: 3})
+        self.assertEqual(get_stock([self.product.pk])[self.product.pk], 2)
+
+    def test_set_stock_command_missing_only(self):
+        """Тест заполнения остатков товаров без частей командой"""
+
+        stocked = Product.objects.create(name='Ноутбук',
+                                         category=self.product.category,
+                                         subcategory=self.product.subcategory)
+        set_stock(stocked, 1, shards=1)
+
+        call_command('set_stock', 10, '--missing', '--shards', '2',
+                     stdout=io.StringIO())
+
+        self.assertEqual(get_stock([self.product.pk, stocked.pk]),
+                         {self.product.pk: 10, stocked.pk: 1})
+        self.assertEqual(StockShard.objects.filter(
+            product=self.product).count(), 2)
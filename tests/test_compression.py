@@ -0,0 +1,143 @@
+import gzip
+import tempfile
+from pathlib import Path
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory
+from backend.static import serve
+
+
+@override_settings(CATALOG_SNAPSHOT=False)
+class CompressionMiddlewareTests(TestCase):
+    """Тесты для сжатия ответов API"""
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('product-list')
+        category = Category.objects.create(name='Электроника')
+        subcategory = Subcategory.objects.create(category=category,
+                                                 name='Телефон')
+        for number in range(10):
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=category,
+                                   subcategory=subcategory)
+
+    def test_large_response_compressed(self):
+        """Тест сжатия ответа больше порога"""
+
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 6)
+    def test_small_response_not_compressed(self):
+        """Тест ответа меньше порога"""
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_encoding_refused_by_client(self):
+        """Тест отказа клиента от сжатия"""
+
+        response = self.client.get(self.url,
+                                   HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class ServeFileTests(TestCase):
+    """Тесты для раздачи файлов в продакшн-режиме"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        (self.root / 'app.js').write_bytes(b'console.log(1);' * 100)
+        (self.root / 'app.js.gz').write_bytes(
+            gzip.compress((self.root / 'app.js').read_bytes()))
+        (self.root / 'image.png').write_bytes(bytes(range(256)))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get(self, path, **headers):
+        request = self.client.get('/', **headers).wsgi_request
+        return serve(request, path, self.root, max_age=60, immutable=True)
+
+    def test_precompressed_variant(self):
+        """Тест отдачи заранее сжатого файла"""
+
+        response = self.get('app.js', HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)),
+                         (self.root / 'app.js').read_bytes())
+
+    def test_range_request(self):
+        """Тест запроса части файла"""
+
+        response = self.get('image.png', HTTP_RANGE='bytes=10-19')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], 'bytes 10-19/256')
+        self.assertEqual(b''.join(response.streaming_content),
+                         bytes(range(10, 20)))
+
+    def test_unsatisfiable_range(self):
+        """Тест диапазона за пределами файла"""
+
+        response = self.get('image.png', HTTP_RANGE='bytes=500-')
+
+        self.assertEqual(response.status_code, 416)
+
+    def test_not_modified(self):
+        """Тест ответа 304 по ETag"""
+
+        etag = self.get('image.png')['ETag']
+
+        response = self.get('image.png', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_immutable_pattern(self):
+        """Тест долгого кэширования файлов с именем по хэшу"""
+
+        request = self.client.get('/').wsgi_request
+        regular = serve(request, 'image.png', self.root, max_age=60,
+                        immutable_pattern=r'^[0-9a-f]{64}\.png$')
+        (self.root / ('a' * 64 + '.png')).write_bytes(b'png')
+        hashed = serve(request, 'a' * 64 + '.png', self.root, max_age=60,
+                       immutable_pattern=r'^[0-9a-f]{64}\.png$',
+                       immutable_max_age=3600)
+
+        self.assertNotIn('immutable', regular['Cache-Control'])
+        self.assertIn('immutable', hashed['Cache-Control'])
+        self.assertIn('max-age=3600', hashed['Cache-Control'])
+
+    def test_immutable_names(self):
+        """Тест долгого кэширования только хэшированных статических файлов"""
+
+        request = self.client.get('/').wsgi_request
+        (self.root / 'app.0123456789ab.js').write_bytes(b'console.log(1);')
+
+        def names():
+            return {'app.0123456789ab.js'}
+
+        original = serve(request, 'app.js', self.root, max_age=60,
+                         immutable_names=names, immutable_max_age=3600)
+        hashed = serve(request, 'app.0123456789ab.js', self.root, max_age=60,
+                       immutable_names=names, immutable_max_age=3600)
+
+        self.assertNotIn('immutable', original['Cache-Control'])
+        self.assertIn('max-age=60', original['Cache-Control'])
+        self.assertIn('immutable', hashed['Cache-Control'])
+        self.assertIn('max-age=3600', hashed['Cache-Control'])
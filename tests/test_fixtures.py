@@ -0,0 +1,24 @@
+from decimal import Decimal
+from django.core.management import call_command
+from django.test import TestCase
+from backend.models import Product, CartItem
+
+# Порядок загрузки из README
+FIXTURES = ['category.json', 'subcategory.json', 'users.json',
+            'products.json', 'carts.json', 'cart_items.json']
+
+
+class FixturesTests(TestCase):
+    """Тесты для поставляемых фикстур"""
+
+    def test_load_all_fixtures(self):
+        """Тест загрузки всех фикстур по очереди"""
+
+        for fixture in FIXTURES:
+            call_command('loaddata', fixture, verbosity=0)
+
+        self.assertEqual(CartItem.objects.count(), 2)
+        for item in CartItem.objects.select_related('product'):
+            self.assertEqual(item.price, item.product.price)
+        self.assertEqual(Product.objects.get(pk=2).price,
+                         Decimal('100000.00'))
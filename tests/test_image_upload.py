@@ -0,0 +1,88 @@
+import io
+import tempfile
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from decimal import Decimal
+from PIL import Image
+from backend.models import Product, Category, Subcategory
+from backend.validators import validate_image_dimensions
+
+
+def make_image(size, image_format='PNG', name='image.png'):
+    buffer = io.BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, format=image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+class ImageDimensionsValidatorTests(TestCase):
+    """Тесты для проверки изображения по заголовку"""
+
+    def test_valid_image(self):
+        """Тест допустимого изображения"""
+
+        image = make_image((200, 100))
+
+        validate_image_dimensions(image)
+        self.assertEqual(image.tell(), 0)
+
+    @override_settings(IMAGE_MAX_MEGAPIXELS=0.01)
+    def test_too_many_pixels(self):
+        """Тест изображения с превышением бюджета пикселей"""
+
+        with self.assertRaisesMessage(ValidationError, 'Мп'):
+            validate_image_dimensions(make_image((200, 100)))
+
+    def test_unsupported_format(self):
+        """Тест неподдерживаемого формата"""
+
+        with self.assertRaisesMessage(ValidationError, 'BMP'):
+            validate_image_dimensions(make_image((10, 10), 'BMP', 'a.bmp'))
+
+    def test_not_an_image(self):
+        """Тест файла, не являющегося изображением"""
+
+        with self.assertRaises(ValidationError):
+            validate_image_dimensions(SimpleUploadedFile('a.png', b'text'))
+
+
+@override_settings(IMAGE_MASTER_MAX_SIDE=100)
+class MasterDownscaleTests(TestCase):
+    """Тесты для уменьшения исходного изображения при загрузке"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def create_product(self, image):
+        return Product.objects.create(name='Смартфон',
+                                      price=Decimal('100.00'),
+                                      category=self.category,
+                                      subcategory=self.subcategory,
+                                      image=image)
+
+    def test_large_image_downscaled(self):
+        """Тест уменьшения большого изображения"""
+
+        product = self.create_product(
+            make_image((400, 300), 'JPEG', 'phone.jpg'))
+
+        with Image.open(product.image.path) as img:
+            self.assertEqual(img.size, (100, 75))
+            self.assertEqual(img.format, 'JPEG')
+
+    def test_small_image_kept(self):
+        """Тест сохранения небольшого изображения без изменений"""
+
+        product = self.create_product(make_image((80, 60)))
+
+        with Image.open(product.image.path) as img:
+            self.assertEqual(img.size, (80, 60))
@@ -0,0 +1,106 @@
+import io
+import os
+import tempfile
+import time
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from decimal import Decimal
+from PIL import Image
+from backend.models import Product, Category, Subcategory
+
+
+def make_image(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (50, 50), color).save(buffer, format='PNG')
+    return SimpleUploadedFile('supplier photo.PNG', buffer.getvalue())
+
+
+class ContentAddressedStorageTests(TestCase):
+    """Тесты для хранения изображений по хэшу содержимого"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def create_product(self, name, image):
+        return Product.objects.create(name=name,
+                                      price=Decimal('100.00'),
+                                      category=self.category,
+                                      subcategory=self.subcategory,
+                                      image=image)
+
+    def test_identical_uploads_deduplicated(self):
+        """Тест хранения одинаковых изображений в одном файле"""
+
+        first = self.create_product('Смартфон1', make_image('red'))
+        second = self.create_product('Смартфон2', make_image('red'))
+        third = self.create_product('Смартфон3', make_image('blue'))
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertNotEqual(first.image.name, third.image.name)
+        self.assertRegex(first.image.name,
+                         r'^products/[0-9a-f]{2}/[0-9a-f]{64}\.png$')
+        self.assertEqual(first.image_small.name, second.image_small.name)
+
+    @override_settings(TASKS_EAGER=False)
+    def test_missing_rendition_generated_on_access(self):
+        """Тест создания уменьшенной копии при обращении без фоновой задачи"""
+
+        cache.clear()
+        product = self.create_product('Смартфон1', make_image('green'))
+        path = os.path.join(self.media.name, product.image_small.name)
+        self.assertFalse(os.path.exists(path))
+
+        url = product.image_small.url
+
+        self.assertTrue(url.endswith(product.image_small.name))
+        self.assertTrue(os.path.exists(path))
+
+    def test_gc_removes_orphaned_files(self):
+        """Тест удаления файлов без ссылок"""
+
+        kept = self.create_product('Смартфон1', make_image('red'))
+        removed = self.create_product('Смартфон2', make_image('blue'))
+        orphan_path = removed.image.path
+        rendition_path = removed.image_small.path
+        removed.delete()
+
+        call_command('gc_media', grace_hours=0, stdout=io.StringIO())
+
+        self.assertTrue(os.path.exists(kept.image.path))
+        self.assertTrue(os.path.exists(kept.image_small.path))
+        self.assertFalse(os.path.exists(orphan_path))
+        self.assertFalse(os.path.exists(rendition_path))
+
+    def test_reupload_refreshes_mtime(self):
+        """Тест обновления времени изменения при повторной загрузке"""
+
+        product = self.create_product('Смартфон1', make_image('red'))
+        path = product.image.path
+        product.delete()
+        os.utime(path, (0, 0))
+
+        self.create_product('Смартфон2', make_image('red'))
+
+        self.assertGreater(os.path.getmtime(path), time.time() - 3600)
+
+    def test_gc_respects_grace_period(self):
+        """Тест сохранения недавно загруженных файлов"""
+
+        product = self.create_product('Смартфон', make_image('red'))
+        path = product.image.path
+        product.delete()
+
+        call_command('gc_media', stdout=io.StringIO())
+
+        self.assertTrue(os.path.exists(path))
@@ -0,0 +1,116 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory, StockShard
+from backend.orders import get_stock, set_stock
+
+User = get_user_model()
+
+
+class ProductAdminChangelistTests(TestCase):
+    """Тесты для списка товаров в админке"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin',
+                                                   password='adminpassword')
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:backend_product_changelist')
+
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.other_category = Category.objects.create(name='Техника')
+        self.other_subcategory = Subcategory.objects.create(
+            category=self.other_category, name='Стиральные машины')
+
+    def create_products(self, count):
+        for number in range(count):
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=self.category,
+                                   subcategory=self.subcategory)
+
+    def count_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Тест отсутствия запросов на каждую строку списка"""
+
+        self.create_products(2)
+        few = self.count_queries()
+        self.create_products(8)
+        many = self.count_queries()
+
+        self.assertEqual(few, many)
+
+    def test_subcategory_filter_limited_to_category(self):
+        """Тест фильтра подкатегорий выбранной категории"""
+
+        response = self.client.get(self.url)
+        self.assertNotContains(response, 'Стиральные машины')
+
+        response = self.client.get(
+            self.url, {'category__id__exact': self.category.pk})
+        self.assertContains(response, 'Телефон')
+        self.assertNotContains(response, 'Стиральные машины')
+
+    def test_reprice_action(self):
+        """Тест массового изменения цены из админки"""
+
+        self.create_products(3)
+        ids = list(Product.objects.values_list('pk', flat=True))
+
+        response = self.client.post(self.url, {
+            'action': 'reprice_products',
+            '_selected_action': ids,
+            'percent': '10',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(set(Product.objects.values_list('price', flat=True)),
+                         {Decimal('110.00')})
+
+    def test_set_stock_action(self):
+        """Тест задания остатка из админки"""
+
+        self.create_products(2)
+        ids = list(Product.objects.values_list('pk', flat=True))
+
+        response = self.client.post(self.url, {
+            'action': 'set_stock_products',
+            '_selected_action': ids,
+            'stock': '20',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(get_stock(ids), {pk: 20 for pk in ids})
+
+    def test_stock_field_in_change_form(self):
+        """Тест остатка в форме товара"""
+
+        self.create_products(1)
+        product = Product.objects.get()
+        set_stock(product, 7)
+        url = reverse('admin:backend_product_change', args=[product.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.context['adminform'].form['stock'].value(),
+                         7)
+
+        response = self.client.post(url, {
+            'name': product.name, 'price': '100.00', 'stock': '12',
+            'category': self.category.pk, 'subcategory': self.subcategory.pk,
+            'stock_shards-TOTAL_FORMS': '0',
+            'stock_shards-INITIAL_FORMS': '0',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(get_stock([product.pk]), {product.pk: 12})
+        self.assertGreater(
+            StockShard.objects.filter(product=product).count(), 1)
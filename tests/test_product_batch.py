@@ -0,0 +1,89 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory
+
+
+class ProductBatchTests(APITestCase):
+    """Тесты для получения товаров по списку slug"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('product-batch')
+        category = Category.objects.create(name='Электроника')
+        subcategory = Subcategory.objects.create(category=category,
+                                                 name='Телефон')
+        self.products = [
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=category,
+                                   subcategory=subcategory)
+            for number in range(3)
+        ]
+        self.slugs = [product.slug for product in self.products]
+
+    def test_request_order(self):
+        """Тест порядка товаров как в запросе"""
+
+        slugs = [self.slugs[2], self.slugs[0], 'unknown', self.slugs[2]]
+
+        response = self.client.get(self.url, {'slugs': ','.join(slugs)})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['slug'] for item in response.data['results']],
+                         [self.slugs[2], self.slugs[0]])
+        self.assertEqual(response.data['missing'], ['unknown'])
+
+    def test_cache_fills_only_misses(self):
+        """Тест чтения из БД только отсутствующих в кэше товаров"""
+
+        self.client.get(self.url, {'slugs': self.slugs[0]})
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url,
+                                       {'slugs': ','.join(self.slugs)})
+        self.assertEqual(len(response.data['results']), 3)
+
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'slugs': ','.join(self.slugs)})
+
+    def test_cache_invalidated_by_catalog_change(self):
+        """Тест обновления кэша после изменения товара"""
+
+        self.client.get(self.url, {'slugs': self.slugs[0]})
+        self.products[0].price = Decimal('90.00')
+        self.products[0].save()
+
+        response = self.client.get(self.url, {'slugs': self.slugs[0]})
+
+        self.assertEqual(response.data['results'][0]['price'], '90.00')
+
+    def test_post(self):
+        """Тест запроса списка slug методом POST"""
+
+        response = self.client.post(self.url,
+                                    {'slugs': [self.slugs[1], self.slugs[0]]},
+                                    format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['slug'] for item in response.data['results']],
+                         [self.slugs[1], self.slugs[0]])
+
+    @override_settings(PRODUCT_BATCH_MAX_SIZE=2)
+    def test_batch_size_limit(self):
+        """Тест ограничения размера запроса"""
+
+        response = self.client.get(self.url, {'slugs': ','.join(self.slugs)})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_empty_slugs(self):
+        """Тест запроса без slug"""
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory
+
+
+@override_settings(CATALOG_SNAPSHOT=False)
+class ProductFacetsTests(APITestCase):
+    """Тесты для фасетов и фильтров товаров"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('product-facets')
+
+        self.electronics = Category.objects.create(name='Электроника')
+        self.phones = Subcategory.objects.create(category=self.electronics,
+                                                 name='Телефон')
+        self.laptops = Subcategory.objects.create(category=self.electronics,
+                                                  name='Ноутбук')
+        self.appliances = Category.objects.create(name='Техника')
+        self.washers = Subcategory.objects.create(category=self.appliances,
+                                                  name='Стиральные машины')
+        for name, price, subcategory in (
+                ('Смартфон1', '100.00', self.phones),
+                ('Смартфон2', '1500.00', self.phones),
+                ('Ноутбук1', '2500.00', self.laptops),
+                ('Стиралка1', '900.00', self.washers)):
+            Product.objects.create(name=name, price=Decimal(price),
+                                   category=subcategory.category,
+                                   subcategory=subcategory)
+
+    def test_facets_for_all_products(self):
+        """Тест фасетов по всем товарам"""
+
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(response.data['min_price'], '100.00')
+        self.assertEqual(response.data['max_price'], '2500.00')
+        categories = {item['name']: item
+                      for item in response.data['categories']}
+        self.assertEqual(categories['Электроника']['count'], 3)
+        self.assertEqual(categories['Техника']['max_price'], '900.00')
+        subcategories = {item['name']: item['count'] for item in
+                         categories['Электроника']['subcategories']}
+        self.assertEqual(subcategories, {'Телефон': 2, 'Ноутбук': 1})
+        self.assertEqual(response.data['histogram'], [
+            {'from': '0.00', 'to': '1000.00', 'count': 2},
+            {'from': '1000.00', 'to': '2000.00', 'count': 1},
+            {'from': '2000.00', 'to': '3000.00', 'count': 1},
+        ])
+
+    def test_facets_respect_filters(self):
+        """Тест фасетов для выбранных фильтров"""
+
+        response = self.client.get(self.url, {'category': self.electronics.slug,
+                                              'min_price': '1000',
+                                              'price_step': '500'})
+
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(len(response.data['categories']), 1)
+        self.assertEqual([bucket['from']
+                          for bucket in response.data['histogram']],
+                         ['1500.00', '2500.00'])
+
+    @override_settings(FACETS_MAX_BUCKETS=5)
+    def test_small_price_step_is_bounded(self):
+        """Тест ограничения числа интервалов гистограммы"""
+
+        response = self.client.get(self.url, {'price_step': '0.01'})
+
+        histogram = response.data['histogram']
+        self.assertLessEqual(len(histogram), 5)
+        self.assertEqual(sum(bucket['count'] for bucket in histogram), 4)
+        self.assertEqual(histogram[0]['from'], '0.00')
+        self.assertEqual(histogram[0]['to'], '600.00')
+
+    def test_invalid_filter(self):
+        """Тест некорректного значения фильтра"""
+
+        response = self.client.get(self.url, {'price_step': '0'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_product_list_filters(self):
+        """Тест фильтрации списка товаров"""
+
+        response = self.client.get(reverse('product-list'),
+                                   {'subcategory': self.phones.slug,
+                                    'max_price': '1000'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data['results']],
+                         ['Смартфон1'])
+
+    def test_product_list_invalid_filter(self):
+        """Тест некорректной цены в фильтре списка"""
+
+        response = self.client.get(reverse('product-list'),
+                                   {'min_price': 'abc'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
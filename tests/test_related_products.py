@@ -0,0 +1,144 @@
+from datetime import timedelta
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend.models import (Product, Cart, CartItem, Category, Subcategory,
+                            ProductRelation, RecommendationState)
+from backend.recommendations import build_related_products
+
+User = get_user_model()
+
+
+class RelatedProductsTests(APITestCase):
+    """Тесты для связанных товаров"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.phone, self.case, self.charger, self.cable = [
+            Product.objects.create(name=name, price=Decimal('100.00'),
+                                   category=self.category,
+                                   subcategory=self.subcategory)
+            for name in ('Смартфон', 'Чехол', 'Зарядка', 'Кабель')
+        ]
+        self.carts = 0
+        self.create_cart(self.phone, self.case, self.charger)
+        self.create_cart(self.phone, self.case)
+        self.create_cart(self.charger, self.cable)
+
+    def create_cart(self, *products):
+        self.carts += 1
+        user = User.objects.create_user(username=f'user{self.carts}',
+                                        password='testpass123')
+        cart = Cart.objects.create(user=user)
+        for product in products:
+            CartItem.objects.create(cart=cart, product=product)
+        return cart
+
+    def url(self, product):
+        return reverse('product-related', args=[product.slug])
+
+    def scores(self, product):
+        return dict(ProductRelation.objects.filter(product=product)
+                    .values_list('related__name', 'score'))
+
+    def test_counts_shared_carts(self):
+        """Тест подсчёта общих корзин"""
+
+        build_related_products(full=True)
+
+        self.assertEqual(self.scores(self.phone),
+                         {'Чехол': 2, 'Зарядка': 1})
+        self.assertEqual(self.scores(self.charger),
+                         {'Смартфон': 1, 'Чехол': 1, 'Кабель': 1})
+
+    def test_keeps_top_k(self):
+        """Тест ограничения числа связанных товаров"""
+
+        build_related_products(full=True, top_k=1)
+
+        self.assertEqual(self.scores(self.phone), {'Чехол': 2})
+
+    def test_incremental_run_updates_changed_carts(self):
+        """Тест пересчёта только по изменённым корзинам"""
+
+        build_related_products(full=True)
+        RecommendationState.objects.update(
+            last_run=timezone.now() + timedelta(seconds=1))
+        Cart.objects.update(updated_at=timezone.now())
+        cart = self.create_cart(self.phone, self.cable)
+        Cart.objects.filter(pk=cart.pk).update(
+            updated_at=timezone.now() + timedelta(seconds=2))
+        ProductRelation.objects.filter(product=self.case).delete()
+
+        result = build_related_products()
+
+        self.assertEqual(result['products'], 2)
+        self.assertEqual(self.scores(self.phone)['Кабель'], 1)
+        self.assertEqual(self.scores(self.cable),
+                         {'Зарядка': 1, 'Смартфон': 1})
+        self.assertEqual(self.scores(self.case), {})
+
+    def test_periodic_full_run_drops_removed_items(self):
+        """Тест полного пересчёта после удаления позиций и корзин"""
+
+        build_related_products(full=True)
+        CartItem.objects.filter(product=self.case,
+                                cart__user__username='user2').delete()
+        Cart.objects.filter(user__username='user3').delete()
+
+        build_related_products()
+        self.assertEqual(self.scores(self.case)['Смартфон'], 2)
+
+        RecommendationState.objects.update(
+            last_full_run=timezone.now() - timedelta(days=2))
+        build_related_products()
+
+        self.assertEqual(self.scores(self.case),
+                         {'Смартфон': 1, 'Зарядка': 1})
+        self.assertEqual(self.scores(self.cable), {})
+        self.assertGreater(RecommendationState.objects.get().last_full_run,
+                           timezone.now() - timedelta(minutes=1))
+
+    def test_endpoint_returns_related_by_score(self):
+        """Тест выдачи связанных товаров по убыванию"""
+
+        build_related_products(full=True)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url(self.phone))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data],
+                         ['Чехол', 'Зарядка'])
+
+    def test_endpoint_without_relations(self):
+        """Тест товара без связанных товаров"""
+
+        response = self.client.get(self.url(self.cable))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    def test_endpoint_unknown_product(self):
+        """Тест несуществующего товара"""
+
+        response = self.client.get(reverse('product-related',
+                                           args=['unknown']))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        """Тест команды build_related_products"""
+
+        out = StringIO()
+        call_command('build_related_products', '--full', stdout=out)
+
+        self.assertIn('Пересчитано товаров: 4', out.getvalue())
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from backend.middleware import ReplicaRoutingMiddleware
+from backend.models import Product, Category, Cart
+from backend.routers import ReplicaRouter, use_primary
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0', 'replica_1'])
+class ReplicaRouterTests(SimpleTestCase):
+    """Тесты для маршрутизации запросов по репликам"""
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def read_db(self, model):
+        return self.router.db_for_read(model)
+
+    def test_catalog_reads_go_to_replicas(self):
+        """Тест чтения каталога с реплик"""
+
+        with use_primary(False):
+            self.assertIn(self.read_db(Product), ['replica_0', 'replica_1'])
+            self.assertIn(self.read_db(Category), ['replica_0', 'replica_1'])
+
+    def test_cart_and_auth_reads_go_to_primary(self):
+        """Тест чтения корзины и пользователей с основной БД"""
+
+        with use_primary(False):
+            self.assertEqual(self.read_db(Cart), 'default')
+            self.assertEqual(self.read_db(User), 'default')
+            self.assertEqual(self.read_db(Token), 'default')
+
+    def test_reads_after_write_stick_to_primary(self):
+        """Тест чтения своих изменений после записи"""
+
+        with use_primary(False):
+            self.assertEqual(self.router.db_for_write(Cart), 'default')
+            self.assertEqual(self.read_db(Product), 'default')
+
+    def test_pin_does_not_leak_between_requests(self):
+        """Тест сброса привязки к основной БД между запросами"""
+
+        seen = []
+
+        def view(request):
+            seen.append(self.read_db(Product))
+            if request.method == 'GET' and len(seen) == 1:
+                self.router.db_for_write(Cart)
+                seen.append(self.read_db(Product))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get('/'))
+        middleware(factory.get('/'))
+        middleware(factory.post('/'))
+
+        self.assertNotEqual(seen[0], 'default')
+        self.assertEqual(seen[1], 'default')
+        self.assertNotEqual(seen[2], 'default')
+        self.assertEqual(seen[3], 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_without_replicas(self):
+        """Тест работы без настроенных реплик"""
+
+        with use_primary(False):
+            self.assertEqual(self.read_db(Product), 'default')
+
+    def test_migrations_only_on_primary(self):
+        """Тест применения миграций только к основной БД"""
+
+        self.assertTrue(self.router.allow_migrate('default', 'backend'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'backend'))
@@ -0,0 +1,55 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from backend.schema import schema_cache
+
+
+class CachedSchemaViewTests(TestCase):
+    """Тесты для отдачи закэшированной OpenAPI-схемы"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            SCHEMA_FILE=Path(self.tmp_dir.name) / 'openapi.json')
+        self.settings_override.enable()
+        schema_cache.clear()
+        self.url = reverse('schema')
+
+    def tearDown(self):
+        schema_cache.clear()
+        self.settings_override.disable()
+        self.tmp_dir.cleanup()
+
+    def test_schema_generated_lazily(self):
+        """Тест генерации схемы при первом запросе"""
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        schema = json.loads(response.content)
+        self.assertIn('/api/products/', schema['paths'])
+        self.assertTrue(response['ETag'].startswith('"'))
+
+    def test_not_modified_with_etag(self):
+        """Тест ответа 304 при совпадении ETag"""
+
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_gzip_variant(self):
+        """Тест отдачи сжатого варианта схемы"""
+
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', response['Vary'])
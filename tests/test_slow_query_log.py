@@ -0,0 +1,151 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from backend.models import Category
+from backend.querylog import (EXPLAIN_SAVEPOINT, aggregate, explain,
+                              log_slow_queries, normalize, read_log,
+                              slow_query_log)
+
+
+@override_settings(CATALOG_SNAPSHOT=False)
+class SlowQueryLogTests(APITestCase):
+    """Тесты для журнала медленных запросов"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log_file = Path(directory.name) / 'slow.jsonl'
+        slow_query_log.clear()
+        Category.objects.create(name='Электроника')
+
+    def entries(self):
+        return list(read_log(self.log_file))
+
+    def test_view_queries_logged_with_plan(self):
+        """Тест записи запросов представления с планом"""
+
+        with self.settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0,
+                           SLOW_QUERY_LOG_FILE=self.log_file):
+            self.client.get(reverse('category-list'))
+
+        entries = self.entries()
+        self.assertTrue(entries)
+        self.assertEqual({entry['source'] for entry in entries},
+                         {'GET category-list'})
+        select = next(entry for entry in entries
+                      if 'FROM "backend_category"' in entry['sql'])
+        self.assertTrue(select['plan'])
+
+    def test_disabled_by_default(self):
+        """Тест отключённого журнала"""
+
+        with self.settings(SLOW_QUERY_THRESHOLD_MS=0,
+                           SLOW_QUERY_LOG_FILE=self.log_file):
+            self.client.get(reverse('category-list'))
+
+        self.assertEqual(self.entries(), [])
+
+    @override_settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0,
+                       SLOW_QUERY_MAX_PER_MINUTE=2)
+    def test_rate_limit_and_explain_once(self):
+        """Тест ограничения числа записей и однократного плана"""
+
+        with self.settings(SLOW_QUERY_LOG_FILE=self.log_file):
+            with log_slow_queries('test'):
+                for _ in range(5):
+                    list(Category.objects.filter(name='Электроника'))
+
+        entries = self.entries()
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0]['fingerprint'], entries[1]['fingerprint'])
+        self.assertIsNotNone(entries[0]['plan'])
+        self.assertIsNone(entries[1]['plan'])
+
+    @override_settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=1000)
+    def test_fast_queries_skipped(self):
+        """Тест пропуска быстрых запросов"""
+
+        with self.settings(SLOW_QUERY_LOG_FILE=self.log_file):
+            with log_slow_queries('test'):
+                list(Category.objects.all())
+
+        self.assertEqual(self.entries(), [])
+
+    def test_report(self):
+        """Тест сводки по отпечаткам"""
+
+        with self.settings(SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0,
+                           SLOW_QUERY_LOG_FILE=self.log_file):
+            with log_slow_queries('test'):
+                list(Category.objects.filter(pk__in=[1, 2]))
+                list(Category.objects.filter(pk__in=[1, 2, 3]))
+            output = StringIO()
+            call_command('slow_queries', '--plans', stdout=output)
+
+        self.assertIn('2 раз', output.getvalue())
+        self.assertIn('IN (...)', output.getvalue())
+
+
+class ExplainTests(TestCase):
+    """Тесты для снятия плана запроса внутри транзакции"""
+
+    def test_failed_explain_rolled_back_to_savepoint(self):
+        """Тест отката ошибки EXPLAIN к точке сохранения"""
+
+        rollback = mock.patch.object(
+            connection.ops, 'savepoint_rollback_sql',
+            wraps=connection.ops.savepoint_rollback_sql)
+
+        with rollback as rollback_sql, \
+                self.assertLogs('backend.querylog', 'ERROR'):
+            plan = explain(connection, 'SELECT * FROM missing_table', ())
+
+        self.assertIsNone(plan)
+        rollback_sql.assert_called_once_with(EXPLAIN_SAVEPOINT)
+        self.assertTrue(explain(connection,
+                                'SELECT * FROM backend_category', ()))
+        # Точка сохранения освобождена и после ошибки
+        with self.assertRaises(DatabaseError), transaction.atomic():
+            connection.cursor().execute(
+                connection.ops.savepoint_commit_sql(EXPLAIN_SAVEPOINT))
+
+
+class QueryFingerprintTests(TestCase):
+    """Тесты для нормализации SQL"""
+
+    def test_normalize(self):
+        """Тест замены значений заполнителями"""
+
+        self.assertEqual(
+            normalize("SELECT *  FROM t\n WHERE a = 'x''y' AND b IN (%s, %s)"
+                      " AND c > 10"),
+            'SELECT * FROM t WHERE a = ? AND b IN (...) AND c > ?'
+        )
+
+    def test_aggregate(self):
+        """Тест сводки по суммарному времени"""
+
+        entries = [
+            {'fingerprint': 'a', 'sql': 'A', 'duration_ms': 10,
+             'source': 'GET x', 'plan': None},
+            {'fingerprint': 'b', 'sql': 'B', 'duration_ms': 30,
+             'source': 'GET y', 'plan': 'SCAN'},
+            {'fingerprint': 'a', 'sql': 'A', 'duration_ms': 15,
+             'source': 'GET z', 'plan': None},
+        ]
+
+        groups = aggregate(entries)
+
+        self.assertEqual([group['fingerprint'] for group in groups],
+                         ['b', 'a'])
+        self.assertEqual(groups[1]['count'], 2)
+        self.assertEqual(groups[1]['sources'], ['GET x', 'GET z'])
@@ -0,0 +1,147 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory
+from backend.snapshot import catalog_snapshot
+
+
+@override_settings(CATALOG_SNAPSHOT=False)
+class SparseFieldsTests(APITestCase):
+    """Тесты для выбора полей ответа каталога"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        for number in range(3):
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=self.category,
+                                   subcategory=self.subcategory)
+
+    def get_products(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('product-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, queries[-1]['sql']
+
+    def test_product_fields(self):
+        """Тест выбора полей товара без соединений"""
+
+        response, sql = self.get_products(fields='name,price')
+
+        self.assertEqual(response.data['results'][0],
+                         {'name': 'Смартфон0', 'price': '100.00'})
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"slug"', sql)
+
+    def test_product_related_field(self):
+        """Тест соединения только с запрошенной связью"""
+
+        response, sql = self.get_products(fields='name,category_name')
+
+        self.assertEqual(response.data['results'][0]['category_name'],
+                         'Электроника')
+        self.assertIn('backend_category', sql)
+        self.assertNotIn('backend_subcategory', sql)
+
+    def test_product_exclude(self):
+        """Тест исключения полей товара"""
+
+        response, _ = self.get_products(exclude='images,subcategory_name')
+
+        self.assertEqual(list(response.data['results'][0]),
+                         ['id', 'name', 'slug', 'price', 'category_name'])
+
+    def test_all_fields_by_default(self):
+        """Тест полного набора полей без параметров"""
+
+        response, _ = self.get_products()
+
+        self.assertEqual(list(response.data['results'][0]),
+                         ['id', 'name', 'slug', 'price', 'category_name',
+                          'subcategory_name', 'images'])
+
+    def test_unknown_field(self):
+        """Тест неизвестного поля"""
+
+        response = self.client.get(reverse('product-list'),
+                                   {'fields': 'name,stock'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_category_without_subcategories(self):
+        """Тест категорий без вложенных подкатегорий"""
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('category-list'),
+                                       {'fields': 'name,slug'})
+
+        self.assertEqual(response.data['results'][0],
+                         {'name': 'Электроника',
+                          'slug': self.category.slug})
+
+    def test_category_subcategories_prefetched(self):
+        """Тест подкатегорий одним дополнительным запросом"""
+
+        Category.objects.create(name='Техника')
+
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('category-list'),
+                                       {'fields': 'name,subcategories'})
+
+        subcategories = {item['name']: item['subcategories']
+                         for item in response.data['results']}
+        self.assertEqual(subcategories['Техника'], [])
+        self.assertEqual(subcategories['Электроника'][0]['name'], 'Телефон')
+
+
+@override_settings(CATALOG_SNAPSHOT=True, CATALOG_SNAPSHOT_CHECK_INTERVAL=0,
+                   CATALOG_CACHE_TIMEOUT=0)
+class SnapshotSparseFieldsTests(SparseFieldsTests):
+    """Тесты для выбора полей ответа из снимка каталога"""
+
+    def setUp(self):
+        super().setUp()
+        catalog_snapshot.clear()
+        catalog_snapshot.get()
+
+    def test_product_related_field(self):
+        """Тест связанного поля из снимка без запросов к таблицам каталога"""
+
+        response, sql = self.get_products(fields='name,category_name')
+
+        self.assertEqual(response.data['results'][0]['category_name'],
+                         'Электроника')
+        self.assertIn('backend_catalogrevision', sql)
+
+    def test_category_without_subcategories(self):
+        """Тест категорий из снимка: только проверка ревизии каталога"""
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('category-list'),
+                                       {'fields': 'name,slug'})
+
+        self.assertEqual(response.data['results'][0],
+                         {'name': 'Электроника',
+                          'slug': self.category.slug})
+
+    def test_category_subcategories_prefetched(self):
+        """Тест подкатегорий из пересобранного снимка"""
+
+        Category.objects.create(name='Техника')
+
+        response = self.client.get(reverse('category-list'),
+                                   {'fields': 'name,subcategories'})
+
+        subcategories = {item['name']: item['subcategories']
+                         for item in response.data['results']}
+        self.assertEqual(subcategories['Техника'], [])
+        self.assertEqual(subcategories['Электроника'][0]['name'], 'Телефон')
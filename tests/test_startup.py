@@ -0,0 +1,38 @@
+from django.test import SimpleTestCase
+from backend.startup import measure_startup, parse_importtime
+
+LAZY_MODULES = ('unidecode', 'drf_spectacular.views',
+                'drf_spectacular.generators', 'drf_spectacular.renderers')
+
+
+class StartupTests(SimpleTestCase):
+    """Тесты для времени загрузки процесса"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = measure_startup()
+
+    def test_heavy_modules_not_loaded(self):
+        """Тест отложенной загрузки тяжёлых зависимостей"""
+
+        for module in LAZY_MODULES:
+            self.assertNotIn(module, self.report['modules'])
+
+    def test_startup_phases(self):
+        """Тест измерения фаз загрузки"""
+
+        self.assertEqual([name for name, _ in self.report['phases']],
+                         ['settings', 'django.setup', 'urls', 'wsgi'])
+        self.assertGreater(self.report['total'], 0)
+
+    def test_parse_importtime(self):
+        """Тест разбора вывода -X importtime"""
+
+        output = ('import time: self [us] | cumulative | imported package\n'
+                  'import time:       120 |        120 |   django.utils\n'
+                  'import time:       300 |        420 | django\n')
+
+        self.assertEqual(parse_importtime(output),
+                         [('django.utils', 120, 120, 1),
+                          ('django', 300, 420, 0)])
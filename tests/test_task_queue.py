@@ -0,0 +1,129 @@
+import io
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from decimal import Decimal
+from PIL import Image
+from backend import taskqueue
+from backend.models import Task, Product, Category, Subcategory
+
+calls = []
+
+
+@taskqueue.task('test_record', max_attempts=2)
+def record(value):
+    calls.append(value)
+
+
+@taskqueue.task('test_fail', max_attempts=2)
+def fail():
+    raise RuntimeError('Ошибка задачи')
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTests(TestCase):
+    """Тесты для очереди фоновых задач"""
+
+    def setUp(self):
+        calls.clear()
+
+    def enqueue(self, *args, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            taskqueue.enqueue(*args, **kwargs)
+
+    def test_enqueue_after_commit(self):
+        """Тест постановки задачи в очередь"""
+
+        self.enqueue('test_record', 1)
+
+        task = Task.objects.get()
+        self.assertEqual(task.args, [1])
+        self.assertEqual(task.status, Task.STATUS_PENDING)
+        self.assertEqual(calls, [])
+
+    def test_unique_task_not_duplicated(self):
+        """Тест отсутствия дублей уникальной задачи"""
+
+        self.enqueue('test_record', 1, unique=True)
+        self.enqueue('test_record', 1, unique=True)
+        self.enqueue('test_record', 2, unique=True)
+
+        self.assertEqual(Task.objects.count(), 2)
+
+    def test_claim_and_execute(self):
+        """Тест выполнения задачи обработчиком"""
+
+        self.enqueue('test_record', 1)
+
+        claimed = taskqueue.claim('worker', 10)
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(taskqueue.claim('worker', 10), [])
+
+        self.assertTrue(taskqueue.execute(claimed[0]))
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failed_task_retried_then_marked_failed(self):
+        """Тест повтора и окончательной ошибки задачи"""
+
+        self.enqueue('test_fail')
+        task = taskqueue.claim('worker', 1)[0]
+        with self.assertLogs('backend.taskqueue', 'ERROR'):
+            self.assertFalse(taskqueue.execute(task))
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.STATUS_PENDING)
+        self.assertIn('Ошибка задачи', task.last_error)
+
+        Task.objects.update(run_after=task.created_at)
+        task = taskqueue.claim('worker', 1)[0]
+        with self.assertLogs('backend.taskqueue', 'ERROR'):
+            taskqueue.execute(task)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.STATUS_FAILED)
+        self.assertEqual(task.attempts, 2)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode(self):
+        """Тест немедленного выполнения в режиме TASKS_EAGER"""
+
+        taskqueue.enqueue('test_record', 3)
+
+        self.assertEqual(calls, [3])
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(TASKS_EAGER=True)
+class RenditionsTaskTests(TestCase):
+    """Тесты для фоновой генерации уменьшенных копий изображений"""
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings_override.enable()
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media.cleanup()
+
+    def test_renditions_generated_on_save(self):
+        """Тест создания копий после сохранения товара"""
+
+        buffer = io.BytesIO()
+        Image.new('RGB', (400, 300), 'red').save(buffer, format='PNG')
+        product = Product.objects.create(
+            name='Смартфон',
+            price=Decimal('100.00'),
+            category=self.category,
+            subcategory=self.subcategory,
+            image=SimpleUploadedFile('phone.png', buffer.getvalue(),
+                                     content_type='image/png')
+        )
+
+        for rendition in (product.image_small, product.image_medium,
+                          product.image_large):
+            self.assertTrue(rendition.storage.exists(rendition.name))
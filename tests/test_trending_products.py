@@ -0,0 +1,125 @@
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from rest_framework import status
+from decimal import Decimal
+from backend.models import Product, Category, Subcategory, ProductTrend
+from backend.trending import (TrendingBuffer, decay, rebuild_trending,
+                              trending_buffer)
+
+User = get_user_model()
+
+
+@override_settings(TRENDING_FLUSH_INTERVAL=0)
+class TrendingProductsTests(APITestCase):
+    """Тесты для популярных товаров"""
+
+    def setUp(self):
+        cache.clear()
+        trending_buffer.flush()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='testuser',
+                                             password='testpass123')
+        self.category = Category.objects.create(name='Электроника')
+        self.subcategory = Subcategory.objects.create(category=self.category,
+                                                      name='Телефон')
+        self.products = [
+            Product.objects.create(name=f'Смартфон{number}',
+                                   price=Decimal('100.00'),
+                                   category=self.category,
+                                   subcategory=self.subcategory)
+            for number in range(3)
+        ]
+
+    def add_to_cart(self, product, quantity=1):
+        self.client.force_authenticate(user=self.user)
+        self.client.post(reverse('cart-add-update'),
+                         {'product_slug': product.slug,
+                          'quantity': quantity})
+        self.client.force_authenticate(user=None)
+
+    def test_cart_add_is_buffered_without_db_write(self):
+        """Тест накопления событий без записи в БД"""
+
+        self.add_to_cart(self.products[0])
+
+        self.assertFalse(ProductTrend.objects.exists())
+        self.assertEqual(trending_buffer.flush(), 1)
+        self.assertEqual(ProductTrend.objects.get().score, 1)
+
+    def test_trending_ordered_by_activity(self):
+        """Тест порядка популярных товаров"""
+
+        for quantity in (1, 2, 3):
+            self.add_to_cart(self.products[1], quantity)
+        self.add_to_cart(self.products[2])
+        trending_buffer.flush()
+        rebuild_trending()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('product-trending'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['name'] for item in response.data],
+                         ['Смартфон1', 'Смартфон2'])
+
+    def test_trending_rebuilt_when_cache_empty(self):
+        """Тест пересчёта списка при пустом кэше"""
+
+        self.add_to_cart(self.products[0])
+        trending_buffer.flush()
+
+        response = self.client.get(reverse('product-trending'))
+
+        self.assertEqual([item['name'] for item in response.data],
+                         ['Смартфон0'])
+
+    def test_old_activity_decays(self):
+        """Тест затухания старой популярности"""
+
+        day_ago = timezone.now() - timedelta(hours=24)
+        ProductTrend.objects.create(product=self.products[0], score=10,
+                                    updated_at=day_ago)
+        ProductTrend.objects.create(product=self.products[1], score=6,
+                                    updated_at=timezone.now())
+
+        self.assertEqual(rebuild_trending(),
+                         [self.products[1].pk, self.products[0].pk])
+
+    def test_flush_adds_to_decayed_score(self):
+        """Тест добавления событий к затухшему значению"""
+
+        day_ago = timezone.now() - timedelta(hours=24)
+        ProductTrend.objects.create(product=self.products[0], score=10,
+                                    updated_at=day_ago)
+
+        trending_buffer.record(self.products[0].pk, 2)
+        trending_buffer.flush()
+
+        self.assertAlmostEqual(ProductTrend.objects.get().score, 7, places=2)
+
+
+@override_settings(TRENDING_FLUSH_INTERVAL=0)
+class TrendingBufferTests(TestCase):
+    """Тесты для буфера счётчиков"""
+
+    def test_record_accumulates(self):
+        """Тест суммирования событий в памяти"""
+
+        buffer = TrendingBuffer()
+        buffer.record(1)
+        buffer.record(1)
+        buffer.record(2)
+
+        self.assertEqual(buffer._counts, {1: 2, 2: 1})
+
+    def test_decay_half_life(self):
+        """Тест уменьшения популярности вдвое за период полураспада"""
+
+        now = timezone.now()
+
+        self.assertAlmostEqual(decay(8, now - timedelta(hours=48), now), 2)